@@ -6,9 +6,10 @@ Developed and maintained by Aditya Gaur / @xdityagr at Github / adityagaur.home@
 """
 
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, asdict
 from datetime import datetime
 from typing import List, Optional, Union, Dict
+import numpy as np
 
 @dataclass
 class Deliverable:
@@ -52,3 +53,69 @@ class CampaignInfo:
             "deliverables": [f"{d.count} x {d.type}" for d in self.deliverables],
             "TAT": self.tat.isoformat() if self.tat else None,
         }
+
+
+@dataclass(slots=True)
+class Creator:
+    """Slim creator record, only the profile fields the engine uses after qualification are kept."""
+    id: str
+    username: str = ''
+    full_name: str = ''
+    public_email: Optional[str] = None
+    category: Optional[str] = None
+    media_count: int = 0
+    follower_count: int = 0
+    biography: str = ''
+    profile_pic_url_hd: Optional[str] = None
+    is_business: bool = False
+    post_caption_text: str = ''
+    engagement_rate: Optional[float] = None
+    roi_score: Optional[float] = None
+    platform: str = 'instagram'
+
+    @classmethod
+    def from_payload(cls, data: dict, caption_text: Optional[str] = None) -> 'Creator':
+        """Build from a raw profile payload (or a previously dumped record), dropping everything else."""
+        return cls(
+            id=str(data.get('id') or data.get('pk') or ''),
+            username=data.get('username') or '',
+            full_name=data.get('full_name') or '',
+            public_email=data.get('public_email'),
+            category=data.get('category'),
+            media_count=int(data.get('media_count') or 0),
+            follower_count=int(data.get('follower_count') or 0),
+            biography=data.get('biography') or '',
+            profile_pic_url_hd=data.get('profile_pic_url_hd'),
+            is_business=bool(data.get('is_business')),
+            post_caption_text=caption_text if caption_text is not None else (data.get('post_caption_text') or ''),
+            engagement_rate=data.get('engagement_rate'),
+            roi_score=data.get('roi_score'),
+            platform=data.get('platform') or 'instagram',
+        )
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class CreatorBatch:
+    """Columnar view over a list of creators, numeric fields as NumPy arrays for vectorized filtering."""
+    __slots__ = ('creators', 'follower_count', 'media_count', 'is_business', 'has_email')
+
+    def __init__(self, creators: List[Creator]):
+        self.creators = list(creators)
+        n = len(self.creators)
+        self.follower_count = np.fromiter((c.follower_count for c in self.creators), dtype=np.int64, count=n)
+        self.media_count = np.fromiter((c.media_count for c in self.creators), dtype=np.int64, count=n)
+        self.is_business = np.fromiter((c.is_business for c in self.creators), dtype=bool, count=n)
+        self.has_email = np.fromiter((bool(c.public_email) for c in self.creators), dtype=bool, count=n)
+
+    def __len__(self):
+        return len(self.creators)
+
+    def qualified_mask(self, min_followers: int, min_media_count: int) -> np.ndarray:
+        return (self.is_business & self.has_email
+                & (self.follower_count >= min_followers)
+                & (self.media_count >= min_media_count))
+
+    def select(self, mask: np.ndarray) -> List[Creator]:
+        return [c for c, keep in zip(self.creators, mask) if keep]
@@ -1 +1,22 @@
+"""
+MatchBoxAIEngine.Database - Local persistence (SQLite) shared by the engine services
 
+Developed and maintained by Aditya Gaur / @xdityagr at Github / adityagaur.home@gmail.com
+© 2025 MatchBox AI. All rights reserved.
+"""
+
+import os
+import sqlite3
+from dotenv import load_dotenv
+
+load_dotenv(override=True)
+
+DB_PATH = os.getenv("MATCHBOX_DB_PATH", "matchbox.db")
+
+
+def connect(path=None):
+    """Open a connection to the engine database, safe to share between worker threads (callers hold a lock)."""
+    conn = sqlite3.connect(path or DB_PATH, timeout=30, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
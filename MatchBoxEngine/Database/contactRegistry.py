@@ -0,0 +1,127 @@
+"""
+MatchBoxAIEngine.Database.contactRegistry:
+Persistent registry of creators (IDs & emails) already contacted, with an in-memory Bloom filter in front of SQLite.
+
+Developed and maintained by Aditya Gaur / @xdityagr at Github / adityagaur.home@gmail.com
+© 2025 MatchBox AI. All rights reserved.
+"""
+
+import os
+import math
+import time
+import hashlib
+import threading
+
+from MatchBoxEngine.Database import connect
+
+
+class BloomFilter:
+    def __init__(self, capacity=100_000, error_rate=0.01):
+        """
+        Args:
+            capacity: Expected number of keys, the false positive rate holds up to this size
+            error_rate: Target false positive rate
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.n_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.n_hashes = max(1, round(self.n_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.n_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        # Double hashing (Kirsch-Mitzenmacher) over one 128-bit digest.
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1, h2 = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.n_bits for i in range(self.n_hashes))
+
+    def add(self, key):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+def _keys(user_id=None, email=None):
+    keys = []
+    if user_id:
+        keys.append(f"id:{user_id}")
+    if email:
+        keys.append(f"email:{email.strip().lower()}")
+    return keys
+
+
+class ContactRegistry:
+    def __init__(self, cooldown_days=None, path=None, capacity=100_000):
+        """
+        Args:
+            cooldown_days: How long a contacted creator is skipped for new campaigns (default: CONTACT_COOLDOWN_DAYS or 30)
+            path: SQLite database path (default: MATCHBOX_DB_PATH)
+            capacity: Initial Bloom filter capacity, the filter is rebuilt larger when it fills up
+        """
+        if cooldown_days is None:
+            cooldown_days = float(os.getenv("CONTACT_COOLDOWN_DAYS", 30))
+        self.cooldown_seconds = cooldown_days * 86400
+        self._capacity = capacity
+        self._lock = threading.Lock()
+        self._conn = connect(path)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS contacted_creators ("
+                "contact_key TEXT PRIMARY KEY, campaign TEXT, contacted_at REAL NOT NULL)"
+            )
+        self.refresh()
+
+    def refresh(self):
+        """Rebuild the Bloom filter from SQLite (picks up contacts recorded by other processes)."""
+        with self._lock:
+            keys = [row[0] for row in self._conn.execute("SELECT contact_key FROM contacted_creators")]
+            self._capacity = max(self._capacity, len(keys) * 2)
+            self._bloom = BloomFilter(self._capacity)
+            for key in keys:
+                self._bloom.add(key)
+
+    def contains(self, user_id=None, email=None, cooldown_days=None):
+        """
+        True if the creator (by ID or email) was contacted within the cooldown window. Misses are answered by the
+        Bloom filter alone, only possible hits are confirmed against SQLite.
+        """
+        keys = [key for key in _keys(user_id, email) if key in self._bloom]
+        if not keys:
+            return False
+        cooldown = self.cooldown_seconds if cooldown_days is None else cooldown_days * 86400
+        cutoff = time.time() - cooldown
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT 1 FROM contacted_creators WHERE contact_key IN ({','.join('?' * len(keys))}) AND contacted_at >= ?",
+                (*keys, cutoff)
+            ).fetchone()
+        return row is not None
+
+    def add(self, user_id=None, email=None, campaign=''):
+        keys = _keys(user_id, email)
+        if not keys:
+            return
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO contacted_creators (contact_key, campaign, contacted_at) VALUES (?, ?, ?)",
+                [(key, campaign, now) for key in keys]
+            )
+        rebuild = False
+        with self._lock:
+            for key in keys:
+                self._bloom.add(key)
+            rebuild = self._bloom.count > self._capacity
+        if rebuild:
+            self._capacity *= 2
+            self.refresh()
+
+    def purge_expired(self):
+        """Drop contacts older than the cooldown, returns the number removed."""
+        cutoff = time.time() - self.cooldown_seconds
+        with self._lock, self._conn:
+            cur = self._conn.execute("DELETE FROM contacted_creators WHERE contacted_at < ?", (cutoff,))
+        return cur.rowcount
@@ -0,0 +1,95 @@
+"""
+MatchBoxAIEngine.Database.crawlLease:
+SQLite-backed leases so only one process / thread crawls a given key at a time, others wait for its result.
+
+Developed and maintained by Aditya Gaur / @xdityagr at Github / adityagaur.home@gmail.com
+© 2025 MatchBox AI. All rights reserved.
+"""
+
+import os
+import time
+import uuid
+import threading
+from contextlib import contextmanager
+
+from MatchBoxEngine.Database import connect
+
+
+class CrawlLease:
+    def __init__(self, ttl_seconds=None, path=None):
+        """
+        Args:
+            ttl_seconds: Lease lifetime without a renewal, a crashed holder's lease frees up after this
+                         (default: CRAWL_LEASE_TTL_SECONDS or 120)
+            path: SQLite database path (default: MATCHBOX_DB_PATH)
+        """
+        if ttl_seconds is None:
+            ttl_seconds = float(os.getenv("CRAWL_LEASE_TTL_SECONDS", 120))
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn = connect(path)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS crawl_leases ("
+                "lease_key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    def acquire(self, key):
+        """Take the lease for `key` if it is free or expired, returns the owner token or None if it is held."""
+        owner = uuid.uuid4().hex
+        now = time.time()
+        with self._lock, self._conn:
+            # Conditional upsert is a single statement, so two processes can't both win the same key.
+            cur = self._conn.execute(
+                "INSERT INTO crawl_leases (lease_key, owner, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (lease_key) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+                "WHERE crawl_leases.expires_at < ?",
+                (key, owner, now + self.ttl_seconds, now)
+            )
+        return owner if cur.rowcount else None
+
+    def renew(self, key, owner):
+        """Extend a held lease, False if it was lost (expired & taken over)."""
+        with self._lock, self._conn:
+            cur = self._conn.execute("UPDATE crawl_leases SET expires_at = ? WHERE lease_key = ? AND owner = ?",
+                                     (time.time() + self.ttl_seconds, key, owner))
+        return cur.rowcount > 0
+
+    def release(self, key, owner):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM crawl_leases WHERE lease_key = ? AND owner = ?", (key, owner))
+
+    def is_held(self, key):
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM crawl_leases WHERE lease_key = ? AND expires_at >= ?",
+                                     (key, time.time())).fetchone()
+        return row is not None
+
+    def wait(self, key, poll_seconds=2.0, timeout=None):
+        """Block until nobody holds `key` (released or expired), False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.is_held(key):
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(poll_seconds)
+        return True
+
+    @contextmanager
+    def holding(self, key, owner):
+        """Keep a held lease renewed in the background while the block runs, release it afterwards."""
+        stop = threading.Event()
+
+        def heartbeat():
+            while not stop.wait(self.ttl_seconds / 3):
+                if not self.renew(key, owner):
+                    print(f"[!] Lost the crawl lease for '{key}'")
+                    return
+
+        thread = threading.Thread(target=heartbeat, daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+            self.release(key, owner)
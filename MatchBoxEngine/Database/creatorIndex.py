@@ -0,0 +1,139 @@
+"""
+MatchBoxAIEngine.Database.creatorIndex:
+On-disk full-text index (SQLite FTS5) over every creator profile crawled so far.
+
+Developed and maintained by Aditya Gaur / @xdityagr at Github / adityagaur.home@gmail.com
+© 2025 MatchBox AI. All rights reserved.
+"""
+
+import re
+import time
+import threading
+
+from MatchBoxEngine.Database import connect
+from MatchBoxEngine.DataDefinitions import Creator
+
+FIELDS = ('id', 'username', 'full_name', 'public_email', 'category', 'biography', 'post_caption_text',
+          'follower_count', 'media_count', 'is_business', 'profile_pic_url_hd', 'engagement_rate', 'roi_score', 'platform')
+
+# Columns added after the first release, created on older databases at startup.
+MIGRATIONS = {'engagement_rate': 'REAL', 'roi_score': 'REAL', 'platform': "TEXT DEFAULT 'instagram'"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS creators (
+    id TEXT PRIMARY KEY,
+    username TEXT,
+    full_name TEXT,
+    public_email TEXT,
+    category TEXT,
+    biography TEXT,
+    post_caption_text TEXT,
+    follower_count INTEGER DEFAULT 0,
+    media_count INTEGER DEFAULT 0,
+    is_business INTEGER DEFAULT 0,
+    profile_pic_url_hd TEXT,
+    engagement_rate REAL,
+    roi_score REAL,
+    platform TEXT DEFAULT 'instagram',
+    updated_at REAL
+);
+CREATE INDEX IF NOT EXISTS creators_followers ON creators (follower_count);
+CREATE VIRTUAL TABLE IF NOT EXISTS creators_fts USING fts5(
+    category, biography, post_caption_text,
+    content='creators', content_rowid='rowid', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS creators_ai AFTER INSERT ON creators BEGIN
+    INSERT INTO creators_fts (rowid, category, biography, post_caption_text)
+    VALUES (new.rowid, new.category, new.biography, new.post_caption_text);
+END;
+CREATE TRIGGER IF NOT EXISTS creators_ad AFTER DELETE ON creators BEGIN
+    INSERT INTO creators_fts (creators_fts, rowid, category, biography, post_caption_text)
+    VALUES ('delete', old.rowid, old.category, old.biography, old.post_caption_text);
+END;
+CREATE TRIGGER IF NOT EXISTS creators_au AFTER UPDATE ON creators BEGIN
+    INSERT INTO creators_fts (creators_fts, rowid, category, biography, post_caption_text)
+    VALUES ('delete', old.rowid, old.category, old.biography, old.post_caption_text);
+    INSERT INTO creators_fts (rowid, category, biography, post_caption_text)
+    VALUES (new.rowid, new.category, new.biography, new.post_caption_text);
+END;
+"""
+
+
+def _match_expression(text, stopwords=()):
+    """OR together the query terms, quoted so FTS5 syntax in user text can't break the query."""
+    terms = {t for t in re.findall(r"\w+", (text or '').lower()) if len(t) > 1 and t not in stopwords}
+    return " OR ".join(f'"{t}"' for t in sorted(terms))
+
+
+class CreatorIndex:
+    def __init__(self, path=None):
+        self._lock = threading.Lock()
+        self._conn = connect(path)
+        with self._lock, self._conn:
+            self._conn.executescript(SCHEMA)
+            existing = {row[1] for row in self._conn.execute("PRAGMA table_info(creators)")}
+            for column, ctype in MIGRATIONS.items():
+                if column not in existing:
+                    self._conn.execute(f"ALTER TABLE creators ADD COLUMN {column} {ctype}")
+
+    def upsert(self, creators):
+        """Add or refresh creator records, returns the number written."""
+        now = time.time()
+        rows = [tuple(getattr(c, f) for f in FIELDS) + (now,) for c in creators if c.id]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT INTO creators ({', '.join(FIELDS)}, updated_at) VALUES ({', '.join('?' * (len(FIELDS) + 1))}) "
+                "ON CONFLICT(id) DO UPDATE SET "
+                + ", ".join(f"{f} = excluded.{f}" for f in FIELDS[1:] + ('updated_at',)),
+                rows
+            )
+        return len(rows)
+
+    def search(self, text, min_followers=None, max_followers=None, min_media=None, max_media=None,
+               require_email=True, require_business=True, platforms=None, limit=100, category=None, stopwords=()):
+        """
+        Full-text search over category / bio / captions, best BM25 match first.
+
+        Args:
+            category: When given, one of its terms must match as well (a brief's products alone can't pull in
+                      creators from an unrelated category)
+            stopwords: Query terms to ignore, they would match almost any bio
+
+        Returns:
+            list of Creator
+        """
+        expression = _match_expression(text, stopwords)
+        if not expression:
+            return []
+        if category:
+            required = _match_expression(category, stopwords)
+            if not required:
+                return []
+            expression = f"({expression}) AND ({required})"
+
+        clauses, params = ["creators_fts MATCH ?"], [expression]
+        for column, op, value in (('follower_count', '>=', min_followers), ('follower_count', '<=', max_followers),
+                                  ('media_count', '>=', min_media), ('media_count', '<=', max_media)):
+            if value is not None:
+                clauses.append(f"c.{column} {op} ?")
+                params.append(value)
+        if require_email:
+            clauses.append("c.public_email IS NOT NULL AND c.public_email != ''")
+        if require_business:
+            clauses.append("c.is_business = 1")
+        if platforms:
+            clauses.append(f"c.platform IN ({', '.join('?' * len(platforms))})")
+            params.extend(platforms)
+        params.append(limit)
+
+        query = (f"SELECT {', '.join('c.' + f for f in FIELDS)} FROM creators_fts "
+                 "JOIN creators c ON c.rowid = creators_fts.rowid "
+                 f"WHERE {' AND '.join(clauses)} ORDER BY bm25(creators_fts) LIMIT ?")
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        return [Creator.from_payload(dict(zip(FIELDS, row))) for row in rows]
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM creators").fetchone()[0]
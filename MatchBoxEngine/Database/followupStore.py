@@ -0,0 +1,86 @@
+"""
+MatchBoxAIEngine.Database.followupStore:
+Persistent record of sent emails awaiting a reply / follow-up, so outstanding follow-ups survive a restart.
+
+Developed and maintained by Aditya Gaur / @xdityagr at Github / adityagaur.home@gmail.com
+© 2025 MatchBox AI. All rights reserved.
+"""
+
+import json
+import datetime
+import threading
+
+import pytz
+
+from MatchBoxEngine.Database import connect
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pending_emails (
+    email_key TEXT PRIMARY KEY, account TEXT, to_email TEXT, subject TEXT, message TEXT, sent_at REAL,
+    timeout_hours REAL, followup_sent INTEGER, original_message_id TEXT, message_ids TEXT, context TEXT, due_at REAL,
+    route TEXT
+);
+CREATE INDEX IF NOT EXISTS pending_emails_account ON pending_emails (account);
+"""
+
+MIGRATIONS = {'route': 'TEXT'}
+
+
+class FollowupStore:
+    def __init__(self, account, path=None):
+        """
+        Args:
+            account: Sending account the records belong to (several accounts can share one database)
+            path: SQLite database path (default: MATCHBOX_DB_PATH)
+        """
+        self.account = account
+        self._lock = threading.Lock()
+        self._conn = connect(path)
+        with self._lock, self._conn:
+            self._conn.executescript(SCHEMA)
+            existing = {row[1] for row in self._conn.execute("PRAGMA table_info(pending_emails)")}
+            for column, ctype in MIGRATIONS.items():
+                if column not in existing:
+                    self._conn.execute(f"ALTER TABLE pending_emails ADD COLUMN {column} {ctype}")
+
+    def save(self, email_key, info, due_at):
+        """Insert or update a pending email (the in-memory record used by EmailFollowUpSystem) & its next due time."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pending_emails (email_key, account, to_email, subject, message, sent_at, "
+                "timeout_hours, followup_sent, original_message_id, message_ids, context, due_at, route) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (email_key, self.account, info['to_email'], info['subject'], info['message'],
+                 info['sent_time_utc'].timestamp(), info['timeout_hours'], int(info['followup_sent']),
+                 info.get('original_message_id'), json.dumps(info.get('message_ids') or []),
+                 json.dumps(info.get('context'), default=str), due_at, info.get('route'))
+            )
+
+    def remove(self, email_key):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM pending_emails WHERE email_key = ?", (email_key,))
+
+    def load(self):
+        """{email_key: (pending record, due_at)} for this account."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT email_key, to_email, subject, message, sent_at, timeout_hours, followup_sent, "
+                "original_message_id, message_ids, context, due_at, route FROM pending_emails WHERE account = ?",
+                (self.account,)
+            ).fetchall()
+        pending = {}
+        for (email_key, to_email, subject, message, sent_at, timeout_hours, followup_sent,
+             original_message_id, message_ids, context, due_at, route) in rows:
+            pending[email_key] = ({
+                'to_email': to_email,
+                'subject': subject,
+                'message': message,
+                'sent_time_utc': datetime.datetime.fromtimestamp(sent_at, pytz.utc),
+                'timeout_hours': timeout_hours,
+                'followup_sent': bool(followup_sent),
+                'original_message_id': original_message_id,
+                'message_ids': json.loads(message_ids),
+                'context': json.loads(context) if context else None,
+                'route': route,
+            }, due_at)
+        return pending
@@ -0,0 +1,135 @@
+"""
+MatchBoxAIEngine.Database.hashtagCache:
+Per-category cache of hashtag search / LLM-filtered results and a hashtag co-occurrence graph built from fetched captions.
+
+Developed and maintained by Aditya Gaur / @xdityagr at Github / adityagaur.home@gmail.com
+© 2025 MatchBox AI. All rights reserved.
+"""
+
+import os
+import re
+import json
+import time
+import threading
+from itertools import combinations
+
+from MatchBoxEngine.Database import connect
+
+HASHTAG_RE = re.compile(r"#(\w+)", re.UNICODE)
+MAX_TAGS_PER_CAPTION = 30
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS hashtag_search (category_key TEXT PRIMARY KEY, hashtags TEXT, updated_at REAL);
+CREATE TABLE IF NOT EXISTS hashtag_filtered (category_key TEXT PRIMARY KEY, hashtags TEXT, updated_at REAL);
+CREATE TABLE IF NOT EXISTS hashtag_edges (
+    tag_a TEXT, tag_b TEXT, weight INTEGER DEFAULT 0, PRIMARY KEY (tag_a, tag_b)
+);
+CREATE TABLE IF NOT EXISTS hashtag_yield (tag TEXT PRIMARY KEY, users INTEGER DEFAULT 0, qualified INTEGER DEFAULT 0);
+"""
+
+
+def normalize_category(category):
+    """'  Health & Fitness!! ' -> 'health fitness', so near-identical briefs share a cache entry."""
+    return " ".join(re.findall(r"\w+", (category or '').lower()))
+
+
+def extract_hashtags(caption):
+    tags = []
+    for tag in HASHTAG_RE.findall(caption or ''):
+        tag = tag.lower()
+        if tag not in tags:
+            tags.append(tag)
+    return tags[:MAX_TAGS_PER_CAPTION]
+
+
+class HashtagCache:
+    def __init__(self, ttl_hours=None, path=None):
+        """
+        Args:
+            ttl_hours: How long cached search / filtered sets stay valid (default: HASHTAG_CACHE_TTL_HOURS or 168)
+            path: SQLite database path (default: MATCHBOX_DB_PATH)
+        """
+        if ttl_hours is None:
+            ttl_hours = float(os.getenv("HASHTAG_CACHE_TTL_HOURS", 168))
+        self.ttl_seconds = ttl_hours * 3600
+        self._lock = threading.Lock()
+        self._conn = connect(path)
+        with self._lock, self._conn:
+            self._conn.executescript(SCHEMA)
+
+    def _get(self, table, category):
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT hashtags FROM {table} WHERE category_key = ? AND updated_at >= ?",
+                (normalize_category(category), cutoff)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _put(self, table, category, hashtags):
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {table} (category_key, hashtags, updated_at) VALUES (?, ?, ?)",
+                (normalize_category(category), json.dumps(list(hashtags)), time.time())
+            )
+
+    def get_search(self, category):
+        """Cached `_search_hashtags` result for the category, or None."""
+        return self._get('hashtag_search', category)
+
+    def put_search(self, category, hashtags):
+        self._put('hashtag_search', category, hashtags)
+
+    def get_filtered(self, category):
+        """Cached LLM-filtered top hashtags for the category, or None."""
+        return self._get('hashtag_filtered', category)
+
+    def put_filtered(self, category, hashtags):
+        self._put('hashtag_filtered', category, hashtags)
+
+    def add_captions(self, captions):
+        """Count every pair of hashtags that appear together in a caption (stored in both directions)."""
+        pairs = {}
+        for caption in captions:
+            for a, b in combinations(sorted(extract_hashtags(caption)), 2):
+                pairs[(a, b)] = pairs.get((a, b), 0) + 1
+                pairs[(b, a)] = pairs.get((b, a), 0) + 1
+        if not pairs:
+            return 0
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO hashtag_edges (tag_a, tag_b, weight) VALUES (?, ?, ?) "
+                "ON CONFLICT(tag_a, tag_b) DO UPDATE SET weight = weight + excluded.weight",
+                [(a, b, w) for (a, b), w in pairs.items()]
+            )
+        return len(pairs) // 2
+
+    def record_yield(self, tag, users, qualified):
+        """Track how many profiles a hashtag sent to qualification and how many passed."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO hashtag_yield (tag, users, qualified) VALUES (?, ?, ?) "
+                "ON CONFLICT(tag) DO UPDATE SET users = users + excluded.users, qualified = qualified + excluded.qualified",
+                (tag.lower(), users, qualified)
+            )
+
+    def related(self, seed_tags, limit=5):
+        """
+        Hashtags that co-occur with the seeds, weighted by their (smoothed) historical qualification yield.
+
+        Returns:
+            list of hashtags, best first, excluding the seeds
+        """
+        seeds = [t.lower().lstrip('#') for t in seed_tags or []]
+        if not seeds or limit <= 0:
+            return []
+        placeholders = ", ".join("?" * len(seeds))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT e.tag_b, SUM(e.weight) * (COALESCE(y.qualified, 0) + 1.0) / (COALESCE(y.users, 0) + 2.0) AS score "
+                f"FROM hashtag_edges e LEFT JOIN hashtag_yield y ON y.tag = e.tag_b "
+                f"WHERE e.tag_a IN ({placeholders}) AND e.tag_b NOT IN ({placeholders}) "
+                f"GROUP BY e.tag_b ORDER BY score DESC LIMIT ?",
+                (*seeds, *seeds, limit)
+            ).fetchall()
+        return [tag for tag, _ in rows]
@@ -0,0 +1,149 @@
+"""
+MatchBoxAIEngine.Database.jobStore:
+Checkpoints for discovery jobs (per hashtag & per user) so an interrupted crawl resumes without repeating paid API calls.
+
+Developed and maintained by Aditya Gaur / @xdityagr at Github / adityagaur.home@gmail.com
+© 2025 MatchBox AI. All rights reserved.
+"""
+
+import json
+import time
+import uuid
+import threading
+
+from MatchBoxEngine.Database import connect
+from MatchBoxEngine.DataDefinitions import Creator
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS discovery_jobs (
+    job_id TEXT PRIMARY KEY, category_key TEXT, hashtags TEXT, status TEXT, created_at REAL, updated_at REAL
+);
+CREATE INDEX IF NOT EXISTS discovery_jobs_category ON discovery_jobs (category_key, status);
+CREATE TABLE IF NOT EXISTS job_hashtags (
+    job_id TEXT, hashtag TEXT, posts TEXT, status TEXT, PRIMARY KEY (job_id, hashtag)
+);
+CREATE TABLE IF NOT EXISTS job_users (
+    job_id TEXT, hashtag TEXT, user_id TEXT, status TEXT, creator TEXT, PRIMARY KEY (job_id, hashtag, user_id)
+);
+"""
+
+# Job / hashtag states
+RUNNING, DONE = 'running', 'done'
+# User outcomes, 'fetched' is the checkpoint written as soon as a profile call returns
+FETCHED, QUALIFIED, REJECTED = 'fetched', 'qualified', 'rejected'
+
+
+def slim_post(post):
+    """Keep only what discovery reads from a hashtag post (caption, poster fields, like / comment counts)."""
+    caption = post.get('caption') or {}
+    user = caption.get('user') or {}
+    return {
+        'id': post.get('id') or post.get('pk') or post.get('code'),
+        'like_count': post.get('like_count'),
+        'comment_count': post.get('comment_count'),
+        'caption': {
+            'text': caption.get('text', ''),
+            'user': {k: user.get(k) for k in ('id', 'username', 'is_private', 'is_business', 'follower_count', 'media_count')
+                     if k in user},
+        },
+    }
+
+
+class JobStore:
+    def __init__(self, path=None):
+        self._lock = threading.Lock()
+        self._conn = connect(path)
+        with self._lock, self._conn:
+            self._conn.executescript(SCHEMA)
+
+    def resumable_job(self, category_key):
+        """Latest unfinished job for the category, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT job_id FROM discovery_jobs WHERE category_key = ? AND status = ? ORDER BY updated_at DESC LIMIT 1",
+                (category_key, RUNNING)
+            ).fetchone()
+        return row[0] if row else None
+
+    def create_job(self, category_key, hashtags):
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO discovery_jobs (job_id, category_key, hashtags, status, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, category_key, json.dumps(list(hashtags)), RUNNING, now, now)
+            )
+        return job_id
+
+    def job_hashtags(self, job_id):
+        with self._lock:
+            row = self._conn.execute("SELECT hashtags FROM discovery_jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def finish_job(self, job_id):
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE discovery_jobs SET status = ?, updated_at = ? WHERE job_id = ?",
+                               (DONE, time.time(), job_id))
+
+    def save_posts(self, job_id, hashtag, posts):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO job_hashtags (job_id, hashtag, posts, status) VALUES (?, ?, ?, ?)",
+                (job_id, hashtag, json.dumps([slim_post(p) for p in posts]), RUNNING)
+            )
+            self._conn.execute("UPDATE discovery_jobs SET updated_at = ? WHERE job_id = ?", (time.time(), job_id))
+
+    def load_posts(self, job_id, hashtag):
+        """Posts fetched earlier for this hashtag, or None if the feed was never fetched."""
+        with self._lock:
+            row = self._conn.execute("SELECT posts FROM job_hashtags WHERE job_id = ? AND hashtag = ?",
+                                     (job_id, hashtag)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def finish_hashtag(self, job_id, hashtag):
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE job_hashtags SET status = ? WHERE job_id = ? AND hashtag = ?", (DONE, job_id, hashtag))
+
+    def hashtag_finished(self, job_id, hashtag):
+        with self._lock:
+            row = self._conn.execute("SELECT status FROM job_hashtags WHERE job_id = ? AND hashtag = ?",
+                                     (job_id, hashtag)).fetchone()
+        return row is not None and row[0] == DONE
+
+    def record_fetched(self, job_id, hashtag, creator):
+        """Checkpoint a single profile right after it was fetched, before the hashtag's batch is qualified."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO job_users (job_id, hashtag, user_id, status, creator) VALUES (?, ?, ?, ?, ?)",
+                (job_id, hashtag, creator.id, FETCHED, json.dumps(creator.to_dict()))
+            )
+
+    def record_users(self, job_id, hashtag, qualified, rejected):
+        """Checkpoint profile outcomes for a hashtag: qualified Creators (kept in full) and rejected user IDs."""
+        rows = [(job_id, hashtag, c.id, QUALIFIED, json.dumps(c.to_dict())) for c in qualified]
+        rows += [(job_id, hashtag, str(uid), REJECTED, None) for uid in rejected]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO job_users (job_id, hashtag, user_id, status, creator) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+
+    def processed_users(self, job_id, hashtag):
+        """{user_id: Creator (fetched / qualified) or None (rejected)} for users already checked under this hashtag."""
+        with self._lock:
+            rows = self._conn.execute("SELECT user_id, status, creator FROM job_users WHERE job_id = ? AND hashtag = ?",
+                                      (job_id, hashtag)).fetchall()
+        return {uid: (Creator.from_payload(json.loads(creator)) if creator else None)
+                for uid, status, creator in rows}
+
+    def progress(self, job_id):
+        """(hashtags done, hashtags total, users processed, creators qualified)"""
+        with self._lock:
+            total = len(json.loads(self._conn.execute(
+                "SELECT hashtags FROM discovery_jobs WHERE job_id = ?", (job_id,)).fetchone()[0]))
+            done = self._conn.execute("SELECT COUNT(*) FROM job_hashtags WHERE job_id = ? AND status = ?",
+                                      (job_id, DONE)).fetchone()[0]
+            users, qualified = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(status = ?), 0) FROM job_users WHERE job_id = ?", (QUALIFIED, job_id)
+            ).fetchone()
+        return done, total, users, qualified
@@ -0,0 +1,43 @@
+"""
+MatchBoxAIEngine.Database.mailboxState:
+Persisted IMAP sync position (UIDVALIDITY & last processed UID) per account & mailbox, for incremental reply checks.
+
+Developed and maintained by Aditya Gaur / @xdityagr at Github / adityagaur.home@gmail.com
+© 2025 MatchBox AI. All rights reserved.
+"""
+
+import time
+import threading
+
+from MatchBoxEngine.Database import connect
+
+
+class MailboxState:
+    def __init__(self, path=None):
+        """
+        Args:
+            path: SQLite database path (default: MATCHBOX_DB_PATH)
+        """
+        self._lock = threading.Lock()
+        self._conn = connect(path)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS mailbox_state ("
+                "account TEXT, mailbox TEXT, uidvalidity INTEGER, last_uid INTEGER, updated_at REAL, "
+                "PRIMARY KEY (account, mailbox))"
+            )
+
+    def get(self, account, mailbox='INBOX'):
+        """(uidvalidity, last_uid) or None if the mailbox was never synced."""
+        with self._lock:
+            row = self._conn.execute("SELECT uidvalidity, last_uid FROM mailbox_state WHERE account = ? AND mailbox = ?",
+                                     (account, mailbox)).fetchone()
+        return tuple(row) if row else None
+
+    def set(self, account, mailbox, uidvalidity, last_uid):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO mailbox_state (account, mailbox, uidvalidity, last_uid, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (account, mailbox, uidvalidity, last_uid, time.time())
+            )
@@ -0,0 +1,80 @@
+"""
+MatchBoxAIEngine.Database.negativeCache:
+Persistent cache of creator IDs that recently failed qualification, so they are not re-fetched. Rejections that
+depend on a campaign's thresholds (followers, media count) only apply to campaigns at least as strict.
+
+Developed and maintained by Aditya Gaur / @xdityagr at Github / adityagaur.home@gmail.com
+© 2025 MatchBox AI. All rights reserved.
+"""
+
+import os
+import time
+import threading
+
+from MatchBoxEngine.Database import connect
+
+# Rejection reasons that depend on the campaign's min_followers / min_media_count.
+THRESHOLD_REASONS = {'followers', 'media_count', 'unqualified'}
+
+# Columns added after the first release, created on older databases at startup.
+MIGRATIONS = {'min_followers': 'INTEGER', 'min_media_count': 'INTEGER'}
+
+
+class NegativeCache:
+    def __init__(self, ttl_hours=None, path=None):
+        """
+        Args:
+            ttl_hours: How long a rejection is remembered (default: NEGATIVE_CACHE_TTL_HOURS or 72)
+            path: SQLite database path (default: MATCHBOX_DB_PATH)
+        """
+        if ttl_hours is None:
+            ttl_hours = float(os.getenv("NEGATIVE_CACHE_TTL_HOURS", 72))
+        self.ttl_seconds = ttl_hours * 3600
+        self._lock = threading.Lock()
+        self._conn = connect(path)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS negative_cache ("
+                "user_id TEXT PRIMARY KEY, reason TEXT, rejected_at REAL NOT NULL, "
+                "min_followers INTEGER, min_media_count INTEGER)"
+            )
+            existing = {row[1] for row in self._conn.execute("PRAGMA table_info(negative_cache)")}
+            for column, ctype in MIGRATIONS.items():
+                if column not in existing:
+                    self._conn.execute(f"ALTER TABLE negative_cache ADD COLUMN {column} {ctype}")
+
+    def contains(self, user_id, min_followers=0, min_media_count=0):
+        """
+        True if `user_id` was rejected within the TTL window, for a reason that still holds at these thresholds
+        (a creator below a 100k minimum may well qualify for a 1k one).
+        """
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT reason, min_followers, min_media_count FROM negative_cache WHERE user_id = ? AND rejected_at >= ?",
+                (str(user_id), cutoff)
+            ).fetchone()
+        if row is None:
+            return False
+        reason, rejected_followers, rejected_media = row
+        if reason not in THRESHOLD_REASONS:
+            return True
+        # Older rows carry no thresholds, they can't be trusted for another campaign.
+        return (rejected_followers is not None and rejected_media is not None
+                and min_followers >= rejected_followers and min_media_count >= rejected_media)
+
+    def add(self, user_id, reason='', min_followers=None, min_media_count=None):
+        """Remember a rejection, with the thresholds it was made at for the threshold-dependent reasons."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO negative_cache (user_id, reason, rejected_at, min_followers, min_media_count) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (str(user_id), reason, time.time(), min_followers, min_media_count)
+            )
+
+    def purge_expired(self):
+        """Drop entries older than the TTL, returns the number removed."""
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock, self._conn:
+            cur = self._conn.execute("DELETE FROM negative_cache WHERE rejected_at < ?", (cutoff,))
+        return cur.rowcount
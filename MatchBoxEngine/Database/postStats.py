@@ -0,0 +1,49 @@
+"""
+MatchBoxAIEngine.Database.postStats:
+Like / comment counts of every hashtag post seen while crawling, so engagement & ROI can be computed for creators
+loaded later (dataset files, the creator index) without re-fetching their posts.
+
+Developed and maintained by Aditya Gaur / @xdityagr at Github / adityagaur.home@gmail.com
+© 2025 MatchBox AI. All rights reserved.
+"""
+
+import threading
+
+from MatchBoxEngine.Database import connect
+
+
+class PostStats:
+    def __init__(self, path=None):
+        """
+        Args:
+            path: SQLite database path (default: MATCHBOX_DB_PATH)
+        """
+        self._lock = threading.Lock()
+        self._conn = connect(path)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS post_stats ("
+                "post_id TEXT PRIMARY KEY, user_id TEXT, like_count INTEGER, comment_count INTEGER)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS post_stats_user ON post_stats (user_id)")
+
+    def add(self, rows):
+        """rows: (post_id, user_id, like_count, comment_count), a post seen again keeps its latest counts."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO post_stats (post_id, user_id, like_count, comment_count) VALUES (?, ?, ?, ?)",
+                [(str(pid), str(uid), likes, comments) for pid, uid, likes, comments in rows]
+            )
+
+    def for_users(self, user_ids, chunk_size=500):
+        """(post_id, user_id, like_count, comment_count) of every stored post by these users."""
+        user_ids = [str(uid) for uid in user_ids]
+        rows = []
+        with self._lock:
+            for i in range(0, len(user_ids), chunk_size):
+                chunk = user_ids[i:i + chunk_size]
+                rows += self._conn.execute(
+                    f"SELECT post_id, user_id, like_count, comment_count FROM post_stats "
+                    f"WHERE user_id IN ({', '.join('?' * len(chunk))})", chunk
+                ).fetchall()
+        return rows
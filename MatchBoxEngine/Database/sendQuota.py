@@ -0,0 +1,50 @@
+"""
+MatchBoxAIEngine.Database.sendQuota:
+Emails sent per account per (UTC) day, so the daily sending quota holds across restarts & worker processes.
+
+Developed and maintained by Aditya Gaur / @xdityagr at Github / adityagaur.home@gmail.com
+© 2025 MatchBox AI. All rights reserved.
+"""
+
+import threading
+
+from MatchBoxEngine.Database import connect
+
+
+class SendQuota:
+    def __init__(self, account, path=None):
+        """
+        Args:
+            account: Sending account the counts belong to
+            path: SQLite database path (default: MATCHBOX_DB_PATH)
+        """
+        self.account = account
+        self._lock = threading.Lock()
+        self._conn = connect(path)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS send_quota (account TEXT, day TEXT, sent INTEGER, PRIMARY KEY (account, day))"
+            )
+
+    def used(self, day):
+        with self._lock:
+            row = self._conn.execute("SELECT sent FROM send_quota WHERE account = ? AND day = ?",
+                                     (self.account, day)).fetchone()
+        return row[0] if row else 0
+
+    def try_add(self, day, limit):
+        """
+        Count one send if fewer than `limit` went out on `day`, as a single conditional UPDATE so processes sharing
+        the database can't overspend the quota together. Returns the new count, None when the limit was reached.
+        """
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR IGNORE INTO send_quota (account, day, sent) VALUES (?, ?, 0)",
+                               (self.account, day))
+            updated = self._conn.execute(
+                "UPDATE send_quota SET sent = sent + 1 WHERE account = ? AND day = ? AND sent < ?",
+                (self.account, day, limit)
+            ).rowcount
+            if not updated:
+                return None
+            return self._conn.execute("SELECT sent FROM send_quota WHERE account = ? AND day = ?",
+                                      (self.account, day)).fetchone()[0]
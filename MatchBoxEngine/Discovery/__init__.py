@@ -13,61 +13,125 @@ from dotenv import load_dotenv
 import os
 from MatchBoxEngine.Model import ModelHandler
 from MatchBoxEngine.Outreach.callingEngine import VapiClient
+from MatchBoxEngine.Outreach.emailEngine import _process_ifc
+from MatchBoxEngine.Outreach.outreachPipeline import OutreachPipeline
+from MatchBoxEngine.Outreach.replyClassifier import classify_reply
 from MatchBoxEngine.Query.parser import *
+from MatchBoxEngine.DataDefinitions import Creator, CreatorBatch
+from MatchBoxEngine.Database.negativeCache import NegativeCache
+from MatchBoxEngine.Database.creatorIndex import CreatorIndex
+from MatchBoxEngine.Database.hashtagCache import HashtagCache, normalize_category
+from MatchBoxEngine.Database.jobStore import JobStore
+from MatchBoxEngine.Database.contactRegistry import ContactRegistry
+from MatchBoxEngine.Database.crawlLease import CrawlLease
+from MatchBoxEngine.Database.postStats import PostStats
+from MatchBoxEngine.Discovery.scoring import RelevanceScorer, campaign_query_text, STOPWORDS
+from MatchBoxEngine.Discovery.analytics import EngagementAnalytics
+from MatchBoxEngine.Discovery.adapters import shared_adapters, platform_key
 
 import threading
+import time
+import uuid
+from collections import Counter
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 load_dotenv(override=True)
 
+
+def _write_json_atomic(path, data):
+    """Write to a temp file next to `path` and rename over it, readers never see a half-written dataset."""
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=4)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
 class Engine:
-    def __init__(self):
-        self.base_url = "https://instagram-social-api.p.rapidapi.com/v1/"
-        self._api_key = os.getenv("RAPID_API_KEY")
+    def __init__(self, adapters=None):
+        """
+        Args:
+            adapters: Optional {platform: DiscoveryAdapter}, by default the process-wide shared ones (Instagram, plus
+                      YouTube when YOUTUBE_API_KEY is set), see adapters.shared_adapters
+        """
         self.CONTACT_EMAIL = os.getenv("CONTACT_MAIL")
-        
-        self.post_headers = {
-            "x-rapidapi-key": self._api_key,
-            "x-rapidapi-host": "instagram-social-api.p.rapidapi.com"
-        }
+
+        self.adapters = adapters if adapters is not None else shared_adapters()
         self.mH = ModelHandler()
         self.min_followers = 1000
-
-    def _search_hashtags(self, query=''):
-        query_url = self.base_url + 'search_hashtags'
-        querystring = {"search_query":query}
-        response = requests.get(query_url, headers=self.post_headers, params=querystring)
-        data = response.json()
-        # print(data)
-        root = data['data']['items']
-        hashtags = []
-        for hashtag_info in root: hashtags.append(hashtag_info['name'])
-        return hashtags
-    
-    def _get_posts_by_hashtag(self, hashtag):
-        url = self.base_url + 'hashtag'
-        params = {'hashtag': hashtag}
-        resp = requests.get(url, headers=self.post_headers, params=params).json()
-        with open('hashtag_search.json', 'w') as f: json.dump(resp, f, indent=4)
-        return resp['data']['items']
-    
-    def get_user_info(self, username_or_userid):
-        url = self.base_url + 'info'
-        params = {"username_or_id_or_url":username_or_userid}
-        resp = requests.get(url, headers=self.post_headers, params=params).json()
-        with open('user_info.json', 'w') as f: json.dump(resp, f, indent=4)
-        return resp['data']
-
-    def is_valid_influencer(self, user_data):
-        if not user_data.get("is_business"):
-            return False
-        if not user_data.get("public_email"):
-            return False
-        if user_data.get("follower_count", 0) < self.min_followers:
-            return False
-        if user_data.get("media_count", 0) < 20:
-            return False
-        return True
+        self.min_media_count = 20
+        self.negative_cache = NegativeCache()
+        self.post_stats = PostStats()  # Post likes / comments, engagement of creators loaded from files / the index
+        self.run_stats = Counter()
+        self.reply_stats = Counter()  # Across runs, replies keep arriving after start() returns
+        self._called = set()  # Replies a call was placed for, a retried callback must not dial the creator again
+        self._counted_replies = set()  # Replies already in reply_stats, retries of their callback aren't counted again
+        self._stats_lock = threading.Lock()
+        self.scorer = RelevanceScorer()
+        self.rerank_top_k = int(os.getenv("RERANK_TOP_K", 40))
+        self.creator_index = CreatorIndex()
+        self.index_min_hits = int(os.getenv("INDEX_MIN_HITS", 20))
+        self.hashtag_cache = HashtagCache()
+        self.hashtag_expansion = int(os.getenv("HASHTAG_EXPANSION", 3))
+        self.job_store = JobStore()
+        self.contact_registry = ContactRegistry()
+        self.contact_cooldown_days = None
+        self.crawl_lease = CrawlLease()
+
+    def is_valid_influencer(self, creator, adapter=None):
+        return bool(self.filter_valid_influencers([creator], adapter))
+
+    def filter_valid_influencers(self, creators, adapter=None):
+        """Vectorized threshold filtering over a whole batch of creators, returns the ones that qualify."""
+        adapter = adapter or self.adapters['instagram']
+        return adapter.qualify(creators, self.min_followers, self.min_media_count)
+
+    def campaign_platforms(self, campaign_info):
+        """Adapters for the platforms named in the brief that we can discover on (Instagram when none match)."""
+        names = campaign_info.get('platform') or campaign_info.get('platforms') or []
+        if isinstance(names, str):
+            names = [names]
+        keys = []
+        for name in names:
+            key = platform_key(name)
+            if key in self.adapters and key not in keys:
+                keys.append(key)
+        return keys or ['instagram']
+
+    def _count(self, key, n=1):
+        with self._stats_lock:
+            self.run_stats[key] += n
+
+    def report_run_stats(self):
+        """Summary of RapidAPI profile calls made vs. avoided in the last crawl."""
+        stats = self.run_stats
+        avoided = stats['prefiltered'] + stats['negative_cache_hits'] + stats['already_contacted']
+        candidates = avoided + stats['profile_fetches']
+        saved_pct = (avoided / candidates * 100) if candidates else 0.0
+        return (f"[stats] candidates={candidates} profile_fetches={stats['profile_fetches']} "
+                f"prefiltered={stats['prefiltered']} negative_cache_hits={stats['negative_cache_hits']} "
+                f"already_contacted={stats['already_contacted']} "
+                f"qualified={stats['qualified']} calls_saved={saved_pct:.1f}%")
+
+    def _count_reply(self, reply_key, outcome):
+        """Count a reply & how it was classified once, however many attempts the dispatcher makes at it."""
+        with self._stats_lock:
+            if reply_key in self._counted_replies:
+                return
+            self._counted_replies.add(reply_key)
+            self.reply_stats['replies'] += 1
+            self.reply_stats[outcome] += 1
+
+    def report_reply_stats(self):
+        """Replies classified locally vs. sent to the LLM."""
+        with self._stats_lock:
+            stats = dict(self.reply_stats)
+        replies = stats.get('replies', 0)
+        local = stats.get('classified_locally', 0)
+        saved_pct = (local / replies * 100) if replies else 0.0
+        return (f"[replies] replies={replies} classified_locally={local} llm_calls={stats.get('llm_calls', 0)} "
+                f"llm_calls_saved={saved_pct:.1f}%")
 
     def _load_from_file(self, path):
         with open(path, 'r') as f:
@@ -75,110 +139,230 @@ class Engine:
 
         all_influencers = []
         for influencers in dataset.values():
-            all_influencers.extend(influencers)
+            all_influencers.extend(Creator.from_payload(influencer) for influencer in influencers)
 
-        unique_influencers = { influencer['id']: influencer for influencer in all_influencers }
+        unique_influencers = { influencer.id: influencer for influencer in all_influencers }
         final_list = list(unique_influencers.values())
+        EngagementAnalytics(self.post_stats).compute([c for c in final_list if c.engagement_rate is None])
         return final_list
     
 
-    def format_profiles_for_whatsapp(self, top_profile_data):
+    def format_profiles_for_whatsapp(self, creators):
 
-        if not top_profile_data:
+        if not creators:
             return "No creator profiles to display."
 
         whatsapp_message_parts = ["*✨ Top Creator Profiles ✨*\n"]
 
-        for i, profile in enumerate(top_profile_data):
-            username, full_name, public_email, category, media_count, follower_count = profile
-            
+        for i, creator in enumerate(creators):
             # Format each profile entry
             profile_entry = (
                 f"🌟 *Creator #{i+1}*\n"
-                f"👤 *Username:* @{username}\n"
-                f"📛 *Name:* {full_name}\n"
-                f"📧 *Email:* {public_email if public_email else 'N/A'}\n"
-                f"🎯 *Category:* {category}\n"
-                f"📸 *Posts:* {media_count:,}\n"
-                f"📈 *Followers:* {follower_count:,}\n"
+                f"👤 *Username:* @{creator.username}\n"
+                f"📛 *Name:* {creator.full_name}\n"
+                f"📧 *Email:* {creator.public_email if creator.public_email else 'N/A'}\n"
+                f"🎯 *Category:* {creator.category}\n"
+                f"📸 *Posts:* {creator.media_count:,}\n"
+                f"📈 *Followers:* {creator.follower_count:,}\n"
             )
             whatsapp_message_parts.append(profile_entry)
 
         # Join all parts with an extra newline for spacing between entries
         return "\n".join(whatsapp_message_parts)
     
+    def select_hashtags(self, category, adapter=None):
+        """
+        Top hashtags (seeds) to crawl for a category on a platform. Search results and the LLM-filtered set
+        are cached per platform & normalized category, and the set is topped up with related high-yield
+        hashtags from the local co-occurrence graph (no API / LLM call).
+        """
+        adapter = adapter or self.adapters['instagram']
+        cache_key = f"{adapter.platform} {category}"
+        hashtags_filtered = self.hashtag_cache.get_filtered(cache_key)
+        if hashtags_filtered is not None:
+            print(f"[hashtags] Using cached hashtag set for '{category}'")
+        else:
+            hashtags = self.hashtag_cache.get_search(cache_key)
+            if hashtags is None:
+                hashtags = adapter.search(category)
+                self.hashtag_cache.put_search(cache_key, hashtags)
+
+            if len(hashtags) <= 10:
+                # Few enough seeds already (e.g. keyword search platforms), no LLM pass needed.
+                hashtags_filtered = hashtags
+            else:
+                print('\n\n\n\nHashtags : ')
+                print(hashtags)
+                print('\n\n\n')
+                resp_hashtag = self.mH.instant_chat('You are a social media expert with advanced data analysis abilities whose one and only task is to filter out the best hashtags (Top 10) out of a bunch given to you as a python list, on the basis of how well they fit with the category provided & how probable it is for influencers to post to that hashtag. You only have to reply with JSON object as follows : {result:[]}',f"Category : {category}, Hashtags : {hashtags}")
+
+                print('\n\n\n\n')
+                print(resp_hashtag)
+                print('\n\n\n')
+                hashtags_filtered = (llm_fromJSON(resp_hashtag) or {}).get('result')
+                if hashtags_filtered:
+                    self.hashtag_cache.put_filtered(cache_key, hashtags_filtered)
+                else:
+                    hashtags_filtered = hashtags[:10]
+
+        expansion = self.hashtag_cache.related(hashtags_filtered, limit=self.hashtag_expansion)
+        if expansion:
+            print(f"[hashtags] Expanded with related hashtags : {expansion}")
+        hashtags_filtered = list(hashtags_filtered) + expansion
+        print(f'{hashtags_filtered=}')
+        return hashtags_filtered
+
     def start(self, campaign_info, call_backs, callback_arg, emailEngine):
         callback1, callback2_img = call_backs
         callback1(callback_arg, "Creator Search has started ...")
         category = campaign_info.get('category')
         self.min_followers = campaign_info.get('min_followers', 1000)
-
-        hashtags = self._search_hashtags(category)
-        
-        print('\n\n\n\nHashtags : ')
-        print(hashtags)
-        print('\n\n\n')
-        resp_hashtag = self.mH.instant_chat('You are a social media expert with advanced data analysis abilities whose one and only task is to filter out the best hashtags (Top 10) out of a bunch given to you as a python list, on the basis of how well they fit with the category provided & how probable it is for influencers to post to that hashtag. You only have to reply with JSON object as follows : {result:[]}',f"Category : {category}, Hashtags : {hashtags}")
-
-        print('\n\n\n\n')
-        print(resp_hashtag)
-        print('\n\n\n')
-        hashtags_filtered = llm_fromJSON(resp_hashtag).get('result')
-        print(f'{hashtags_filtered=}')
-        dataset_path = f'influencer_dataset_{category}.json'
-        if os.path.exists(dataset_path):
-            creators_list_raw = self._load_from_file(dataset_path)
+        self.run_stats = Counter()
+        self.contact_cooldown_days = campaign_info.get('contact_cooldown_days')
+        self.contact_registry.refresh()
+
+        # Answer from previously crawled creators first, only crawl when the index can't fill the brief.
+        t0 = time.perf_counter()
+        indexed = self.creator_index.search(campaign_query_text(campaign_info),
+                                            min_followers=self.min_followers,
+                                            max_followers=campaign_info.get('max_followers'),
+                                            min_media=self.min_media_count,
+                                            platforms=self.campaign_platforms(campaign_info),
+                                            limit=self.rerank_top_k * 5,
+                                            category=category, stopwords=STOPWORDS)
+        EngagementAnalytics(self.post_stats).compute([c for c in indexed if c.engagement_rate is None])
+        print(f"[index] {len(indexed)} indexed creators matched in {(time.perf_counter() - t0) * 1000:.1f} ms")
+
+        if len(indexed) >= self.index_min_hits:
+            creators_list_raw = indexed
         else:
-            creators_list_raw = self.run_userprofile_processor(hashtags_filtered, max_users_per_hashtag=35, output_file=f'influencer_dataset_{category}.json')
-        
-        bios = [info['biography'] for info in creators_list_raw]
+            # Fan out across the brief's platforms concurrently and merge everything into one list.
+            platforms = self.campaign_platforms(campaign_info)
+            progress = lambda msg: callback1(callback_arg, msg)
+            with ThreadPoolExecutor(max_workers=len(platforms)) as executor:
+                futures = {executor.submit(self.discover_platform, self.adapters[key], category, progress): key for key in platforms}
+                creators_list_raw = []
+                for future in as_completed(futures):
+                    try:
+                        creators_list_raw.extend(future.result())
+                    except Exception as e:
+                        print(f"[!] Discovery on {futures[future]} failed: {e}")
+            self.creator_index.upsert(creators_list_raw)
+
+            crawled_ids = {creator.id for creator in creators_list_raw}
+            creators_list_raw = creators_list_raw + [creator for creator in indexed if creator.id not in crawled_ids]
+
+        # Local relevance ranking, only the top-K shortlist is sent to the LLM for the final rerank.
+        t0 = time.perf_counter()
+        ranked = self.scorer.top_k(creators_list_raw, campaign_info, self.rerank_top_k)
+        shortlist = [creators_list_raw[idx] for idx in ranked]
+        print(f"[scoring] Ranked {len(creators_list_raw)} creators in {(time.perf_counter() - t0) * 1000:.1f} ms, shortlisted {len(shortlist)}")
+
+        bios = [creator.biography for creator in shortlist]
         print('here 1.')
         resp_bios = self.mH.instant_chat('You are a social media expert with advanced data analysis abilities whose one and only task is to filter out the bios out of a bunch given to you as a python list, on the basis of how well they fit with the category provided & how probable it is that the bio is from an influencer which should be considered a parameter of upmost priority. You only have to reply with JSON object with the indices of the best bios (Make sure to provide this indices the python way and make SURE that the indices do not exceed length of the list.) : {result:[]}',f"Category : {category}, Bios : {bios}")
-        bios_filtered = llm_fromJSON(resp_bios).get('result')
-        print(len(creators_list_raw), bios_filtered)
-        final_creator_list = [creators_list_raw[idx] if idx < len(creators_list_raw) else creators_list_raw[idx-1] for idx in bios_filtered]
+        bios_filtered = (llm_fromJSON(resp_bios) or {}).get('result') or []
+        print(len(shortlist), bios_filtered)
+        final_creator_list = [shortlist[idx] for idx in bios_filtered if isinstance(idx, int) and 0 <= idx < len(shortlist)]
+        if not final_creator_list:
+            # LLM rerank failed or returned nothing usable, fall back to the local ranking.
+            final_creator_list = shortlist
         print('here 2.')
         callback1(callback_arg, f"Creator Search has ended.\nSuccessfully found {len(final_creator_list)} creators.\nHere are the top few creators found :")
-        pfp_links = [profile['profile_pic_url_hd'] for profile in final_creator_list[:4]]
+        pfp_links = [creator.profile_pic_url_hd for creator in final_creator_list[:4]]
         for link in pfp_links:
             callback2_img(callback_arg, link)
         
-        top_profile_data = [(profile['username'], profile['full_name'], profile['public_email'], profile['category'], profile['media_count'], profile['follower_count']) for profile in final_creator_list[:4]]
-        string_data = self.format_profiles_for_whatsapp(top_profile_data)
+        string_data = self.format_profiles_for_whatsapp(final_creator_list[:4])
     
         callback1(callback_arg, f"{string_data}")
-        if len(final_creator_list) > 1:
+        if final_creator_list and not emailEngine.is_running():
+            print("[outreach] Email engine not running (EMAIL_ADDRESS / EMAIL_PASSWORD not set), skipping outreach.")
+            callback1(callback_arg, "Email outreach isn't configured yet, so I couldn't mail these creators. 🛠️")
+        elif final_creator_list:
             callback1(callback_arg, f"Now, I will outreach to them via Mail, I will make sure to update you! 📨📩")
                             
             # OUTREACHING WILL START HERE : 
             self.emailEngine = emailEngine
-            
-            influencer =  final_creator_list[0]
-            self.globals = {'campaign_info':campaign_info, 'influencer_info':{
-                'name': influencer['full_name'], 
-                'email': influencer['public_email'], 
-                'niche': category, 
-                'followers': influencer['media_count'], 
-                'bio':influencer['biography'], 
-                'engagement_rate': '78',
-                'roi_score': 9.0,
-                'language': 'English',
-                'age_range': 'All'
-
-            }}
-
-            emailEngine.register_reply_callback(self.mail_callback)
-            prompt, content = self._generate_email_prompt(self.globals.get('influencer_info'), self.globals.get('campaign_info'))
-            resp = self.mH.instant_chat(prompt , content)
-            if resp:
-                subject, body = self._extract_emailctx(resp)
+            influencers = [self._influencer_info(creator, category) for creator in final_creator_list]
+
+            # Replies to this campaign's emails come back to this engine, with the brief & creator they were sent for.
+            self.campaign_id = uuid.uuid4().hex
+            emailEngine.register_reply_route(self.campaign_id, self.mail_callback)
+            pipeline = OutreachPipeline(self.mH, emailEngine, self._generate_email_prompt, self._extract_emailctx,
+                                        contact_registry=self.contact_registry)
+            # Outreach is still routed to CONTACT_MAIL when it is set (sandbox), otherwise to the creator's own email.
+            sent, _ = pipeline.run(influencers, campaign_info, timeout_hours=2, recipient_override=self.CONTACT_EMAIL,
+                                   route=self.campaign_id)
+            print(f"[outreach] {pipeline.format_stats()}")
+            status = pipeline.send_status
+            if status and status['first_touch_remaining'] == 0:
+                callback1(callback_arg, "Today's email sending limit has been reached, the remaining creators will be contacted tomorrow.")
+            elif status and status['backpressure']:
+                drain = status['projected_drain_seconds']
+                callback1(callback_arg, f"Our mail queue is busy ({status['queue_depth']} emails ahead), your emails may take "
+                                        f"{'a while' if drain is None else f'~{max(1, round(drain / 60))} min'} to go out.")
+            if not sent:
+                emailEngine.unregister_reply_route(self.campaign_id)
+
+            callback1(callback_arg, f"Mails have been sent to {sent} creators, Waiting for them to get back! 📩✅")
             
 
-            emailEngine.send_email_with_followup(self.CONTACT_EMAIL, subject, body, timeout_hours=2)
-            # emailEngine.send_email_with_followup('adityagaur.home@gmail.com', subject, body, timeout_hours=2)
+    def _influencer_info(self, creator, niche):
+        return {
+            'id': creator.id,
+            'name': creator.full_name or creator.username, 
+            'email': creator.public_email, 
+            'niche': niche, 
+            'followers': creator.follower_count, 
+            'bio': creator.biography, 
+            'engagement_rate': creator.engagement_rate if creator.engagement_rate is not None else 'N/A',
+            'roi_score': creator.roi_score if creator.roi_score is not None else 'N/A',
+            'language': 'English',
+            'age_range': 'All'
+        }
 
-            callback1(callback_arg, f"Mails have been sent to the creators, Waiting for them to get back! 📩✅")
-            
+    def discover_platform(self, adapter, category, progress_callback=None):
+        """
+        Crawl one platform for a category (resuming an unfinished job for it if there is one). Only one crawl per
+        platform & category runs at a time across workers, concurrent callers wait for it and share its dataset.
+        """
+        suffix = category if adapter.platform == 'instagram' else f"{adapter.platform}_{category}"
+        dataset_path = f'influencer_dataset_{suffix}.json'
+        if os.path.exists(dataset_path):
+            return self._load_from_file(dataset_path)
+
+        category_key = normalize_category(f"{adapter.platform} {category}")
+        owner = self.crawl_lease.acquire(category_key)
+        while owner is None:
+            self._count('crawl_waits')
+            if progress_callback:
+                progress_callback(f"A {adapter.platform} creator search for '{category}' is already running, waiting for it to finish ...")
+            self.crawl_lease.wait(category_key)
+            if os.path.exists(dataset_path):
+                return self._load_from_file(dataset_path)
+            # The other crawl failed or its worker died, take over (its job checkpoints are resumed below).
+            owner = self.crawl_lease.acquire(category_key)
+
+        with self.crawl_lease.holding(category_key, owner):
+            # The previous holder may have finished between our existence check and acquiring the lease.
+            if os.path.exists(dataset_path):
+                return self._load_from_file(dataset_path)
+            return self._crawl_platform(adapter, category, category_key, dataset_path, progress_callback)
+
+    def _crawl_platform(self, adapter, category, category_key, dataset_path, progress_callback=None):
+        # Resume an interrupted crawl for this category (same hashtags, checkpointed results) if there is one.
+        job_id = self.job_store.resumable_job(category_key)
+        if job_id:
+            hashtags_filtered = self.job_store.job_hashtags(job_id)
+            done, total, users, qualified = self.job_store.progress(job_id)
+            if progress_callback:
+                progress_callback(f"Resuming the previous {adapter.platform} creator search ({done}/{total} hashtags, {qualified} creators found so far) ...")
+        else:
+            hashtags_filtered = self.select_hashtags(category, adapter)
+            job_id = self.job_store.create_job(category_key, hashtags_filtered)
+        return self.run_userprofile_processor(hashtags_filtered, max_users_per_hashtag=35, output_file=dataset_path,
+                                              job_id=job_id, progress_callback=progress_callback, adapter=adapter)
 
     def _extract_emailctx(self, response_text):
         subject_match = re.search(r"<subject>(.*?)</subject>", response_text, re.DOTALL)
@@ -220,7 +404,7 @@ class Engine:
         influencer_name = influencer_info.get("name", "N/A") # This will be full_name from source
         influencer_email = influencer_info.get("email", "N/A") # This will be public_email from source
         influencer_niche = influencer_info.get("niche", "N/A") # This will be category from source
-        influencer_followers = influencer_info.get("followers", "N/A") # This will be media_count from source
+        influencer_followers = influencer_info.get("followers", "N/A") # This will be follower_count from source
         influencer_engagement_rate = influencer_info.get("engagement_rate", "N/A")
         influencer_bio = influencer_info.get("bio", "N/A") # This will be biography from source
         influencer_roi_score = influencer_info.get("roi_score", "N/A")
@@ -263,9 +447,26 @@ Their audience's age range - {influencer_age_range}
         return prompt , content
     
 
+    @staticmethod
+    def _reply_key(sender_email, original_sent_info):
+        """The email a reply answers, the same across the dispatcher's retries of its callback"""
+        return (original_sent_info or {}).get('original_message_id') or sender_email
+
     def mail_callback(self, sender_email, subject, body, original_sent_info):
+        """
+        Reply handler, run by the email engine's callback dispatcher. Failures before the call is placed raise so the
+        dispatcher retries, the call itself is placed at most once per reply.
+        """
         print(f"\n📧 Reply from {sender_email} - Subject: {subject}")
         try:
+            # Clear cases (a phone number, a plain yes / no) are settled locally, the LLM only sees the rest.
+            classified = classify_reply(subject, body)
+            self._count_reply(self._reply_key(sender_email, original_sent_info),
+                              'classified_locally' if classified else 'llm_calls')
+            if classified:
+                print(f"Classified locally: {classified[0]}")
+                return self._act_on_reply(sender_email, *classified, original_sent_info)
+
             prompt = """You are an automation bot from MatchBox AI (use this as your name) made for analyzing the reply of the client (influencer) to a mail which was sent in order to get their phone number to proceed further negotiation & finally get a deal. You must analyze their reply & give out only a tag as a response, Three case can happen: [1] if their reply is a query & they want to ask something, use tag <follow-up-reply> [2] If they deny the deal, return tag <follow-up-cancel>. [3] If they share their contact info (Their phone number) use tag <init-call> with their correct phone number next to it with contry code (Mostly india).
             Your reponse must contain only 1 tag. The mail will be provided in the content. If none of the cases are met or error occurs, return only an <error> tag with enclosing the error info in it."""
             mail = f"""Subject : {subject}
@@ -275,85 +476,168 @@ Their audience's age range - {influencer_age_range}
             print(f"LLM Response: {resp}")
 
             if resp : 
-                tag, num = self.emailEngine._process_ifc(resp)
-                print(tag, num)
-                print("\n\n\n CHECK OUT THE TAGS ABOVE.")
-                if tag == '<init-call>' and num:
-                    vapi_client = VapiClient()
-                    try:
-                        updated_assistant_info = vapi_client.update_assistant_prompt(self.globals.get('campaign_info'), self.globals.get('influencer_info'))
-                        print("\n--- Assistant Update Complete ---")
-                    except Exception as e:
-                        print("Exiting due to assistant update failure.")
-                        exit()
+                tag, num = _process_ifc(resp)
+                return self._act_on_reply(sender_email, tag, num, original_sent_info)
 
-                    try:
-                        CALLING_NUMBER = os.getenv("CALLING_NUMBER")
+        except Exception as e:
+            print(f"Reply processing failed: {e}")
+            raise
+        finally:
+            print(self.report_reply_stats())
+
+    def _act_on_reply(self, sender_email, tag, num, original_sent_info):
+        """Act on a classified reply: <init-call> sets up the voice agent & calls."""
+        print(tag, num)
+        if tag != '<init-call>' or not num:
+            return False
+        # Brief & creator of the email that was replied to.
+        context = (original_sent_info or {}).get('context')
+        if not context:
+            print(f"No campaign context for the reply from {sender_email}, not calling.")
+            return False
+        reply_key = self._reply_key(sender_email, original_sent_info)
+        if reply_key in self._called:
+            print(f"Call for the reply from {sender_email} already placed, not calling again.")
+            return True
+        vapi_client = VapiClient()
+        try:
+            updated_assistant_info = vapi_client.update_assistant_prompt(context.get('campaign_info'), context.get('influencer_info'))
+            print("\n--- Assistant Update Complete ---")
+        except Exception as e:
+            print("Assistant update failed.")
+            raise
 
-                        call_details = vapi_client.initiate_call(CALLING_NUMBER, '')
-                        print("\n--- Call Initiation Complete ---")
+        # Recorded before dialling: Vapi may have accepted a call even when initiate_call raises afterwards.
+        with self._stats_lock:
+            if reply_key in self._called:
+                print(f"Call for the reply from {sender_email} already placed, not calling again.")
+                return True
+            self._called.add(reply_key)
 
-                        return True
-                    except Exception as e:
-                        print("Exiting due to call initiation failure.")
-                        print(f'{e}')
-                        return False
-                    
-        except Exception as e:
-            print(f"ModelHandler processing failed: {e}")
+        try:
+            CALLING_NUMBER = os.getenv("CALLING_NUMBER")
 
+            call_details = vapi_client.initiate_call(CALLING_NUMBER, '')
+            print("\n--- Call Initiation Complete ---")
 
+            return True
+        except Exception as e:
+            print("Call initiation failed.")
+            print(f'{e}')
+            return False
 
-    def fetch_user_with_caption(self, user_id, caption_text):
-        user_data = self.get_user_info(user_id)
-        user_data['post_caption_text'] = caption_text
-        return user_data
+    def fetch_user_with_caption(self, user_id, caption_text, adapter=None):
+        self._count('profile_fetches')
+        return (adapter or self.adapters['instagram']).fetch_profile(user_id, caption_text)
     
-    def run_userprofile_processor(self, hashtags, max_users_per_hashtag=30, output_file='influencer_dataset.json'):
-        
+    def run_userprofile_processor(self, hashtags, max_users_per_hashtag=30, output_file='influencer_dataset.json', job_id=None, progress_callback=None, adapter=None):
+        """
+        Crawl hashtags for qualified creators.
+
+        Args:
+            adapter: DiscoveryAdapter of the platform to crawl (default: Instagram)
+            job_id: Optional JobStore job to checkpoint into / resume from (posts per hashtag, outcome per user)
+            progress_callback: Optional f(message) called as each hashtag completes
+        """
         from collections import defaultdict
         dataset = defaultdict(list)
         dataset_lock = threading.Lock()
+        adapter = adapter or self.adapters['instagram']
+        engagement = EngagementAnalytics(self.post_stats)
 
         def process_hashtag(hashtag):
             print('Processing Hashtags ')
             print(f"[+] Fetching posts for #{hashtag}")
             try:
-                posts = self._get_posts_by_hashtag(hashtag)
+                posts = self.job_store.load_posts(job_id, hashtag) if job_id else None
+                processed = self.job_store.processed_users(job_id, hashtag) if job_id else {}
+                # Hashtag statistics are only recorded once: captions when the posts are fetched, the yield when the
+                # hashtag first finishes (a resumed job goes over its finished hashtags again from the checkpoint).
+                finished_before = bool(job_id) and self.job_store.hashtag_finished(job_id, hashtag)
+                if posts is None:
+                    posts = adapter.list_posts(hashtag)
+                    if job_id:
+                        self.job_store.save_posts(job_id, hashtag, posts)
+                    self.hashtag_cache.add_captions((post.get('caption') or {}).get('text', '') for post in posts)
+                else:
+                    self._count('resumed_hashtags')
+                self._count('posts_seen', len(posts))
+                engagement.add_posts(posts)
                 user_caption_pairs = []
                 for post in posts:
                     try:
-                        user_id = post['caption']['user']['id']
+                        post_user = post['caption']['user']
                         caption_text = post['caption'].get('text', '')
-                        user_caption_pairs.append((user_id, caption_text))
-                    except KeyError:
+                        user_caption_pairs.append((post_user['id'], post_user, caption_text))
+                    except (KeyError, TypeError):
                         continue
 
                 # Remove duplicate users, keep only one caption per user (first one encountered)
                 unique_pairs = {}
-                for uid, caption in user_caption_pairs:
+                for uid, post_user, caption in user_caption_pairs:
                     if uid not in unique_pairs:
-                        unique_pairs[uid] = caption
-
-                selected_pairs = list(unique_pairs.items())[:max_users_per_hashtag]
+                        unique_pairs[uid] = (post_user, caption)
+
+                # Skip obvious rejects & recently rejected users before spending a profile call on them.
+                selected_pairs = []
+                resumed = []
+                for uid, (post_user, caption) in list(unique_pairs.items())[:max_users_per_hashtag]:
+                    if str(uid) in processed:
+                        # Already fetched before the restart, reuse the checkpointed profile.
+                        self._count('resumed_users')
+                        if processed[str(uid)] is not None:
+                            resumed.append(processed[str(uid)])
+                        continue
+                    if self.contact_registry.contains(uid, cooldown_days=self.contact_cooldown_days):
+                        # Contacted for an earlier campaign, still cooling down.
+                        self._count('already_contacted')
+                        continue
+                    if self.negative_cache.contains(uid, self.min_followers, self.min_media_count):
+                        self._count('negative_cache_hits')
+                        continue
+                    ok, reason = adapter.prequalify(post_user, self.min_followers, self.min_media_count)
+                    if not ok:
+                        self._count('prefiltered')
+                        self.negative_cache.add(uid, reason, self.min_followers, self.min_media_count)
+                        continue
+                    selected_pairs.append((uid, caption))
 
                 with ThreadPoolExecutor(max_workers=5) as user_executor:
                     user_futures = []
                     for uid, caption_text in selected_pairs:
-                        user_futures.append(user_executor.submit(self.fetch_user_with_caption, uid, caption_text))
+                        user_futures.append(user_executor.submit(self.fetch_user_with_caption, uid, caption_text, adapter))
 
+                    fetched = list(resumed)
                     for user_future in as_completed(user_futures):
-                        user_data = user_future.result()
-                        # Basic Filtering.
-                        if self.is_valid_influencer(user_data):
-                            with dataset_lock:
-                                dataset[hashtag].append(user_data)
-                                print(f"[+] Taken {user_data.get('username')} — meets criteria.")
-                        else:
-                            print(f"[x] Skipped {user_data.get('username')} — doesn't meet criteria.")
-
-                        # with dataset_lock:
-                        #     dataset[hashtag].append(user_data)
+                        # One failed profile (timeout, open circuit) shouldn't drop the whole hashtag.
+                        try:
+                            creator = user_future.result()
+                            fetched.append(creator)
+                            if job_id:
+                                self.job_store.record_fetched(job_id, hashtag, creator)
+                        except Exception as e:
+                            self._count('fetch_errors')
+                            print(f"[!] Profile fetch failed for #{hashtag}: {e}")
+
+                # Basic Filtering, one vectorized pass over the hashtag's batch.
+                qualified = self.filter_valid_influencers(fetched, adapter)
+                qualified_ids = {creator.id for creator in qualified}
+                self._count('qualified', len(qualified))
+                if not finished_before:
+                    self.hashtag_cache.record_yield(hashtag, len(fetched), len(qualified))
+                if job_id:
+                    self.job_store.record_users(job_id, hashtag, qualified,
+                                                [creator.id for creator in fetched if creator.id not in qualified_ids])
+                    self.job_store.finish_hashtag(job_id, hashtag)
+                with dataset_lock:
+                    dataset[hashtag].extend(qualified)
+                for creator in fetched:
+                    if creator.id in qualified_ids:
+                        print(f"[+] Taken {creator.username} — meets criteria.")
+                    else:
+                        if creator.id:
+                            self.negative_cache.add(creator.id, 'unqualified', self.min_followers, self.min_media_count)
+                        print(f"[x] Skipped {creator.username} — doesn't meet criteria.")
 
             except Exception as e:
                 print(f"[!] Error processing #{hashtag}: {e}")
@@ -365,17 +649,28 @@ Their audience's age range - {influencer_age_range}
             for future in as_completed(futures):
                 print('prosessing a-d-sd-asd')
                 print(future.result())
+                if job_id and progress_callback:
+                    done, total, users, qualified = self.job_store.progress(job_id)
+                    progress_callback(f"🔎 Progress: {done}/{total} hashtags searched, {users} profiles checked, {qualified} creators qualified.")
 
         all_influencers = []
         for influencers in dataset.values():
             all_influencers.extend(influencers)
 
-        unique_influencers = { influencer['id']: influencer for influencer in all_influencers }
+        unique_influencers = { influencer.id: influencer for influencer in all_influencers }
         final_list = list(unique_influencers.values())
-        results = {'creators':final_list}
-        with open(output_file, 'w') as f:
-            json.dump(dataset, f, indent=4)
+        # Engagement & ROI from the post payloads already fetched above (or stored by an earlier run of a resumed job),
+        # no extra API calls. The dataset holds one instance per hashtag, all of them get the values.
+        engagement.compute(final_list)
+        for influencer in all_influencers:
+            source = unique_influencers[influencer.id]
+            influencer.engagement_rate, influencer.roi_score = source.engagement_rate, source.roi_score
+        _write_json_atomic(output_file, {tag: [creator.to_dict() for creator in creators] for tag, creators in dataset.items()})
         print(f"\n[✓] All data saved to {output_file}")
+        print(self.report_run_stats())
+        print(adapter.metrics())
+        if job_id:
+            self.job_store.finish_job(job_id)
 
         return final_list
 
@@ -0,0 +1,211 @@
+"""
+MatchBoxAIEngine.Discovery.adapters:
+Per-platform discovery adapters (search, list posts, fetch profile, qualify) behind one interface.
+
+Developed and maintained by Aditya Gaur / @xdityagr at Github / adityagaur.home@gmail.com
+© 2025 MatchBox AI. All rights reserved.
+"""
+
+import os
+import re
+import json
+import threading
+from abc import ABC, abstractmethod
+from dotenv import load_dotenv
+
+from MatchBoxEngine.DataDefinitions import Creator, CreatorBatch
+from MatchBoxEngine.Discovery.apiClient import RapidAPIClient
+
+load_dotenv(override=True)
+
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+
+
+def _client(base_url, headers):
+    return RapidAPIClient(base_url, headers,
+                          timeout=(3.05, float(os.getenv("RAPIDAPI_TIMEOUT", 20))),
+                          max_retries=int(os.getenv("RAPIDAPI_MAX_RETRIES", 3)))
+
+
+class DiscoveryAdapter(ABC):
+    """
+    Interface every discovery source implements. Posts returned by `list_posts` use the shape discovery reads:
+    {'id', 'like_count', 'comment_count', 'caption': {'text', 'user': {'id', ...}}}
+    An adapter missing one of the abstract methods fails when it is created, not in the middle of a crawl.
+    """
+    platform = ''
+
+    @abstractmethod
+    def search(self, query):
+        """Discovery seeds (hashtags, keywords ...) for a campaign category."""
+
+    @abstractmethod
+    def list_posts(self, seed):
+        """Recent posts for a seed."""
+
+    @abstractmethod
+    def fetch_profile(self, user_id, caption_text=''):
+        """Full profile of a poster as a Creator."""
+
+    def prequalify(self, post_user, min_followers, min_media_count):
+        """Cheap rejection from post payload fields, (ok, reason). Default: nothing to go on, fetch the profile."""
+        return True, None
+
+    def qualify(self, creators, min_followers, min_media_count):
+        """Vectorized threshold filtering over a batch of fetched creators."""
+        batch = CreatorBatch(creators)
+        return batch.select(batch.qualified_mask(min_followers, min_media_count))
+
+    def metrics(self):
+        return self.api.format_metrics() if getattr(self, 'api', None) else ''
+
+
+class InstagramAdapter(DiscoveryAdapter):
+    platform = 'instagram'
+
+    def __init__(self, base_url=None, api_key=None):
+        self.base_url = base_url or os.getenv("INSTAGRAM_API_BASE_URL", "https://instagram-social-api.p.rapidapi.com/v1/")
+        self.post_headers = {
+            "x-rapidapi-key": api_key or os.getenv("RAPID_API_KEY"),
+            "x-rapidapi-host": "instagram-social-api.p.rapidapi.com"
+        }
+        self.api = _client(self.base_url, self.post_headers)
+
+    def search(self, query=''):
+        querystring = {"search_query":query}
+        data = self.api.get('search_hashtags', querystring)
+        root = data['data']['items']
+        return [hashtag_info['name'] for hashtag_info in root]
+
+    def list_posts(self, hashtag):
+        params = {'hashtag': hashtag}
+        resp = self.api.get('hashtag', params)
+        with open('hashtag_search.json', 'w') as f: json.dump(resp, f, indent=4)
+        return resp['data']['items']
+
+    def get_user_info(self, username_or_userid):
+        params = {"username_or_id_or_url":username_or_userid}
+        resp = self.api.get('info', params)
+        with open('user_info.json', 'w') as f: json.dump(resp, f, indent=4)
+        return resp['data']
+
+    def fetch_profile(self, user_id, caption_text=''):
+        # Only the slim record is kept, the raw profile payload is dropped right here.
+        return Creator.from_payload(self.get_user_info(user_id), caption_text)
+
+    def prequalify(self, post_user, min_followers, min_media_count):
+        # Business / creator accounts cannot be private on Instagram.
+        if post_user.get("is_private"):
+            return False, "private"
+        if post_user.get("is_business") is False:
+            return False, "not_business"
+        if post_user.get("follower_count") is not None and post_user["follower_count"] < min_followers:
+            return False, "followers"
+        if post_user.get("media_count") is not None and post_user["media_count"] < min_media_count:
+            return False, "media_count"
+        return True, None
+
+
+class YouTubeAdapter(DiscoveryAdapter):
+    """YouTube Data API v3: seeds are search keywords, posts are videos, profiles are channels."""
+    platform = 'youtube'
+
+    def __init__(self, base_url=None, api_key=None, max_results=50):
+        self.base_url = base_url or os.getenv("YOUTUBE_API_BASE_URL", "https://www.googleapis.com/youtube/v3/")
+        self._api_key = api_key or os.getenv("YOUTUBE_API_KEY")
+        self.max_results = max_results
+        self.api = _client(self.base_url, {})
+
+    def search(self, query=''):
+        # The category itself is the search keyword, YouTube has no hashtag directory to expand from.
+        return [query] if query else []
+
+    def list_posts(self, keyword):
+        found = self.api.get('search', {'part': 'snippet', 'type': 'video', 'q': keyword,
+                                        'maxResults': self.max_results, 'key': self._api_key})
+        items = found.get('items', [])
+        video_ids = [item['id']['videoId'] for item in items if item.get('id', {}).get('videoId')]
+        stats = {}
+        if video_ids:
+            details = self.api.get('videos', {'part': 'statistics', 'id': ','.join(video_ids), 'key': self._api_key})
+            stats = {video['id']: video.get('statistics', {}) for video in details.get('items', [])}
+
+        posts = []
+        for item in items:
+            video_id = item.get('id', {}).get('videoId')
+            snippet = item.get('snippet', {})
+            if not video_id or not snippet.get('channelId'):
+                continue
+            video_stats = stats.get(video_id, {})
+            posts.append({
+                'id': video_id,
+                'like_count': int(video_stats.get('likeCount', 0)),
+                'comment_count': int(video_stats.get('commentCount', 0)),
+                'caption': {
+                    'text': f"{snippet.get('title', '')}\n{snippet.get('description', '')}",
+                    'user': {'id': snippet['channelId'], 'username': snippet.get('channelTitle')},
+                },
+            })
+        return posts
+
+    def fetch_profile(self, channel_id, caption_text=''):
+        resp = self.api.get('channels', {'part': 'snippet,statistics', 'id': channel_id, 'key': self._api_key})
+        channel = (resp.get('items') or [{}])[0]
+        snippet, statistics = channel.get('snippet', {}), channel.get('statistics', {})
+        description = snippet.get('description', '')
+        email = EMAIL_RE.search(description)
+        return Creator(
+            id=channel.get('id') or channel_id,
+            username=snippet.get('customUrl', '').lstrip('@') or snippet.get('title', ''),
+            full_name=snippet.get('title', ''),
+            public_email=email.group(0) if email else None,
+            category='YouTube',
+            media_count=int(statistics.get('videoCount', 0)),
+            follower_count=0 if statistics.get('hiddenSubscriberCount') else int(statistics.get('subscriberCount', 0)),
+            biography=description,
+            profile_pic_url_hd=(snippet.get('thumbnails', {}).get('high') or {}).get('url'),
+            # Channels have no personal / business split, a public contact email is the signal that matters.
+            is_business=True,
+            post_caption_text=caption_text,
+            platform=self.platform,
+        )
+
+
+ADAPTERS = {'instagram': InstagramAdapter, 'youtube': YouTubeAdapter}
+
+
+def platform_key(name):
+    """'Instagram Reels' -> 'instagram', 'YT shorts' -> 'youtube', unknown platforms -> None."""
+    name = (name or '').lower()
+    if 'insta' in name or name == 'ig':
+        return 'instagram'
+    if 'youtube' in name or name.startswith('yt'):
+        return 'youtube'
+    return None
+
+
+_shared_adapters = None
+_shared_lock = threading.Lock()
+
+
+def shared_adapters():
+    """
+    The process-wide {platform: DiscoveryAdapter}: Instagram, plus YouTube when YOUTUBE_API_KEY is set. Built once, so
+    every campaign's Engine shares one pooled session, circuit breaker & Retry-After state per API (one RapidAPI quota).
+    """
+    global _shared_adapters
+    with _shared_lock:
+        if _shared_adapters is None:
+            _shared_adapters = {'instagram': InstagramAdapter()}
+            if os.getenv("YOUTUBE_API_KEY"):
+                _shared_adapters['youtube'] = YouTubeAdapter()
+        return dict(_shared_adapters)
+
+
+def close_shared_adapters():
+    """Close the shared adapters' HTTP sessions (app shutdown)."""
+    global _shared_adapters
+    with _shared_lock:
+        adapters, _shared_adapters = _shared_adapters or {}, None
+    for adapter in adapters.values():
+        adapter.api.close()
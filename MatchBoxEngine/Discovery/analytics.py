@@ -0,0 +1,99 @@
+"""
+MatchBoxAIEngine.Discovery.analytics:
+Engagement-rate & ROI estimation for crawled creators from the hashtag post payloads we already downloaded (kept in
+a PostStats store, so creators loaded later from a dataset file or the creator index get them too).
+
+Developed and maintained by Aditya Gaur / @xdityagr at Github / adityagaur.home@gmail.com
+© 2025 MatchBox AI. All rights reserved.
+"""
+
+import threading
+import numpy as np
+
+from MatchBoxEngine.DataDefinitions import CreatorBatch
+
+
+def _post_user_id(post):
+    user = post.get('user') or (post.get('caption') or {}).get('user') or {}
+    return user.get('id')
+
+
+def _post_id(post):
+    return post.get('id') or post.get('pk') or post.get('code')
+
+
+def roi_scores(engagement_rate, followers):
+    """
+    Simple 0-10 ROI estimate: 70% engagement (saturating at 6%), 30% reach (log10 followers, saturating at 1M).
+    """
+    engagement_part = np.clip(engagement_rate / 6.0, 0.0, 1.0)
+    reach_part = np.clip(np.log10(np.maximum(followers, 1)) / 6.0, 0.0, 1.0)
+    return np.round(10.0 * (0.7 * engagement_part + 0.3 * reach_part), 1)
+
+
+class EngagementAnalytics:
+    def __init__(self, store=None):
+        """
+        Args:
+            store: Optional PostStats, collected posts are saved to it & posts of creators not seen in this session
+                   are read back from it on compute()
+        """
+        self.store = store
+        self._lock = threading.Lock()
+        self._seen_posts = set()
+        self._user_ids = []
+        self._likes = []
+        self._comments = []
+
+    def add_posts(self, posts):
+        """Collect like / comment counts from a hashtag feed, each post is counted once across hashtags."""
+        rows = [(_post_id(post), _post_user_id(post), post.get('like_count') or 0, post.get('comment_count') or 0)
+                for post in posts]
+        self._collect(rows)
+        if self.store:
+            self.store.add([row for row in rows if row[0] is not None and row[1] is not None])
+
+    def _collect(self, rows):
+        with self._lock:
+            for pid, uid, likes, comments in rows:
+                if uid is None or (pid is not None and str(pid) in self._seen_posts):
+                    continue
+                if pid is not None:
+                    self._seen_posts.add(str(pid))
+                self._user_ids.append(str(uid))
+                self._likes.append(likes or 0)
+                self._comments.append(comments or 0)
+
+    def compute(self, creators):
+        """
+        Average (likes + comments) per collected post over follower count, in one vectorized pass.
+        Results are cached on each creator as `engagement_rate` (percent) & `roi_score`; creators
+        without any collected post keep None.
+        """
+        if not creators:
+            return creators
+        if self.store:
+            with self._lock:
+                known = set(self._user_ids)
+            self._collect(self.store.for_users({c.id for c in creators if c.id and str(c.id) not in known}))
+        index = {creator.id: i for i, creator in enumerate(creators)}
+        with self._lock:
+            rows = np.fromiter((index.get(uid, -1) for uid in self._user_ids), dtype=np.int64, count=len(self._user_ids))
+            interactions = np.asarray(self._likes, dtype=np.float64) + np.asarray(self._comments, dtype=np.float64)
+
+        keep = rows >= 0
+        n = len(creators)
+        post_counts = np.bincount(rows[keep], minlength=n)
+        totals = np.bincount(rows[keep], weights=interactions[keep], minlength=n)
+        followers = CreatorBatch(creators).follower_count.astype(np.float64)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            engagement = np.where((post_counts > 0) & (followers > 0),
+                                  totals / np.maximum(post_counts, 1) / followers * 100.0, np.nan)
+        roi = roi_scores(np.nan_to_num(engagement), followers)
+
+        for i, creator in enumerate(creators):
+            if not np.isnan(engagement[i]):
+                creator.engagement_rate = round(float(engagement[i]), 2)
+                creator.roi_score = float(roi[i])
+        return creators
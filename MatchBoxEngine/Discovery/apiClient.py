@@ -0,0 +1,220 @@
+"""
+MatchBoxAIEngine.Discovery.apiClient:
+Pooled HTTP client for the RapidAPI endpoints with timeouts, bounded retries, a per-endpoint circuit breaker & latency metrics.
+
+Developed and maintained by Aditya Gaur / @xdityagr at Github / adityagaur.home@gmail.com
+© 2025 MatchBox AI. All rights reserved.
+"""
+
+import time
+import random
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+# Latency histogram bucket upper bounds, in milliseconds.
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, float('inf'))
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """Raised when an endpoint's circuit breaker is open and the request is not attempted."""
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        """
+        Args:
+            failure_threshold: Consecutive failed requests before the circuit opens
+            reset_timeout: Seconds to stay open before letting a single trial request through
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return 'half-open'
+        return 'open'
+
+    def allow(self):
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return True
+            if state == 'half-open' and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+class EndpointMetrics:
+    def __init__(self):
+        self.requests = 0
+        self.retries = 0
+        self.errors = {}
+        self.buckets = [0] * len(LATENCY_BUCKETS_MS)
+        self.total_ms = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, latency_ms):
+        with self._lock:
+            self.requests += 1
+            self.total_ms += latency_ms
+            for i, bound in enumerate(LATENCY_BUCKETS_MS):
+                if latency_ms <= bound:
+                    self.buckets[i] += 1
+                    break
+
+    def error(self, kind):
+        with self._lock:
+            self.errors[kind] = self.errors.get(kind, 0) + 1
+
+    def retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'retries': self.retries,
+                'errors': dict(self.errors),
+                'avg_ms': (self.total_ms / self.requests) if self.requests else 0.0,
+                'histogram_ms': {('+inf' if b == float('inf') else f'<={b}'): n
+                                 for b, n in zip(LATENCY_BUCKETS_MS, self.buckets)},
+            }
+
+
+class RapidAPIClient:
+    def __init__(self, base_url, headers, timeout=(3.05, 20), max_retries=3, backoff=0.5, pool_size=20,
+                 failure_threshold=5, reset_timeout=30, max_retry_after=30):
+        """
+        Args:
+            base_url: API root, endpoints are appended to it
+            headers: Headers sent with every request (RapidAPI key / host)
+            timeout: (connect, read) timeout in seconds per attempt
+            max_retries: Extra attempts on connection errors, timeouts, 429 and 5xx
+            backoff: Base delay in seconds, doubled per attempt (with jitter)
+            pool_size: Max pooled connections kept per host
+            failure_threshold / reset_timeout: Circuit breaker settings, see CircuitBreaker
+            max_retry_after: Longest Retry-After (seconds) honoured before a retry, so a large value can't park a worker
+        """
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_retry_after = max_retry_after
+
+        self.session = requests.Session()
+        self.session.headers.update(headers)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self._breakers = {}
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _endpoint_state(self, endpoint):
+        with self._lock:
+            if endpoint not in self._breakers:
+                self._breakers[endpoint] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+                self._metrics[endpoint] = EndpointMetrics()
+            return self._breakers[endpoint], self._metrics[endpoint]
+
+    def _sleep_before_retry(self, attempt, response=None):
+        delay = self.backoff * (2 ** attempt) * (0.5 + random.random())
+        if response is not None and response.headers.get('Retry-After', '').isdigit():
+            delay = max(delay, min(int(response.headers['Retry-After']), self.max_retry_after))
+        time.sleep(delay)
+
+    def get(self, endpoint, params=None):
+        """GET `base_url + endpoint` and return the decoded JSON body."""
+        breaker, metrics = self._endpoint_state(endpoint)
+        if not breaker.allow():
+            metrics.error('circuit_open')
+            raise CircuitOpenError(f"Circuit open for '{endpoint}', skipping request.")
+
+        url = self.base_url + endpoint
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                metrics.retry()
+            t0 = time.perf_counter()
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+            except requests.exceptions.Timeout as e:
+                metrics.observe((time.perf_counter() - t0) * 1000)
+                metrics.error('timeout')
+                last_error = e
+                response = None
+            except requests.exceptions.ConnectionError as e:
+                metrics.observe((time.perf_counter() - t0) * 1000)
+                metrics.error('connection')
+                last_error = e
+                response = None
+            except requests.exceptions.RequestException as e:
+                # e.g. ChunkedEncodingError, still the endpoint's failure (& a half-open trial must be settled)
+                metrics.observe((time.perf_counter() - t0) * 1000)
+                metrics.error('request')
+                last_error = e
+                response = None
+            else:
+                metrics.observe((time.perf_counter() - t0) * 1000)
+                if response.status_code in RETRYABLE_STATUS:
+                    metrics.error(f'http_{response.status_code}')
+                    last_error = requests.exceptions.HTTPError(f"{response.status_code} for {url}", response=response)
+                elif response.status_code >= 400:
+                    # Client errors are not the endpoint's fault, don't retry or trip the breaker.
+                    metrics.error(f'http_{response.status_code}')
+                    breaker.record_success()
+                    response.raise_for_status()
+                else:
+                    breaker.record_success()
+                    return response.json()
+
+            if attempt < self.max_retries:
+                self._sleep_before_retry(attempt, response)
+
+        breaker.record_failure()
+        raise last_error
+
+    def metrics(self):
+        """Per-endpoint request counts, retries, error counts and latency histogram."""
+        with self._lock:
+            items = list(self._metrics.items())
+            states = {endpoint: breaker.state for endpoint, breaker in self._breakers.items()}
+        return {endpoint: {**m.snapshot(), 'circuit': states[endpoint]} for endpoint, m in items}
+
+    def format_metrics(self):
+        lines = []
+        for endpoint, m in self.metrics().items():
+            lines.append(f"[api] {endpoint}: requests={m['requests']} retries={m['retries']} avg={m['avg_ms']:.0f}ms "
+                         f"errors={m['errors']} circuit={m['circuit']} histogram={m['histogram_ms']}")
+        return "\n".join(lines)
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,113 @@
+"""
+MatchBoxAIEngine.Discovery.scoring:
+Local TF-IDF relevance scoring of creators against a campaign, used to shortlist before the LLM rerank.
+
+Developed and maintained by Aditya Gaur / @xdityagr at Github / adityagaur.home@gmail.com
+© 2025 MatchBox AI. All rights reserved.
+"""
+
+import re
+import zlib
+import numpy as np
+
+TOKEN_RE = re.compile(r"[a-z0-9ऀ-ॿ]+")
+
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'i', 'in', 'is', 'it', 'its',
+    'me', 'my', 'of', 'on', 'or', 'our', 'so', 'that', 'the', 'this', 'to', 'us', 'we', 'with', 'you', 'your',
+    'dm', 'link', 'bio', 'follow', 'com', 'www', 'http', 'https',
+}
+
+# Relative weight of each creator field in the document vector.
+FIELD_WEIGHTS = {'category': 2.0, 'biography': 1.0, 'post_caption_text': 0.5}
+
+
+def tokenize(text):
+    tokens = []
+    for tok in TOKEN_RE.findall((text or '').lower()):
+        if tok in STOPWORDS or len(tok) < 2:
+            continue
+        if len(tok) > 3 and tok.endswith('s') and not tok.endswith('ss'):
+            tok = tok[:-1]
+        tokens.append(tok)
+    return tokens
+
+
+def campaign_query_text(campaign_info):
+    """Flatten the campaign's category, products and creator niche(s) into a single query string."""
+    parts = [campaign_info.get('category') or '']
+    parts.extend(campaign_info.get('products_services') or [])
+    for req in campaign_info.get('creator_requirements') or []:
+        parts.append((req.get('niche') or '') if isinstance(req, dict) else str(req))
+    parts.append(campaign_info.get('genre') or '')
+    return ' '.join(str(p) for p in parts if p)
+
+
+class RelevanceScorer:
+    def __init__(self, n_features=2 ** 18, field_weights=None):
+        """
+        Hashed TF-IDF scorer, the document-term matrix is kept in COO form (doc index, term index, weight)
+        so scoring a whole batch is a couple of NumPy gathers and a bincount.
+
+        Args:
+            n_features: Size of the hashed feature space
+            field_weights: Per-field term weights (default: FIELD_WEIGHTS)
+        """
+        self.n_features = n_features
+        self.field_weights = field_weights or FIELD_WEIGHTS
+
+    def _hash(self, token):
+        return zlib.crc32(token.encode('utf-8')) % self.n_features
+
+    def _vectorize(self, creators):
+        rows, cols, vals = [], [], []
+        for i, creator in enumerate(creators):
+            terms = {}
+            for fname, weight in self.field_weights.items():
+                value = getattr(creator, fname, None)
+                for tok in tokenize(value):
+                    h = self._hash(tok)
+                    terms[h] = terms.get(h, 0.0) + weight
+            rows.extend([i] * len(terms))
+            cols.extend(terms.keys())
+            vals.extend(terms.values())
+        return (np.asarray(rows, dtype=np.int64),
+                np.asarray(cols, dtype=np.int64),
+                np.asarray(vals, dtype=np.float64))
+
+    def score(self, creators, campaign_info):
+        """Cosine similarity of every creator to the campaign query, shape (len(creators),)."""
+        n_docs = len(creators)
+        if n_docs == 0:
+            return np.zeros(0)
+
+        rows, cols, tf = self._vectorize(creators)
+        if tf.size == 0:
+            return np.zeros(n_docs)
+
+        # Smoothed IDF from document frequencies (each (row, col) pair is unique).
+        df = np.bincount(cols, minlength=self.n_features)
+        idf = np.log((1 + n_docs) / (1 + df)) + 1.0
+        weights = np.log1p(tf) * idf[cols]
+        doc_norms = np.sqrt(np.bincount(rows, weights=weights ** 2, minlength=n_docs))
+
+        query = np.zeros(self.n_features)
+        for tok in tokenize(campaign_query_text(campaign_info)):
+            query[self._hash(tok)] += 1.0
+        query = np.log1p(query) * idf
+        q_norm = np.linalg.norm(query)
+        if q_norm == 0:
+            return np.zeros(n_docs)
+
+        dots = np.bincount(rows, weights=weights * query[cols], minlength=n_docs)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scores = np.where(doc_norms > 0, dots / (doc_norms * q_norm), 0.0)
+        return scores
+
+    def top_k(self, creators, campaign_info, k):
+        """Indices of the `k` best scoring creators, best first."""
+        scores = self.score(creators, campaign_info)
+        if k >= len(scores):
+            return [int(i) for i in np.argsort(-scores, kind='stable')]
+        top = np.argpartition(-scores, k)[:k]
+        return [int(i) for i in top[np.argsort(-scores[top], kind='stable')]]
@@ -71,6 +71,25 @@ class ModelHandler:
 
         return response
 
+    def batch_chat(self, requests, max_concurrency=8):
+        """
+        Run many (system_ctx, user_input) prompts concurrently.
+        Returns responses in the same order, a failed prompt yields its exception instead of a string.
+        """
+        prompt = ChatPromptTemplate.from_messages(
+            [
+                ("system", "{system_ctx}"),
+                ("user", "{user_input}")
+            ]
+        )
+        chain = prompt | self.llm | StrOutputParser()
+
+        return chain.batch(
+            [{"system_ctx": system_ctx, "user_input": user_input} for system_ctx, user_input in requests],
+            config={"max_concurrency": max_concurrency},
+            return_exceptions=True
+        )
+
     def create_chain(self, system_ctx, user_input):
         prompt = ChatPromptTemplate.from_messages(
         [
@@ -0,0 +1,211 @@
+"""
+MatchBoxAIEngine.Outreach.asyncEmailEngine:
+Email follow-up system running as tasks in the app's event loop (sends, reply monitor & follow-up scheduler), with a
+bounded send queue for backpressure. Blocking SMTP / IMAP work runs on the system's own thread pool, sized for the
+monitor, the follow-up scheduler & one thread per send worker, so callers blocked on a send elsewhere (e.g. in the
+loop's default executor) can never starve it.
+
+Developed and maintained by Aditya Gaur / @xdityagr at Github / adityagaur.home@gmail.com
+© 2025 MatchBox AI. All rights reserved.
+"""
+
+import time
+import heapq
+import asyncio
+import logging
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from MatchBoxEngine.Outreach import emailEngine
+from MatchBoxEngine.Outreach.emailEngine import EmailFollowUpSystem
+from MatchBoxEngine.Outreach.mailboxWatcher import MailboxWatcher
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncEmailFollowUpSystem(EmailFollowUpSystem):
+    def __init__(self, *args, send_queue_size=100, **kwargs):
+        """
+        Same arguments as EmailFollowUpSystem, plus:
+            send_queue_size: Max emails waiting to be sent, senders wait (asend_*) once it is full
+        """
+        super().__init__(*args, **kwargs)
+        self.send_queue_size = send_queue_size
+        self.loop = None
+        self._send_queue = None
+        self._schedule_changed = None
+        self._executor = None
+        self._tasks = []
+
+    async def start(self):
+        """Start the monitor, follow-up scheduler & send workers as tasks in the running loop"""
+        if self.running:
+            logger.info("Email monitoring system is already running.")
+            return
+        self.loop = asyncio.get_running_loop()
+        self._send_queue = asyncio.Queue(maxsize=self.send_queue_size)
+        self._schedule_changed = asyncio.Event()
+        # Monitor (parked in watcher.wait) + follow-ups + one per send worker
+        self._executor = ThreadPoolExecutor(max_workers=self.smtp_pool.size + 2, thread_name_prefix="EmailIO")
+        self.running = True
+        self.watcher = MailboxWatcher(self._imap_connect, poll_interval=self.check_interval)
+        self.watcher.start()
+        self.callback_dispatcher.start()
+        self._tasks = [asyncio.create_task(self._monitor(), name="EmailMonitor"),
+                       asyncio.create_task(self._followups(), name="EmailFollowUps")]
+        self._tasks += [asyncio.create_task(self._send_worker(), name=f"EmailSender-{i}")
+                        for i in range(self.smtp_pool.size)]
+        logger.info("Email monitoring system started (event loop)")
+
+    async def stop(self, timeout=10):
+        """Stop accepting work, let queued sends finish (up to `timeout` seconds) & close the connections"""
+        if not self.running:
+            logger.info("Email monitoring system is not running.")
+            return
+        logger.info("Stopping email monitoring system...")
+        self.running = False
+        self.watcher.stop()
+        self._schedule_changed.set()
+        for _ in range(self.smtp_pool.size):
+            await self._send_queue.put(None)
+        done, pending = await asyncio.wait(self._tasks, timeout=timeout)
+        for task in pending:
+            logger.warning(f"{task.get_name()} did not finish in time, cancelling it.")
+            task.cancel()
+        await self._io(self.smtp_pool.close)
+        logger.info(self.smtp_pool.format_stats())
+        await self._io(self.callback_dispatcher.stop)
+        logger.info(self.callback_dispatcher.format_stats())
+        self._executor.shutdown(wait=False)
+        logger.info("Email monitoring system stopped.")
+
+    def send_queue_depth(self):
+        return self._send_queue.qsize() if self._send_queue else 0
+
+    def _queued_sends(self):
+        return self.send_queue_depth()
+
+    async def _io(self, fn, *args):
+        """Run blocking SMTP / IMAP work on the system's thread pool"""
+        return await self.loop.run_in_executor(self._executor, functools.partial(fn, *args))
+
+    async def _monitor(self):
+        while self.running:
+            new_mail = await self._io(self.watcher.wait)
+            if self.running and new_mail:
+                await self._io(self._check_replies)
+
+    def _schedule_due(self, email_key, due_at):
+        super()._schedule_due(email_key, due_at)
+        if self.running and self.loop is not None:
+            self.loop.call_soon_threadsafe(self._schedule_changed.set)
+
+    async def _followups(self):
+        """Sleep until the earliest follow-up deadline (or until an earlier one is scheduled), then handle it"""
+        while self.running:
+            self._schedule_changed.clear()
+            now = time.time()
+            with self._schedule:
+                due = self._due_heap[0] if self._due_heap else None
+                if due is not None and due[0] <= now:
+                    heapq.heappop(self._due_heap)
+            if due is not None and due[0] <= now:
+                await self._io(self._process_due, *due)
+                continue
+            try:
+                await asyncio.wait_for(self._schedule_changed.wait(), None if due is None else due[0] - now)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _send_worker(self):
+        while True:
+            job = await self._send_queue.get()
+            if job is None:
+                return
+            item, timeout_hours, future = job
+            try:
+                success = await self._io(EmailFollowUpSystem.send_with_followup, self, item['to_email'],
+                                         item['subject'], item['message'], timeout_hours, item.get('context'),
+                                         item.get('route'))
+                if not future.done():
+                    future.set_result(success)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+
+    async def asend_with_followup(self, to_email, subject, message, timeout_hours=24, context=None, route=None):
+        """Queue an email (waits while the send queue is full) & track it for follow-up once sent"""
+        if not self.running:
+            raise RuntimeError("Email system not running.")
+        future = self.loop.create_future()
+        await self._send_queue.put(({'to_email': to_email, 'subject': subject, 'message': message, 'context': context,
+                                     'route': route}, timeout_hours, future))
+        return await future
+
+    async def asend_batch_with_followup(self, emails, timeout_hours=24):
+        """Send several emails over the send workers (one per pooled SMTP connection), list of bools in order"""
+        t0 = time.perf_counter()
+        results = await asyncio.gather(*(self.asend_with_followup(item['to_email'], item['subject'], item['message'],
+                                                                  timeout_hours, item.get('context'), item.get('route'))
+                                         for item in emails))
+        elapsed = time.perf_counter() - t0
+        logger.info(f"Batch: {sum(results)} of {len(emails)} emails sent in {elapsed:.2f}s "
+                    f"({sum(results) / elapsed if elapsed else 0:.1f}/s) | {self.smtp_pool.format_stats()}")
+        logger.info(self.governor.format_status(self._queued_sends()))
+        return list(results)
+
+    def _run_blocking(self, coro):
+        """Run a coroutine on the system's loop from another thread & wait for its result"""
+        if self.loop is None:
+            coro.close()
+            raise RuntimeError("Email system not started.")
+        try:
+            in_loop = asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            in_loop = False
+        if in_loop:
+            coro.close()
+            raise RuntimeError("Blocking email call made from the event loop, await the asend_* methods instead.")
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    # Thread-compatible interface, for code running in worker threads (Engine, OutreachPipeline)
+
+    def send_with_followup(self, to_email, subject, message, timeout_hours=24, context=None, route=None):
+        return self._run_blocking(self.asend_with_followup(to_email, subject, message, timeout_hours, context, route))
+
+    def send_batch_with_followup(self, emails, timeout_hours=24):
+        return self._run_blocking(self.asend_batch_with_followup(emails, timeout_hours))
+
+    def start_monitoring(self):
+        raise RuntimeError("AsyncEmailFollowUpSystem runs in an event loop, await start() instead.")
+
+    def stop_monitoring(self):
+        self._run_blocking(self.stop())
+
+
+async def start_email_engine(reply_callback=None):
+    """
+    Start the email system in the running loop & make it the one the emailEngine module functions use.
+    `reply_callback` is the default reply handler (see emailEngine.start_email_engine).
+    """
+    if emailEngine.email_system:
+        logger.info("Email engine already running.")
+        return emailEngine.email_system
+    config = emailEngine.email_config()
+    if config is None:
+        logger.error("EMAIL_ADDRESS / EMAIL_PASSWORD not set, email engine not started.")
+        return None
+    system = AsyncEmailFollowUpSystem(**config)
+    if reply_callback:
+        system.register_reply_callback(reply_callback)
+    await system.start()
+    emailEngine.email_system = system
+    logger.info("✅ Email follow-up system monitoring started.")
+    return system
+
+
+async def stop_email_engine():
+    system = emailEngine.email_system
+    if isinstance(system, AsyncEmailFollowUpSystem):
+        await system.stop()
+        emailEngine.email_system = None
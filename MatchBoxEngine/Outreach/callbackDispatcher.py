@@ -0,0 +1,120 @@
+"""
+MatchBoxAIEngine.Outreach.callbackDispatcher:
+Runs reply callbacks (LLM, Vapi calls) off the mail monitor on a bounded worker pool, with a per-call timeout & retry
+with backoff on failure, so one slow reply never delays reply detection or follow-ups for the others.
+
+Developed and maintained by Aditya Gaur / @xdityagr at Github / adityagaur.home@gmail.com
+© 2025 MatchBox AI. All rights reserved.
+"""
+
+import time
+import queue
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+logger = logging.getLogger(__name__)
+
+
+class CallbackDispatcher:
+    def __init__(self, workers=4, queue_size=1000, timeout=180, retries=2, retry_backoff=5):
+        """
+        Args:
+            workers: Callbacks run concurrently
+            queue_size: Max callbacks waiting, further ones are dropped (logged & counted) rather than blocking the caller
+            timeout: Seconds a callback may run before it is given up on (it keeps running, it is not retried)
+            retries: Extra attempts for a callback that raised
+            retry_backoff: Seconds before the first retry, doubled for each next one
+        """
+        self.workers = workers
+        self.timeout = timeout
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._runner = None
+        self._threads = []
+        self._stats_lock = threading.Lock()
+        self._stats = {'submitted': 0, 'succeeded': 0, 'failed': 0, 'retries': 0, 'timeouts': 0, 'dropped': 0}
+
+    def _count(self, key):
+        with self._stats_lock:
+            self._stats[key] += 1
+
+    def start(self):
+        if self._threads:
+            return
+        # Timed out callbacks keep their runner thread, leave headroom so they don't starve the next ones
+        self._runner = ThreadPoolExecutor(max_workers=self.workers * 2, thread_name_prefix="ReplyCallback")
+        self._threads = [threading.Thread(target=self._work, name=f"ReplyDispatch-{i}", daemon=True)
+                         for i in range(self.workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, func, *args, name=''):
+        """Queue func(*args) without waiting, False if the queue is full & the call was dropped"""
+        try:
+            self._queue.put_nowait((func, args, name))
+        except queue.Full:
+            self._count('dropped')
+            logger.error(f"Reply callback queue full ({self._queue.maxsize}), dropped callback {name}")
+            return False
+        self._count('submitted')
+        return True
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            try:
+                self._run(*job)
+            finally:
+                self._queue.task_done()
+
+    def _run(self, func, args, name):
+        for attempt in range(self.retries + 1):
+            future = self._runner.submit(func, *args)
+            try:
+                future.result(timeout=self.timeout)
+                self._count('succeeded')
+                return
+            except FutureTimeout:
+                # Can't be cancelled & may still complete (e.g. a call being placed), so it is not retried
+                self._count('timeouts')
+                logger.error(f"Reply callback {name} still running after {self.timeout}s, no longer waiting on it")
+                return
+            except (Exception, SystemExit) as e:
+                if attempt == self.retries:
+                    self._count('failed')
+                    logger.error(f"Reply callback {name} failed after {attempt + 1} attempts: {e}")
+                    return
+                delay = self.retry_backoff * 2 ** attempt
+                self._count('retries')
+                logger.warning(f"Reply callback {name} failed ({e}), retrying in {delay}s")
+                time.sleep(delay)
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['queued'] = self.pending()
+        return stats
+
+    def format_stats(self):
+        s = self.stats()
+        return (f"[callbacks] submitted={s['submitted']} succeeded={s['succeeded']} failed={s['failed']} "
+                f"retries={s['retries']} timeouts={s['timeouts']} dropped={s['dropped']} queued={s['queued']}")
+
+    def stop(self, timeout=10):
+        """Let queued callbacks finish (up to `timeout` seconds for the workers to exit)"""
+        if not self._threads:
+            return
+        for _ in self._threads:
+            self._queue.put(None)
+        deadline = time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(timeout=max(0, deadline - time.monotonic()))
+        self._threads = []
+        self._runner.shutdown(wait=False)
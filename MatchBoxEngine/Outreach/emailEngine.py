@@ -5,6 +5,7 @@ Robust Emailing System with lookup feature & call init.
 Developed and maintained by Aditya Gaur / @xdityagr at Github / adityagaur.home@gmail.com
 © 2025 MatchBox AI. All rights reserved.
 """
+import os
 import smtplib
 import imaplib
 import email
@@ -14,18 +15,34 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.header import decode_header
 import threading
+import heapq
 import logging
-from email.utils import make_msgid, parsedate_to_datetime
+from email.utils import make_msgid, parsedate_to_datetime, parseaddr
 import pytz 
 import re 
+from collections import deque
 from MatchBoxEngine.Model import ModelHandler
+from MatchBoxEngine.Outreach.mailboxWatcher import MailboxWatcher
+from MatchBoxEngine.Database.mailboxState import MailboxState
+from MatchBoxEngine.Database.followupStore import FollowupStore
+from MatchBoxEngine.Database.sendQuota import SendQuota
+from MatchBoxEngine.Outreach.replyIndex import ReplyIndex, BY_MESSAGE_ID
+from MatchBoxEngine.Outreach.smtpPool import SMTPPool
+from MatchBoxEngine.Outreach.callbackDispatcher import CallbackDispatcher
+from MatchBoxEngine.Outreach.replyRouter import ReplyRouter
+from MatchBoxEngine.Outreach.sendGovernor import SendGovernor, QuotaExceeded, PRIORITY_FOLLOWUP, PRIORITY_FIRST_TOUCH
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Headers needed to tell whether a message is a reply to one of ours, fetched instead of the whole message
+REPLY_HEADER_FIELDS = 'FROM MESSAGE-ID IN-REPLY-TO REFERENCES DATE SUBJECT'
+
 class EmailFollowUpSystem:
-    def __init__(self, smtp_server, smtp_port, imap_server, imap_port, email_address, password):
+    def __init__(self, smtp_server, smtp_port, imap_server, imap_port, email_address, password, check_interval=30,
+                 smtp_pool_size=3, callback_workers=4, send_rate_per_minute=None, daily_quota=None, imap_ssl=True,
+                 smtp_starttls=True):
         """
         Initialize the email follow-up system
         
@@ -36,6 +53,13 @@ class EmailFollowUpSystem:
             imap_port: IMAP port (e.g., 993 for SSL)
             email_address: Your email address
             password: Your email password or app password
+            check_interval: Seconds between mailbox polls when the IMAP server has no IDLE support
+            smtp_pool_size: Max SMTP connections kept open & reused for sending
+            callback_workers: Reply callbacks run concurrently, off the monitor loop
+            send_rate_per_minute: Max sends per minute (default: EMAIL_SEND_RATE_PER_MINUTE)
+            daily_quota: Max sends per UTC day (default: EMAIL_DAILY_QUOTA)
+            imap_ssl: IMAP over SSL (False for a plain local server, e.g. the benchmarks' IMAPServer)
+            smtp_starttls: Upgrade SMTP with STARTTLS (False for a plain local server)
         """
         self.smtp_server = smtp_server
         self.smtp_port = smtp_port
@@ -43,10 +67,28 @@ class EmailFollowUpSystem:
         self.imap_port = imap_port
         self.email_address = email_address
         self.password = password
+        self.imap_ssl = imap_ssl
+        self.smtp_starttls = smtp_starttls
         self.pending_emails = {}  # Store pending follow-ups
         self.running = False
         self.monitor_thread = None
-        self.reply_callback = None # To store the callback function for replies
+        self.followup_thread = None
+        self.reply_callback = None # Default callback, for replies to emails sent without a route
+        self.reply_router = ReplyRouter() # Per-campaign reply callbacks, by the route an email was sent with
+        self.check_interval = check_interval
+        self.watcher = None # MailboxWatcher, wakes the monitor on new mail
+        self.reply_latencies = deque(maxlen=500) # Seconds from reply sent to callback, recent replies
+        self.mailbox_state = MailboxState() # Persisted UIDVALIDITY / last processed UID
+        self._account = f"{email_address} {imap_server}"
+        self.reply_index = ReplyIndex() # Pending emails by Message-ID / subject / recipient
+        self.smtp_pool = SMTPPool(self._smtp_connect, size=smtp_pool_size)
+        self.governor = SendGovernor(SendQuota(self._account), rate_per_minute=send_rate_per_minute,
+                                     daily_quota=daily_quota) # Rate, daily quota & priority for every send
+        self.callback_dispatcher = CallbackDispatcher(workers=callback_workers)
+        self.followup_store = FollowupStore(self._account) # Pending emails persisted across restarts
+        self._due_heap = [] # (due_at, email_key), next follow-up action first
+        self._schedule = threading.Condition()
+        self._restore_pending()
         
     def register_reply_callback(self, callback_func):
         """
@@ -59,6 +101,20 @@ class EmailFollowUpSystem:
         else:
             logger.error("Provided callback is not callable.")
 
+    def register_reply_route(self, route, callback_func):
+        """
+        Route replies to emails sent with `route` (e.g. a campaign ID) to `callback_func`, same arguments as the
+        default callback. The route is dropped once none of its emails are pending anymore.
+        """
+        if callable(callback_func):
+            self.reply_router.register(route, callback_func)
+            logger.info(f"Reply route registered: {route}")
+        else:
+            logger.error("Provided callback is not callable.")
+
+    def unregister_reply_route(self, route):
+        self.reply_router.unregister(route)
+
     def _extract_email_body(self, email_message):
         """Extracts the plain text body from an email message."""
         body = ""
@@ -87,165 +143,193 @@ class EmailFollowUpSystem:
         body = re.split(r'On .* wrote:|-----Original Message-----|From:.*Sent:.*To:.*Subject:|\[Quoted text hidden\]', body, 1)[0].strip()
         return body
 
-    def send_email(self, to_email, subject, message, is_followup=False, in_reply_to_mid=None):
-        """Send an email"""
-        try:
-            msg = MIMEMultipart()
-            msg['From'] = self.email_address
-            msg['To'] = to_email
-            
-            message_id = make_msgid(domain=self.email_address.split('@')[1]) # Use sender's domain
-            msg['Message-ID'] = message_id
-
-            if is_followup:
-                msg['Subject'] = f"Follow-up: {subject}"
-                follow_up_text = f"\n\n--- Follow-up ---\nThis is a follow-up to my previous email. Please let me know if you received this.\n\n"
-                message = follow_up_text + message
-                if in_reply_to_mid:
-                    msg['In-Reply-To'] = in_reply_to_mid
-                    msg['References'] = in_reply_to_mid 
-            else:
-                msg['Subject'] = subject
-            
-            msg.attach(MIMEText(message, 'plain'))
-            
-            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+    def _smtp_connect(self):
+        """Open an authenticated SMTP connection"""
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+        if self.smtp_starttls:
             server.starttls()
-            server.login(self.email_address, self.password)
-            
-            text = msg.as_string()
-            server.sendmail(self.email_address, to_email, text)
-            server.quit()
-            print('sent')
+        server.login(self.email_address, self.password)
+        return server
+
+    def _build_message(self, to_email, subject, message, is_followup=False, in_reply_to_mid=None):
+        """Build the MIME message, returns (message text, Message-ID)"""
+        msg = MIMEMultipart()
+        msg['From'] = self.email_address
+        msg['To'] = to_email
+        
+        message_id = make_msgid(domain=self.email_address.split('@')[1]) # Use sender's domain
+        msg['Message-ID'] = message_id
+
+        if is_followup:
+            msg['Subject'] = f"Follow-up: {subject}"
+            follow_up_text = f"\n\n--- Follow-up ---\nThis is a follow-up to my previous email. Please let me know if you received this.\n\n"
+            message = follow_up_text + message
+            if in_reply_to_mid:
+                msg['In-Reply-To'] = in_reply_to_mid
+                msg['References'] = in_reply_to_mid 
+        else:
+            msg['Subject'] = subject
+        
+        msg.attach(MIMEText(message, 'plain'))
+        return msg.as_string(), message_id
+
+    def send_email(self, to_email, subject, message, is_followup=False, in_reply_to_mid=None, priority=None):
+        """
+        Send an email over a pooled SMTP connection, once the send governor grants a slot. Follow-ups go ahead of
+        first-touch emails unless `priority` says otherwise.
+        """
+        if priority is None:
+            priority = PRIORITY_FOLLOWUP if is_followup else PRIORITY_FIRST_TOUCH
+        try:
+            text, message_id = self._build_message(to_email, subject, message, is_followup, in_reply_to_mid)
+            self.governor.acquire(priority)
+            self.smtp_pool.send(self.email_address, to_email, text)
             
             logger.info(f"Email sent to {to_email} - Subject: {subject}")
             return True, message_id
-            
+
+        except QuotaExceeded as e:
+            logger.warning(f"Not sending to {to_email}: {e}")
+            return False, None
         except Exception as e:
             logger.error(f"Failed to send email to {to_email}: {str(e)}")
             return False, None
     
-    def check_for_reply(self, to_email, original_subject, sent_time_utc, original_message_id):
+    def _imap_connect(self):
+        """Open an authenticated IMAP connection"""
+        mail = (imaplib.IMAP4_SSL if self.imap_ssl else imaplib.IMAP4)(self.imap_server, self.imap_port)
+        mail.login(self.email_address, self.password)
+        return mail
+
+    def _decode_subject(self, subject_header):
+        try:
+            subject = ''
+            for part, encoding in decode_header(subject_header or ''):
+                if isinstance(part, bytes):
+                    subject += part.decode(encoding or 'utf-8', errors='ignore')
+                else:
+                    subject += str(part)
+            return subject
+        except Exception:
+            return str(subject_header)
+
+    def _is_reply(self, headers, subject, original_subject, original_message_id):
+        """Does a message (its threading headers & decoded subject) answer our email?"""
+        if original_message_id:
+            # In-Reply-To / References can hold several message IDs separated by spaces
+            in_reply_to = headers.get('In-Reply-To', '') or ''
+            references = headers.get('References', '') or ''
+            if original_message_id in in_reply_to.split() or original_message_id in references.split():
+                logger.info(f"🎉 REPLY DETECTED (Message-ID header): {subject}")
+                return True
+
+        # Subject fallback, only when the Message-ID didn't match
+        subject_lower = subject.lower()
+        original_lower = original_subject.lower()
+        clean_subject = subject_lower
+        for prefix in ['re:', 'fwd:', 'fw:']:
+            if clean_subject.startswith(prefix):
+                clean_subject = clean_subject[len(prefix):].strip()
+
+        if ('re:' in subject_lower and original_lower in clean_subject) or \
+           (original_lower in clean_subject and len(clean_subject) >= len(original_lower) * 0.7):
+            logger.info(f"🎉 REPLY DETECTED (Subject fallback): {subject}")
+            return True
+        return False
+
+    @staticmethod
+    def _imap_quote(value):
+        return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+    def _reply_search_criteria(self, to_email, original_subject, sent_time_utc, original_message_id):
+        """
+        Server-side narrowing: from the recipient, since the day we sent, and either threaded on our Message-ID or
+        carrying our subject. Non-ASCII values can't go in a plain SEARCH, those fall back to FROM + SINCE.
         """
-        Check if there's a reply from the recipient.
-        Returns (True, subject, body) if a reply is found, otherwise (False, None, None).
+        since = (sent_time_utc - datetime.timedelta(days=1)).strftime('%d-%b-%Y')
+        criteria = f'SINCE {since} FROM {self._imap_quote(to_email)}'
+        alternatives = [f'SUBJECT {self._imap_quote(original_subject)}']
+        if original_message_id:
+            alternatives += [f'HEADER In-Reply-To {self._imap_quote(original_message_id)}',
+                             f'HEADER References {self._imap_quote(original_message_id)}']
+        if all(value.isascii() for value in (to_email, original_subject, original_message_id or '')):
+            either = alternatives[0]
+            for alternative in alternatives[1:]:
+                either = f'OR {either} {alternative}'
+            criteria = f'{criteria} {either}'
+        return f'({criteria})'
+
+    def check_for_reply(self, to_email, original_subject, sent_time_utc, original_message_id, mail=None):
         """
+        Check if there's a reply from the recipient. Only the threading headers of candidate messages are fetched
+        (without marking them read), the body is pulled only for a confirmed reply.
+
+        Args:
+            mail: Optional authenticated IMAP session with the inbox selected, reused & left open.
+                  Otherwise a session is opened & closed for this check.
+        Returns (True, subject, body, reply_date_utc) if a reply is found, otherwise (False, None, None, None).
+        """
+        own_session = mail is None
         try:
-            mail = imaplib.IMAP4_SSL(self.imap_server, self.imap_port)
-            mail.login(self.email_address, self.password)
-            mail.select('inbox')
-            
-            search_criteria = f'(FROM "{to_email}")'
-            result, data = mail.search(None, search_criteria)
-            
+            if own_session:
+                mail = self._imap_connect()
+                mail.select('inbox', readonly=True)
+
             logger.info(f"Searching for replies from {to_email} after {sent_time_utc} (Original Message-ID: {original_message_id})")
-            
-            if result == 'OK' and data[0]:
-                email_ids = data[0].split()
-                logger.info(f"Found {len(email_ids)} total emails from {to_email}")
-                
-                # Sort emails by date descending to process newest first
-                # This requires fetching headers first, or iterating in reverse from IMAP results
-                # For simplicity, we'll just reverse the IMAP list which is usually oldest first
-                
-                for email_id in reversed(email_ids):
-                    try:
-                        result, msg_data = mail.fetch(email_id, '(RFC822)')
-                        if result == 'OK':
-                            email_message = email.message_from_bytes(msg_data[0][1])
-                            
-                            date_header = email_message.get('Date')
-                            if date_header:
-                                try:
-                                    email_date = parsedate_to_datetime(date_header)
-                                    if email_date.tzinfo is None:
-                                        email_date = pytz.utc.localize(email_date) 
-                                    else:
-                                        email_date = email_date.astimezone(pytz.utc)
-
-                                    logger.debug(f"Parsed email date (UTC): {email_date}") # Changed to debug
-                                    
-                                except Exception as e:
-                                    logger.error(f"Date parsing error for email {email_id}: {e}")
-                                    continue
-                            else:
-                                logger.debug(f"Skipping email {email_id} - No Date header found.") # Changed to debug
-                                continue
-                            
-                            subject_header = email_message.get('Subject', '')
-                            try:
-                                decoded_subject = decode_header(subject_header)
-                                subject = ''
-                                for part, encoding in decoded_subject:
-                                    if isinstance(part, bytes):
-                                        subject += part.decode(encoding or 'utf-8', errors='ignore')
-                                    else:
-                                        subject += str(part)
-                            except:
-                                subject = str(subject_header)
-                            
-                            logger.info(f"Checking email - Date: {email_date}, Subject: {subject}")
-                            
-                            if email_date > sent_time_utc: 
-                                logger.info(f"✅ Found email AFTER sent time from {to_email}: {subject}")
-                                
-                                in_reply_to = email_message.get('In-Reply-To', '')
-                                references = email_message.get('References', '')
-                                
-                                is_reply = False
-                                if original_message_id:
-                                    # Ensure original_message_id is within the full In-Reply-To/References string
-                                    # as these headers can contain multiple message IDs separated by spaces
-                                    if original_message_id in in_reply_to.split() or original_message_id in references.split():
-                                        is_reply = True
-                                        logger.info(f"🎉 REPLY DETECTED (Message-ID header) from {to_email}: {subject}")
-                                    else:
-                                        logger.info(f"Message-ID '{original_message_id}' not found in In-Reply-To or References headers.")
-
-                                if not is_reply: # Only do subject fallback if Message-ID didn't match
-                                    subject_lower = subject.lower()
-                                    original_lower = original_subject.lower()
-                                    
-                                    clean_subject = subject_lower
-                                    for prefix in ['re:', 'fwd:', 'fw:']:
-                                        if clean_subject.startswith(prefix):
-                                            clean_subject = clean_subject[len(prefix):].strip()
-                                    
-                                    if ('re:' in subject_lower and original_lower in clean_subject) or \
-                                       (original_lower in clean_subject and len(clean_subject) >= len(original_lower) * 0.7):
-                                        is_reply = True
-                                        logger.info(f"🎉 REPLY DETECTED (Subject fallback) from {to_email}: {subject}")
-
-                                if is_reply:
-                                    reply_body = self._extract_email_body(email_message)
-                                    mail.close()
-                                    mail.logout()
-                                    return True, subject, reply_body
-                                else:
-                                    logger.info(f"❌ Not a reply to our specific email - no matching Message-ID or strong subject correlation.")
-                            else:
-                                logger.info(f"⏰ Email {email_id} is older than or same as our sent time ({email_date} vs {sent_time_utc}) - skipping for further check.")
-                                # Since emails are reversed, if we hit an old one, subsequent ones will also be old.
-                                # This optimization can break if IMAP server does not guarantee strict time order.
-                                # For safety, iterate all. But with a well-behaved server, this can be uncommented:
-                                # mail.close()
-                                # mail.logout()
-                                # return False, None, None # No more relevant emails to check
-                    except Exception as e:
-                        logger.error(f"Error processing email {email_id}: {str(e)}")
-                        continue
-            else:
+            result, data = mail.search(None, self._reply_search_criteria(to_email, original_subject, sent_time_utc, original_message_id))
+            if result != 'OK' or not data[0]:
                 logger.info(f"No emails found from {to_email} matching search criteria.")
-            
-            mail.close()
-            mail.logout()
-            return False, None, None
-            
+                return False, None, None, None
+
+            email_ids = data[0].split()
+            logger.info(f"Found {len(email_ids)} candidate emails from {to_email}")
+            result, msg_data = mail.fetch(b','.join(email_ids), f'(BODY.PEEK[HEADER.FIELDS ({REPLY_HEADER_FIELDS})])')
+            if result != 'OK':
+                return False, None, None, None
+
+            candidates = []
+            for item in msg_data:
+                if not isinstance(item, tuple):
+                    continue
+                headers = email.message_from_bytes(item[1])
+                candidates.append((int(item[0].split()[0]), headers))
+
+            # Newest first
+            for email_id, headers in sorted(candidates, key=lambda c: c[0], reverse=True):
+                email_date = self._parse_date(headers.get('Date'))
+                if email_date is None:
+                    logger.debug(f"Skipping email {email_id} - No usable Date header.")
+                    continue
+
+                if email_date <= sent_time_utc:
+                    logger.debug(f"⏰ Email {email_id} is older than or same as our sent time ({email_date} vs {sent_time_utc}) - skipping.")
+                    continue
+
+                subject = self._decode_subject(headers.get('Subject', ''))
+                if self._is_reply(headers, subject, original_subject, original_message_id):
+                    result, body_data = mail.fetch(str(email_id), '(BODY.PEEK[])')
+                    if result != 'OK' or not isinstance(body_data[0], tuple):
+                        logger.error(f"Failed to fetch the body of reply {email_id} from {to_email}")
+                        return False, None, None, None
+                    reply_body = self._extract_email_body(email.message_from_bytes(body_data[0][1]))
+                    return True, subject, reply_body, email_date
+                logger.info(f"❌ Email {email_id} is not a reply to our specific email - no matching Message-ID or strong subject correlation.")
+
+            return False, None, None, None
+
         except Exception as e:
             logger.error(f"Failed to check for reply from {to_email}: {str(e)}")
-            return False, None, None
-    
-    def send_with_followup(self, to_email, subject, message, timeout_hours=24):
+            if not own_session and isinstance(e, imaplib.IMAP4.abort):
+                raise # The shared session is gone, let the cycle end
+            return False, None, None, None
+        finally:
+            if own_session and mail is not None:
+                try:
+                    mail.logout()
+                except Exception:
+                    pass
+
+    def send_with_followup(self, to_email, subject, message, timeout_hours=24, context=None, route=None):
         """
         Send an email and schedule a follow-up if no reply is received
         
@@ -254,99 +338,351 @@ class EmailFollowUpSystem:
             subject: Email subject
             message: Email message
             timeout_hours: Hours to wait before sending follow-up (default: 24)
+            context: Optional data kept with the pending email & handed back to the reply callback
+            route: Optional route (see register_reply_route) whose callback gets the reply
         """
-        print('sending...')
         success, message_id = self.send_email(to_email, subject, message)
         if success:
-            sent_time_utc = datetime.datetime.now(pytz.utc)
-            
-            email_key = f"{to_email}_{subject}_{sent_time_utc.timestamp()}"
-            self.pending_emails[email_key] = {
-                'to_email': to_email,
-                'subject': subject,
-                'message': message,
-                'sent_time_utc': sent_time_utc,
-                'timeout_hours': timeout_hours,
-                'followup_sent': False,
-                'original_message_id': message_id
-            }
-            
-            logger.info(f"Email scheduled for follow-up tracking: {to_email} (Sent UTC: {sent_time_utc})")
+            self._track_sent(to_email, subject, message, message_id, timeout_hours, context, route)
             return True
         return False
+
+    def _track_sent(self, to_email, subject, message, message_id, timeout_hours, context=None, route=None):
+        sent_time_utc = datetime.datetime.now(pytz.utc)
+        
+        email_key = f"{to_email}_{subject}_{sent_time_utc.timestamp()}"
+        self.pending_emails[email_key] = {
+            'to_email': to_email,
+            'subject': subject,
+            'message': message,
+            'sent_time_utc': sent_time_utc,
+            'timeout_hours': timeout_hours,
+            'followup_sent': False,
+            'original_message_id': message_id,
+            'message_ids': [message_id],
+            'context': context,
+            'route': route
+        }
+        self.reply_router.hold(route)
+        self.reply_index.add(email_key, to_email, subject, message_id)
+        due_at = sent_time_utc.timestamp() + timeout_hours * 3600
+        self.followup_store.save(email_key, self.pending_emails[email_key], due_at)
+        self._schedule_due(email_key, due_at)
+        
+        logger.info(f"Email scheduled for follow-up tracking: {to_email} (Sent UTC: {sent_time_utc})")
     
-    def monitor_replies(self):
-        """Monitor for replies and send follow-ups as needed"""
-        while self.running:
-            current_time_utc = datetime.datetime.now(pytz.utc)
-            emails_to_remove = []
-            
-            # Make a copy of keys to iterate over, allowing dictionary modification
-            for email_key in list(self.pending_emails.keys()):
-                email_info = self.pending_emails.get(email_key)
-                if not email_info: # If item was removed by another iteration
-                    continue
+    def send_batch_with_followup(self, emails, timeout_hours=24):
+        """
+        Send several emails in parallel over the SMTP pool and track each one for follow-up.
+
+        Args:
+            emails: list of dicts with 'to_email', 'subject', 'message' and optional 'context' & 'route'
+        Returns:
+            list of bools, one per email
+        """
+        t0 = time.perf_counter()
+        built = [self._build_message(item['to_email'], item['subject'], item['message']) for item in emails]
+        self.governor.add_backlog(len(emails))
+        errors = self.smtp_pool.send_batch([(self.email_address, item['to_email'], text)
+                                            for item, (text, _) in zip(emails, built)],
+                                           before_send=lambda: self.governor.acquire(PRIORITY_FIRST_TOUCH, from_backlog=True))
+
+        results = []
+        for item, (_, message_id), error in zip(emails, built, errors):
+            if error is None:
+                logger.info(f"Email sent to {item['to_email']} - Subject: {item['subject']}")
+                self._track_sent(item['to_email'], item['subject'], item['message'], message_id,
+                                 timeout_hours, item.get('context'), item.get('route'))
+            else:
+                logger.error(f"Failed to send email to {item['to_email']}: {str(error)}")
+            results.append(error is None)
+
+        elapsed = time.perf_counter() - t0
+        logger.info(f"Batch: {sum(results)} of {len(emails)} emails sent in {elapsed:.2f}s "
+                    f"({sum(results) / elapsed if elapsed else 0:.1f}/s) | {self.smtp_pool.format_stats()}")
+        logger.info(self.governor.format_status(self._queued_sends()))
+        return results
+
+    def _queued_sends(self):
+        """Emails queued ahead of the send governor (none here, sends call it directly)"""
+        return 0
+
+    def send_status(self):
+        """Backpressure signals for discovery & outreach, see SendGovernor.status"""
+        return self.governor.status(self._queued_sends())
+
+    def _check_replies(self):
+        """
+        Incremental reply pass over one IMAP session: only messages above the persisted UID high-water mark are
+        looked at (headers only) and each is matched against the pending emails from its sender. A UIDVALIDITY
+        change (mailbox rebuilt) resets the mark.
+        """
+        pending = list(self.pending_emails.values())
+        if not pending:
+            return
+        # Nothing older than the oldest outstanding send can be a reply, this also bounds a first / reset sync.
+        since = (min(info['sent_time_utc'] for info in pending) - datetime.timedelta(days=1)).strftime('%d-%b-%Y')
+        mail = None
+        try:
+            mail = self._imap_connect()
+            mail.select('inbox', readonly=True)
+            uidvalidity = self._response_int(mail, 'UIDVALIDITY')
+            uidnext = self._response_int(mail, 'UIDNEXT')
+
+            state = self.mailbox_state.get(self._account, 'INBOX') if uidvalidity is not None else None
+            if state and state[0] == uidvalidity:
+                last_uid = state[1]
+                criteria = f'(UID {last_uid + 1}:* SINCE {since})'
+            else:
+                if state:
+                    logger.warning(f"UIDVALIDITY changed ({state[0]} -> {uidvalidity}), resyncing the inbox since {since}")
+                last_uid = 0
+                criteria = f'(SINCE {since})'
+
+            result, data = mail.uid('SEARCH', None, criteria)
+            if result != 'OK':
+                logger.error(f"Inbox search failed: {data}")
+                return
+            # 'N:*' always matches the newest message, even when it is below N
+            new_uids = sorted(uid for uid in map(int, (data[0] or b'').split()) if uid > last_uid)
+            logger.info(f"{len(new_uids)} new messages since UID {last_uid}")
+            failed_uid = self._match_new_messages(mail, new_uids) if new_uids else None
+
+            if uidvalidity is not None:
+                seen_uid = max([last_uid, (uidnext or 1) - 1] + new_uids)
+                if failed_uid is not None:
+                    # Messages from the first one that failed to fetch are looked at again next cycle
+                    logger.warning(f"Messages from UID {failed_uid} not fully checked, retrying them next cycle")
+                    seen_uid = failed_uid - 1
+                self.mailbox_state.set(self._account, 'INBOX', uidvalidity, seen_uid)
+        except Exception as e:
+            logger.error(f"Reply check cycle failed: {str(e)}")
+        finally:
+            if mail is not None:
+                try:
+                    mail.logout()
+                except Exception:
+                    pass
+
+    @staticmethod
+    def _response_int(mail, code):
+        typ, data = mail.response(code)
+        try:
+            return int(data[-1])
+        except (TypeError, ValueError, IndexError):
+            return None
+
+    def _parse_date(self, date_header):
+        """Date header as an aware UTC datetime, None if missing / unparseable"""
+        if not date_header:
+            return None
+        try:
+            email_date = parsedate_to_datetime(date_header)
+        except Exception as e:
+            logger.error(f"Date parsing error for '{date_header}': {e}")
+            return None
+        return pytz.utc.localize(email_date) if email_date.tzinfo is None else email_date.astimezone(pytz.utc)
+
+    def _match_new_messages(self, mail, uids, chunk_size=500):
+        """
+        Fetch the threading headers of new messages & hand replies to pending emails to _handle_reply. Each message
+        is looked up once in the reply index (Message-IDs, normalized subjects, recipients), not against every
+        pending email.
+
+        Returns:
+            The lowest UID that couldn't be fetched (so the high-water mark stays below it), None if all were checked
+        """
+        failed = []
+        for i in range(0, len(uids), chunk_size):
+            uid_set = ','.join(str(uid) for uid in uids[i:i + chunk_size])
+            result, msg_data = mail.uid('FETCH', uid_set, f'(BODY.PEEK[HEADER.FIELDS ({REPLY_HEADER_FIELDS})])')
+            if result != 'OK':
+                logger.error(f"Header fetch failed for UIDs {uid_set}")
+                failed.append(uids[i])
+                continue
 
-                to_email = email_info['to_email']
-                subject = email_info['subject']
-                message = email_info['message']
-                sent_time_utc = email_info['sent_time_utc']
-                timeout_hours = email_info['timeout_hours']
-                followup_sent = email_info['followup_sent']
-                original_message_id = email_info.get('original_message_id')
-                
-                # 1. Check for reply
-                # CORRECTED LINE: Assign the returned values
-                is_reply_found, reply_subject, reply_body = self.check_for_reply(to_email, subject, sent_time_utc, original_message_id)
-                
-                if is_reply_found:
-                    logger.info(f"🎉 Reply received from {to_email} for: {subject}")
-                    
-                    # Call the registered callback if it exists
-                    if self.reply_callback:
-                        try:
-                            self.reply_callback(to_email, reply_subject, reply_body, email_info)
-                        except Exception as cb_e:
-                            logger.error(f"Error in reply callback: {cb_e}")
-                    
-                    emails_to_remove.append(email_key) # Remove from tracking after reply
+            for item in msg_data:
+                if not isinstance(item, tuple):
                     continue
-                
-                # 2. If no reply, check timeout for follow-up
-                time_diff = current_time_utc - sent_time_utc
-                
-                if time_diff.total_seconds() >= timeout_hours * 3600:
-                    if not followup_sent:
-                        logger.info(f"Timeout reached for {to_email} - {subject}. Sending follow-up.")
-                        success, new_message_id = self.send_email(to_email, subject, message, is_followup=True, in_reply_to_mid=original_message_id)
-                        if success:
-                            logger.info(f"Follow-up sent to {to_email} for: {subject}")
-                            # Update details for next check
-                            self.pending_emails[email_key]['followup_sent'] = True
-                            self.pending_emails[email_key]['sent_time_utc'] = current_time_utc 
-                            self.pending_emails[email_key]['original_message_id'] = new_message_id 
-                        else:
-                            logger.warning(f"Failed to send follow-up to {to_email}. Removing from tracking.")
-                            emails_to_remove.append(email_key)
-                    else:
-                        # If follow-up was sent, and still no reply after another 'timeout_hours' period
-                        if time_diff.total_seconds() >= (timeout_hours * 2) * 3600:  # e.g., 2 * 24 hours
-                            logger.info(f"No reply received from {to_email} after follow-up period. Removing from tracking.")
-                            emails_to_remove.append(email_key)
-            
-            for email_key in emails_to_remove:
-                if email_key in self.pending_emails:
-                    del self.pending_emails[email_key]
-            
-            time.sleep(30) # Check every 30 seconds
+                uid_match = re.search(rb'UID (\d+)', item[0])
+                headers = email.message_from_bytes(item[1])
+                sender = parseaddr(headers.get('From', ''))[1]
+                subject = self._decode_subject(headers.get('Subject', ''))
+                candidates = self.reply_index.candidates(sender, subject, headers.get('In-Reply-To', ''),
+                                                         headers.get('References', ''))
+                if not uid_match or not candidates:
+                    continue
+                email_date = self._parse_date(headers.get('Date'))
+                if email_date is None:
+                    continue
+
+                for email_key, kind in candidates:
+                    email_info = self.pending_emails.get(email_key)
+                    if not email_info or email_date <= email_info['sent_time_utc']:
+                        continue
+                    if kind == BY_MESSAGE_ID:
+                        logger.info(f"🎉 REPLY DETECTED (Message-ID header) from {sender}: {subject}")
+                    elif not self._is_reply({}, subject, email_info['subject'], None):
+                        continue
+                    result, body_data = mail.uid('FETCH', uid_match.group(1).decode(), '(BODY.PEEK[])')
+                    if result != 'OK' or not isinstance(body_data[0], tuple):
+                        logger.error(f"Failed to fetch the body of reply UID {uid_match.group(1).decode()} from {sender}")
+                        failed.append(int(uid_match.group(1)))
+                        break
+                    reply_body = self._extract_email_body(email.message_from_bytes(body_data[0][1]))
+                    self._handle_reply(email_key, email_info, subject, reply_body, email_date)
+                    break
+        return min(failed) if failed else None
+
+    def _untrack(self, email_key):
+        """Stop tracking a pending email (replied, or given up on)"""
+        with self._schedule:
+            email_info = self.pending_emails.pop(email_key, None)
+            if email_info is None:
+                return
+            self.reply_index.remove(email_key)
+            self.followup_store.remove(email_key)
+            self.reply_router.release(email_info.get('route'))
+
+    def _handle_reply(self, email_key, email_info, reply_subject, reply_body, reply_date):
+        """Hand a detected reply to the callback dispatcher (never waited on) & stop tracking the email"""
+        logger.info(f"🎉 Reply received from {email_info['to_email']} for: {email_info['subject']}")
+        self._record_reply_latency(reply_date)
+
+        # The callback of the campaign that sent the email, else the default one
+        route = email_info.get('route')
+        callback = self.reply_router.get(route) if route is not None else None
+        if callback is None and route is not None:
+            logger.warning(f"No reply route registered for {route} (campaign ended / restarted), using the default callback")
+        callback = callback or self.reply_callback
+        if callback:
+            self.callback_dispatcher.submit(callback, email_info['to_email'], reply_subject, reply_body,
+                                            email_info, name=f"for {email_info['to_email']} - {email_info['subject']}")
+        else:
+            logger.error(f"No reply callback registered, the reply from {email_info['to_email']} is not acted on")
+
+        self._untrack(email_key) # Remove from tracking after reply
+
+    def _restore_pending(self):
+        """Reload outstanding emails (& their follow-up deadlines) persisted before a restart"""
+        for email_key, (email_info, due_at) in self.followup_store.load().items():
+            self.pending_emails[email_key] = email_info
+            self.reply_router.hold(email_info['route'])
+            self.reply_index.add(email_key, email_info['to_email'], email_info['subject'])
+            for message_id in email_info['message_ids']:
+                self.reply_index.add_message_id(email_key, message_id)
+            self._schedule_due(email_key, due_at)
+        if self.pending_emails:
+            logger.info(f"Restored {len(self.pending_emails)} pending emails awaiting a reply / follow-up")
+
+    def _schedule_due(self, email_key, due_at):
+        """(Re)schedule the next follow-up action of a pending email, epoch seconds"""
+        with self._schedule:
+            self.pending_emails[email_key]['due_at'] = due_at
+            heapq.heappush(self._due_heap, (due_at, email_key))
+            self._schedule.notify()
+
+    def _run_followups(self):
+        """Sleep until the earliest follow-up deadline (or until an earlier one is scheduled), then handle it"""
+        while self.running:
+            with self._schedule:
+                while self.running and not (self._due_heap and self._due_heap[0][0] <= time.time()):
+                    self._schedule.wait(self._due_heap[0][0] - time.time() if self._due_heap else None)
+                if not self.running:
+                    return
+                due_at, email_key = heapq.heappop(self._due_heap)
+            self._process_due(due_at, email_key)
+
+    def _process_due(self, due_at, email_key):
+        email_info = self.pending_emails.get(email_key)
+        if email_info is None or email_info.get('due_at') != due_at:
+            return # Replied to or rescheduled since, stale heap entry
+        try:
+            self._handle_due(email_key, email_info)
+        except Exception as e:
+            logger.error(f"Follow-up handling failed for {email_info['to_email']}: {e}")
+
+    def _handle_due(self, email_key, email_info):
+        """Send the follow-up of an email past its timeout, or drop it if the follow-up got no reply either"""
+        to_email = email_info['to_email']
+        subject = email_info['subject']
+        timeout_seconds = email_info['timeout_hours'] * 3600
+
+        if not email_info['followup_sent']:
+            if self.governor.quota_exhausted(PRIORITY_FOLLOWUP):
+                logger.warning(f"Daily sending quota used up, follow-up to {to_email} postponed to the next reset.")
+                with self._schedule:
+                    if email_key in self.pending_emails:
+                        due_at = self.governor.quota_resets_at()
+                        self.followup_store.save(email_key, email_info, due_at)
+                        self._schedule_due(email_key, due_at)
+                return
+            logger.info(f"Timeout reached for {to_email} - {subject}. Sending follow-up.")
+            success, new_message_id = self.send_email(to_email, subject, email_info['message'], is_followup=True,
+                                                      in_reply_to_mid=email_info.get('original_message_id'))
+            if success:
+                logger.info(f"Follow-up sent to {to_email} for: {subject}")
+                with self._schedule:
+                    if email_key not in self.pending_emails:
+                        return # Replied to while the follow-up was being sent
+                    email_info['followup_sent'] = True
+                    email_info['sent_time_utc'] = datetime.datetime.now(pytz.utc)
+                    email_info['original_message_id'] = new_message_id
+                    email_info['message_ids'].append(new_message_id)
+                    self.reply_index.add_message_id(email_key, new_message_id)
+                    # Give up if the follow-up gets no reply within another 2 x timeout
+                    due_at = email_info['sent_time_utc'].timestamp() + 2 * timeout_seconds
+                    self.followup_store.save(email_key, email_info, due_at)
+                    self._schedule_due(email_key, due_at)
+            else:
+                logger.warning(f"Failed to send follow-up to {to_email}. Removing from tracking.")
+                self._untrack(email_key)
+        else:
+            logger.info(f"No reply received from {to_email} after follow-up period. Removing from tracking.")
+            self._untrack(email_key)
+
+    def _record_reply_latency(self, reply_date):
+        """Latency from the reply's Date header (& from the new-mail wake up) to its callback being dispatched"""
+        if reply_date is not None:
+            latency = max(0.0, (datetime.datetime.now(pytz.utc) - reply_date).total_seconds())
+            self.reply_latencies.append(latency)
+            logger.info(f"Reply latency: {latency:.1f}s from the creator's reply to its callback")
+        if self.watcher and self.watcher.last_change_at is not None:
+            wake_ms = (time.monotonic() - self.watcher.last_change_at) * 1000
+            logger.info(f"Reply matched {wake_ms:.0f}ms after the new-mail wake up ({self.watcher.mode})")
+
+    def reply_latency_stats(self):
+        """p50 / p95 / max seconds from a creator's reply (Date header) to its callback, over recent replies"""
+        values = sorted(self.reply_latencies)
+        if not values:
+            return {'count': 0, 'p50_s': None, 'p95_s': None, 'max_s': None}
+        pick = lambda q: values[min(len(values) - 1, int(q * (len(values) - 1)))]
+        return {'count': len(values), 'p50_s': round(pick(0.5), 1), 'p95_s': round(pick(0.95), 1), 'max_s': round(values[-1], 1)}
+
+    def monitor_replies(self):
+        """
+        Monitor for replies. Reply matching (IMAP) only runs when the mailbox watcher reports new mail, follow-ups
+        are sent by the follow-up scheduler thread at their exact deadlines.
+        """
+        while self.running:
+            new_mail = self.watcher.wait()
+            if not self.running:
+                break
+            if new_mail:
+                self._check_replies()
 
     def start_monitoring(self):
         """Start the email monitoring system in a separate thread"""
         if not self.running:
             self.running = True
+            self.watcher = MailboxWatcher(self._imap_connect, poll_interval=self.check_interval)
+            self.watcher.start()
+            self.callback_dispatcher.start()
             self.monitor_thread = threading.Thread(target=self.monitor_replies, name="EmailMonitorThread")
             self.monitor_thread.daemon = True # Allows program to exit even if thread is running
             self.monitor_thread.start()
+            self.followup_thread = threading.Thread(target=self._run_followups, name="EmailFollowUpThread", daemon=True)
+            self.followup_thread.start()
             logger.info("Email monitoring system started")
         else:
             logger.info("Email monitoring system is already running.")
@@ -356,11 +692,21 @@ class EmailFollowUpSystem:
         if self.running:
             logger.info("Stopping email monitoring system...")
             self.running = False
+            with self._schedule:
+                self._schedule.notify_all()
+            if self.watcher:
+                self.watcher.stop()
+            if self.followup_thread and self.followup_thread.is_alive():
+                self.followup_thread.join(timeout=5)
+            self.smtp_pool.close()
+            logger.info(self.smtp_pool.format_stats())
             if self.monitor_thread and self.monitor_thread.is_alive():
                 # Give a short time for the thread to gracefully shut down
                 self.monitor_thread.join(timeout=5) 
                 if self.monitor_thread.is_alive():
                     logger.warning("Email monitoring thread did not terminate gracefully.")
+            self.callback_dispatcher.stop()
+            logger.info(self.callback_dispatcher.format_stats())
             logger.info("Email monitoring system stopped.")
         else:
             logger.info("Email monitoring system is not running.")
@@ -398,29 +744,62 @@ def _process_ifc(response):
             return '<error>', "Unrecognized LLM response format."
         
 
-def start_email_engine():
+def email_config():
+    """EmailFollowUpSystem settings from the environment, None when the account credentials aren't set"""
+    if not os.getenv('EMAIL_ADDRESS') or not os.getenv('EMAIL_PASSWORD'):
+        return None
+    return {
+        'smtp_server': os.getenv('SMTP_SERVER', 'smtp.gmail.com'),
+        'smtp_port': int(os.getenv('SMTP_PORT', 587)),
+        'imap_server': os.getenv('IMAP_SERVER', 'imap.gmail.com'),
+        'imap_port': int(os.getenv('IMAP_PORT', 993)),
+        'email_address': os.getenv('EMAIL_ADDRESS'),
+        'password': os.getenv('EMAIL_PASSWORD'),
+        'imap_ssl': os.getenv('IMAP_SSL', '1') != '0',
+        'smtp_starttls': os.getenv('SMTP_STARTTLS', '1') != '0',
+    }
+
+def start_email_engine(reply_callback=None):
+    """
+    Start the threaded email system (scripts), the app runs asyncEmailEngine inside its event loop instead.
+    `reply_callback` is the default reply handler, registered before the first reply check so replies to emails
+    restored from before a restart (whose campaign route is gone) are still handled.
+    """
     global email_system
     if email_system:
         logger.info("Email engine already running.")
         return email_system
 
-    EMAIL_CONFIG = {
-        'smtp_server': 'smtp.gmail.com',
-        'smtp_port': 587,
-        'imap_server': 'imap.gmail.com',
-        'imap_port': 993,
-        'email_address': 'letmatchboxflow@gmail.com',
-        'password': 'vhev hhza jtkg dhtb' 
-    }
-
-    email_system = EmailFollowUpSystem(**EMAIL_CONFIG)
-    # email_system.register_reply_callback(callback)
+    config = email_config()
+    if config is None:
+        logger.error("EMAIL_ADDRESS / EMAIL_PASSWORD not set, email engine not started.")
+        return None
+    email_system = EmailFollowUpSystem(**config)
+    if reply_callback:
+        email_system.register_reply_callback(reply_callback)
     email_system.start_monitoring()  # starts a daemon thread internally
     logger.info("✅ Email follow-up system monitoring started.")
     return email_system
 
+def is_running():
+    """False when the engine wasn't started (e.g. EMAIL_ADDRESS / EMAIL_PASSWORD not set), outreach must be skipped"""
+    return email_system is not None
+
 def register_reply_callback(callback):
+    if not email_system:
+        logger.warning("Email system not initialized, reply callback not registered.")
+        return
     email_system.register_reply_callback(callback)
+
+def register_reply_route(route, callback):
+    if not email_system:
+        logger.warning(f"Email system not initialized, reply route {route} not registered.")
+        return
+    email_system.register_reply_route(route, callback)
+
+def unregister_reply_route(route):
+    if email_system:
+        email_system.unregister_reply_route(route)
                             
 def send_email_with_followup(to_email, subject, message, timeout_hours=24):
     if not email_system:
@@ -428,6 +807,19 @@ def send_email_with_followup(to_email, subject, message, timeout_hours=24):
 
     return email_system.send_with_followup(to_email, subject, message, timeout_hours)
 
+def send_batch_with_followup(emails, timeout_hours=24):
+    if not email_system:
+        raise RuntimeError("Email system not initialized.")
+
+    return email_system.send_batch_with_followup(emails, timeout_hours)
+
+def send_status():
+    """Outbound queue depth, projected drain time, quota left & whether to hold back new outreach"""
+    if not email_system:
+        raise RuntimeError("Email system not initialized.")
+
+    return email_system.send_status()
+
 def stop_email_monitoring():
     if email_system:
         email_system.stop_monitoring()
@@ -0,0 +1,165 @@
+"""
+MatchBoxAIEngine.Outreach.mailboxWatcher:
+Wakes the email monitor as soon as new mail lands, via IMAP IDLE (RFC 2177) with a cheap STATUS polling fallback.
+
+Developed and maintained by Aditya Gaur / @xdityagr at Github / adityagaur.home@gmail.com
+© 2025 MatchBox AI. All rights reserved.
+"""
+
+import re
+import ssl
+import time
+import socket
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+NEW_MAIL_RE = re.compile(rb"^\* \d+ (EXISTS|RECENT)", re.MULTILINE)
+UIDNEXT_RE = re.compile(rb"UIDNEXT (\d+)")
+
+
+class MailboxWatcher:
+    def __init__(self, connect, mailbox='INBOX', idle_timeout=20 * 60, poll_interval=30, reconnect_delay=5):
+        """
+        Args:
+            connect: f() -> authenticated imaplib.IMAP4 connection, the watcher keeps its own
+            mailbox: Mailbox to watch
+            idle_timeout: Seconds before an IDLE is re-issued (servers drop IDLE after ~30 min)
+            poll_interval: Seconds between STATUS checks when the server has no IDLE support
+            reconnect_delay: Seconds to wait before reconnecting after a connection error
+        """
+        self.connect = connect
+        self.mailbox = mailbox
+        self.idle_timeout = idle_timeout
+        self.poll_interval = poll_interval
+        self.reconnect_delay = reconnect_delay
+
+        self.mode = None  # 'idle' or 'poll' once connected
+        self.wakeups = 0
+        self.last_change_at = None  # time.monotonic() of the last new-mail signal
+        self._changed = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        # Run one reply pass right away, mail may have arrived while nobody was watching.
+        self._signal()
+        self._thread = threading.Thread(target=self._run, name="MailboxWatcherThread", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        self._changed.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+
+    def wait(self, timeout=None):
+        """Block until new mail was signalled (True) or `timeout` passed (False), clears the signal."""
+        changed = self._changed.wait(timeout)
+        self._changed.clear()
+        return changed and not self._stop.is_set()
+
+    def _signal(self):
+        self.wakeups += 1
+        self.last_change_at = time.monotonic()
+        self._changed.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            mail = None
+            try:
+                mail = self.connect()
+                mail.select(self.mailbox, readonly=True)
+                if 'IDLE' in mail.capabilities:
+                    self.mode = 'idle'
+                    while not self._stop.is_set():
+                        if self._idle(mail):
+                            self._signal()
+                else:
+                    self.mode = 'poll'
+                    self._poll(mail)
+            except Exception as e:
+                logger.warning(f"Mailbox watcher connection error ({self.mode or 'connecting'}): {e}")
+                # Something may have arrived while we were disconnected.
+                self._signal()
+                self._stop.wait(self.reconnect_delay)
+            finally:
+                if mail is not None:
+                    try:
+                        mail.logout()
+                    except Exception:
+                        pass
+
+    def _idle(self, mail):
+        """One IDLE round, returns True if the server reported new mail."""
+        tag = mail._new_tag()
+        mail.send(tag + b' IDLE\r\n')
+        continuation = mail.readline()
+        if not continuation.startswith(b'+'):
+            raise mail.error(f"IDLE rejected: {continuation!r}")
+
+        # Read the raw socket in short slices so stop() stays responsive. imaplib's buffered file is not used while
+        # idling (a timeout would poison it), anything it had buffered is read with the DONE response below. An
+        # EXISTS that came in the same segment as the continuation is already in that buffer though, look there first.
+        sock = mail.socket()
+        previous_timeout = sock.gettimeout()
+        deadline = time.monotonic() + self.idle_timeout
+        received = self._buffered(mail)
+        new_mail = bool(NEW_MAIL_RE.search(received))
+        try:
+            while not new_mail and not self._stop.is_set() and time.monotonic() < deadline:
+                sock.settimeout(1.0)
+                try:
+                    chunk = sock.recv(4096)
+                except socket.timeout:
+                    continue
+                if not chunk:
+                    raise mail.abort("connection closed while idling")
+                received += chunk
+                new_mail = bool(NEW_MAIL_RE.search(received))
+        finally:
+            sock.settimeout(previous_timeout)
+
+        mail.send(b'DONE\r\n')
+        while True:
+            line = mail.readline()
+            if not line:
+                raise mail.abort("connection closed ending IDLE")
+            if NEW_MAIL_RE.match(line):
+                new_mail = True
+            if line.startswith(tag):
+                break
+        mail.tagged_commands.pop(tag, None)
+        return new_mail
+
+    @staticmethod
+    def _buffered(mail):
+        """Bytes imaplib has read off the socket but not handed out yet, without blocking for more."""
+        sock = mail.socket()
+        previous_timeout = sock.gettimeout()
+        sock.settimeout(0)  # non-blocking, unlike a timeout this leaves the buffered file usable
+        try:
+            return mail.file.peek() or b''
+        except (BlockingIOError, ssl.SSLWantReadError):
+            return b''
+        finally:
+            sock.settimeout(previous_timeout)
+
+    def _poll(self, mail):
+        """STATUS UIDNEXT every poll_interval, a change means new mail (no message data is fetched)."""
+        last_uidnext = None
+        while not self._stop.wait(self.poll_interval if last_uidnext is not None else 0):
+            typ, data = mail.status(self.mailbox, '(UIDNEXT)')
+            match = UIDNEXT_RE.search(data[0] or b'') if typ == 'OK' else None
+            if match is None:
+                # No usable answer, let the monitor do a pass every interval.
+                self._signal()
+                continue
+            uidnext = int(match.group(1))
+            if last_uidnext is not None and uidnext != last_uidnext:
+                self._signal()
+            last_uidnext = uidnext
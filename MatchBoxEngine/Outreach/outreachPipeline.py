@@ -0,0 +1,129 @@
+"""
+MatchBoxAIEngine.Outreach.outreachPipeline:
+Drafts personalised outreach emails for a whole shortlist concurrently & sends them over a reused SMTP connection,
+skipping creators already contacted within their cooldown.
+
+Developed and maintained by Aditya Gaur / @xdityagr at Github / adityagaur.home@gmail.com
+© 2025 MatchBox AI. All rights reserved.
+"""
+
+import os
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEND_LIMIT = int(os.getenv("OUTREACH_SEND_LIMIT", 10))
+
+
+def campaign_send_limit(campaign_info):
+    """
+    Max first-touch emails for a campaign: an explicit `max_outreach`, else the total of
+    `num_creators_target`, else OUTREACH_SEND_LIMIT.
+    """
+    explicit = campaign_info.get('max_outreach')
+    if isinstance(explicit, int) and explicit > 0:
+        return explicit
+    targets = campaign_info.get('num_creators_target') or {}
+    total = sum(v for v in targets.values() if isinstance(v, int)) if isinstance(targets, dict) else 0
+    return total if total > 0 else DEFAULT_SEND_LIMIT
+
+
+class OutreachPipeline:
+    def __init__(self, model_handler, email_engine, build_prompt, parse_draft, max_concurrency=8, contact_registry=None):
+        """
+        Args:
+            model_handler: ModelHandler used for drafting (batch_chat)
+            email_engine: Email engine module / EmailFollowUpSystem exposing send_batch_with_followup & send_status
+            build_prompt: f(influencer_info, campaign_info) -> (system_prompt, content)
+            parse_draft: f(llm_response) -> (subject, body)
+            max_concurrency: Max drafts in flight at once
+            contact_registry: Optional ContactRegistry, creators still in their cooldown are skipped before drafting
+        """
+        self.mH = model_handler
+        self.email_engine = email_engine
+        self.build_prompt = build_prompt
+        self.parse_draft = parse_draft
+        self.max_concurrency = max_concurrency
+        self.contact_registry = contact_registry
+        self.stats = {}
+        self.send_status = None # Email engine backpressure, read before drafting
+
+    def _record(self, stage, items, started):
+        seconds = time.perf_counter() - started
+        self.stats[stage] = {'items': items, 'seconds': round(seconds, 3),
+                             'per_sec': round(items / seconds, 2) if seconds > 0 else None}
+
+    def draft(self, influencers, campaign_info):
+        """Draft one email per influencer, returns [(influencer_info, subject, body)] for the usable drafts."""
+        started = time.perf_counter()
+        prompts = [self.build_prompt(info, campaign_info) for info in influencers]
+        responses = self.mH.batch_chat(prompts, max_concurrency=self.max_concurrency)
+
+        drafts = []
+        for info, resp in zip(influencers, responses):
+            if isinstance(resp, Exception) or not resp:
+                logger.warning(f"Drafting failed for {info.get('name')}: {resp}")
+                continue
+            subject, body = self.parse_draft(resp)
+            if subject and body:
+                drafts.append((info, subject, body))
+        self._record('draft', len(drafts), started)
+        return drafts
+
+    def send(self, drafts, campaign_info, timeout_hours=24, recipient_override=None, route=None):
+        """Send all drafts over one SMTP session and register each for follow-up, replies go to `route`'s callback."""
+        started = time.perf_counter()
+        emails = [{
+            'to_email': recipient_override or info.get('email'),
+            'subject': subject,
+            'message': body,
+            'context': {'campaign_info': campaign_info, 'influencer_info': info},
+            'route': route,
+        } for info, subject, body in drafts]
+        results = self.email_engine.send_batch_with_followup(emails, timeout_hours=timeout_hours)
+        sent = sum(1 for ok in results if ok)
+        if self.contact_registry is not None and not recipient_override:
+            # Sandbox sends (recipient_override) never reach the creator, so they don't start a cooldown.
+            campaign = campaign_info.get('title', '')
+            for (info, _, _), ok in zip(drafts, results):
+                if ok:
+                    self.contact_registry.add(info.get('id'), info.get('email'), campaign)
+        self._record('send', sent, started)
+        return sent
+
+    def run(self, influencers, campaign_info, timeout_hours=24, recipient_override=None, send_limit=None, route=None):
+        """
+        Draft & send outreach for the shortlist, capped at the campaign's send limit.
+
+        Returns:
+            (number of emails sent, per-stage stats)
+        """
+        self.stats = {}
+        limit = send_limit if send_limit is not None else campaign_send_limit(campaign_info)
+        self.send_status = self.email_engine.send_status()
+        if self.send_status['first_touch_remaining'] < limit:
+            # Don't draft emails today's sending quota can't carry
+            logger.warning(f"Outreach: only {self.send_status['first_touch_remaining']} first-touch emails left in "
+                           f"today's quota, capping {limit}")
+            limit = self.send_status['first_touch_remaining']
+        if self.send_status['backpressure']:
+            logger.warning(f"Outreach: send queue backpressure, {self.send_status['queue_depth']} emails queued "
+                           f"(drain ~{self.send_status['projected_drain_seconds']}s)")
+        selected = [info for info in influencers if recipient_override or info.get('email')]
+        if self.contact_registry is not None:
+            cooldown = campaign_info.get('contact_cooldown_days')
+            fresh = [info for info in selected
+                     if not self.contact_registry.contains(info.get('id'), info.get('email'), cooldown_days=cooldown)]
+            if len(fresh) < len(selected):
+                logger.info(f"Outreach: skipped {len(selected) - len(fresh)} creators contacted within the cooldown")
+            selected = fresh
+        selected = selected[:limit]
+        logger.info(f"Outreach: {len(selected)} of {len(influencers)} creators selected (limit {limit})")
+
+        drafts = self.draft(selected, campaign_info)
+        sent = self.send(drafts, campaign_info, timeout_hours, recipient_override, route) if drafts else 0
+        return sent, self.stats
+
+    def format_stats(self):
+        return " | ".join(f"{stage}: {s['items']} in {s['seconds']}s ({s['per_sec']}/s)" for stage, s in self.stats.items())
@@ -0,0 +1,143 @@
+"""
+MatchBoxAIEngine.Outreach.replyClassifier:
+Deterministic first pass over creator replies, before the LLM: phone number extraction & normalization (E.164,
+country-code aware) and clear accept / decline phrasing in English, Hindi & Hinglish. Returns the same tags as
+emailEngine._process_ifc, or None when the reply needs the LLM.
+
+Developed and maintained by Aditya Gaur / @xdityagr at Github / adityagaur.home@gmail.com
+© 2025 MatchBox AI. All rights reserved.
+"""
+
+import os
+import re
+
+DEFAULT_COUNTRY_CODE = os.getenv("DEFAULT_COUNTRY_CODE", "91")  # Numbers written without one (mostly India)
+
+# Runs of digits with the usual separators, optionally international (+ / 00)
+PHONE_CANDIDATE_RE = re.compile(r"(?<![\w+])(?:\+|00)?\d[\d\s().\-]{7,18}\d(?!\w)")
+# Amounts & counts are not phone numbers
+NOT_PHONE_BEFORE_RE = re.compile(r"(₹|rs\.?|inr|\$|usd)\s*$", re.IGNORECASE)
+NOT_PHONE_AFTER_RE = re.compile(r"^\s*(k\b|followers|views|likes|subscribers|/-|rs\b|rupees|inr)", re.IGNORECASE)
+
+# Where the quoted email being answered starts: Gmail's "On ... wrote:" (may wrap onto a second line), Outlook's
+# "From: / Sent:" header block or separator line, "-----Original Message-----"
+QUOTE_START_RE = re.compile(
+    r"^[ \t]*On\b[^\n]*(?:\n[^\n]*)?\bwrote:[ \t]*$"
+    r"|^[ \t]*-{2,}[ \t]*Original Message[ \t]*-{2,}"
+    r"|^[ \t]*\*?From:\*?[^\n]*\n(?:[^\n]*\n)?[ \t]*\*?(?:Sent|Date|To):"
+    r"|^[ \t]*_{10,}[ \t]*$"
+    r"|^[^\n]*ने लिखा:[ \t]*$",
+    re.IGNORECASE | re.MULTILINE)
+
+DECLINE_PATTERNS = [
+    r"\bnot interested\b", r"\bno,? thanks?\b", r"\bno,? thank you\b", r"\bnot (?:at )?(?:the|this) (?:moment|time)\b",
+    r"\b(?:i|we) (?:will|'ll|would|have to|must) (?:pass|decline)\b", r"\bpass on this\b", r"\bnot for (?:me|us)\b",
+    r"\bnot a (?:good )?fit\b", r"\bunsubscribe\b", r"\b(?:do not|don't|dont|never|stop) (?:contact|email|mail|call|phone|message|text|whatsapp)",
+    # Hinglish
+    r"\binterest(?:ed)? nahi+\b", r"\bnahi+ chahiye\b", r"\bnahi+ karna\b", r"\bnahi+ kar(?:unga|ungi|enge|na)\b",
+    r"\bmat (?:karo|bhejo|bhejna)\b", r"\babhi nahi+\b", r"\bcall mat\b", r"\bphone mat\b",
+]
+DECLINE_PHRASES_HI = ["रुचि नहीं", "दिलचस्पी नहीं", "इंटरेस्टेड नहीं", "नहीं चाहिए", "नहीं करना", "मना है", "अभी नहीं", "संपर्क न करें", "कॉल मत", "फ़ोन मत", "फोन मत"]
+
+ACCEPT_PATTERNS = [
+    r"\b(?:i am|i'm|im|we are|we're) interested\b", r"\bsounds (?:good|great|interesting)\b", r"\blet'?s (?:do|go|connect|talk)\b",
+    r"\bhappy to (?:collaborate|work|connect|discuss)\b", r"\bi'?d love to\b", r"\bcount me in\b",
+    r"\bcall me\b", r"\breach me\b", r"\bmy (?:number|contact|phone|mobile|whatsapp)\b",
+    # Hinglish
+    r"\bha+n(?:ji)?\b", r"\bji ha+n\b", r"\bbilkul\b", r"\bthik hai\b", r"\btheek hai\b", r"\bkar (?:lenge|sakte)\b",
+    r"\binterested hu+n?\b", r"\bcall kar(?:o|lo|na|iye)\b",
+]
+ACCEPT_PHRASES_HI = ["हाँ", "हां", "जी हाँ", "ठीक है", "बिल्कुल", "इंटरेस्टेड हूँ", "रुचि है", "कॉल करें", "कॉल कर"]
+
+# Questions / negotiation go to the LLM (<follow-up-reply> needs a judgement on what is asked)
+QUESTION_PATTERNS = [
+    r"\?", r"\b(?:how much|what (?:is|are) the|budget|rate card|charges|commercials|deliverables|timeline)\b",
+    r"\b(?:kitna|kitne|kaise|kab|kya)\b",
+]
+QUESTION_PHRASES_HI = ["कितना", "कितने", "कैसे", "कब", "क्या"]
+
+# Any negation next to a phone number needs a judgement ("don't use this number", "not on 98..., try email")
+NEGATION_PATTERNS = [r"\b(?:not|no|never|don'?t|dont|won'?t|can'?t|cannot|nahi+|mat)\b"]
+NEGATION_PHRASES_HI = ["नहीं", "मत", "न"]
+
+
+def _compile(patterns, phrases_hi=()):
+    # Devanagari phrases must stand alone, \b doesn't work around vowel signs ('हाँ' is also inside 'यहाँ')
+    hindi = [rf"(?<![\u0900-\u097F]){re.escape(phrase)}(?![\u0900-\u097F])" for phrase in phrases_hi]
+    return re.compile("|".join(patterns + hindi), re.IGNORECASE)
+
+
+_DECLINE_RE = _compile(DECLINE_PATTERNS, DECLINE_PHRASES_HI)
+_ACCEPT_RE = _compile(ACCEPT_PATTERNS, ACCEPT_PHRASES_HI)
+_QUESTION_RE = _compile(QUESTION_PATTERNS, QUESTION_PHRASES_HI)
+_NEGATION_RE = _compile(NEGATION_PATTERNS, NEGATION_PHRASES_HI)
+
+
+def normalize_phone(raw, default_country_code=DEFAULT_COUNTRY_CODE):
+    """
+    '+91 98765-43210' / '098765 43210' / '9876543210' -> '+919876543210', None if it can't be a phone number.
+    Numbers without a country code get `default_country_code`.
+    """
+    digits = re.sub(r"\D", "", raw)
+    stripped = raw.strip()
+    if stripped.startswith('+') or stripped.startswith('00'):
+        digits = digits[2:] if stripped.startswith('00') else digits
+        return f"+{digits}" if 8 <= len(digits) <= 15 else None
+    if default_country_code == "91":
+        # Indian mobiles: 10 digits starting 6-9, optionally with the 0 trunk prefix or 91 in front
+        if len(digits) == 11 and digits[0] == '0':
+            digits = digits[1:]
+        elif len(digits) == 12 and digits.startswith('91'):
+            digits = digits[2:]
+        return f"+91{digits}" if len(digits) == 10 and digits[0] in '6789' else None
+    if len(digits) > 10 and digits.startswith(default_country_code):
+        return f"+{digits}" if len(digits) <= 15 else None
+    digits = digits.lstrip('0')
+    return f"+{default_country_code}{digits}" if 7 <= len(digits) <= 12 else None
+
+
+def extract_phone_numbers(text, default_country_code=DEFAULT_COUNTRY_CODE):
+    """Distinct normalized phone numbers in `text`, in order of appearance (amounts & follower counts skipped)."""
+    found = []
+    for match in PHONE_CANDIDATE_RE.finditer(text or ''):
+        if NOT_PHONE_BEFORE_RE.search(text[max(0, match.start() - 6):match.start()]) or \
+           NOT_PHONE_AFTER_RE.search(text[match.end():match.end() + 12]):
+            continue
+        phone = normalize_phone(match.group(), default_country_code)
+        if phone and phone not in found:
+            found.append(phone)
+    return found
+
+
+def _unquoted(body):
+    """The reply itself: cut at the quoted email it answers (our outreach & its signature), no '>' quoted lines"""
+    body = (body or '').replace('\r\n', '\n')
+    quote = QUOTE_START_RE.search(body)
+    if quote:
+        body = body[:quote.start()]
+    return "\n".join(line for line in body.splitlines() if not line.lstrip().startswith('>'))
+
+
+def classify_reply(subject, body, default_country_code=DEFAULT_COUNTRY_CODE):
+    """
+    Confident (tag, phone number) for a reply, like emailEngine._process_ifc returns, or None to ask the LLM:
+        one phone number, no decline & no negation      -> ('<init-call>', '+91...')
+        clear decline, no phone number & no question    -> ('<follow-up-cancel>', None)
+        clear accept, no phone number & no question     -> ('<follow-up-reply>', None)  (ask them for their number)
+    Anything mixed (several numbers, accept & decline, a question) is left to the LLM.
+    """
+    reply_text = _unquoted(body)
+    phones = extract_phone_numbers(reply_text, default_country_code)
+    declines = bool(_DECLINE_RE.search(reply_text) or _DECLINE_RE.search(subject or ''))
+    accepts = bool(_ACCEPT_RE.search(reply_text))
+    question = bool(_QUESTION_RE.search(reply_text))
+
+    if len(phones) == 1 and not declines and not _NEGATION_RE.search(reply_text):
+        return '<init-call>', phones[0]
+    if phones:
+        return None  # several numbers, or a number alongside a decline / negation
+    if declines and not accepts and not question:
+        return '<follow-up-cancel>', None
+    if accepts and not declines and not question:
+        return '<follow-up-reply>', None
+    return None
@@ -0,0 +1,97 @@
+"""
+MatchBoxAIEngine.Outreach.replyIndex:
+Index of outstanding emails by Message-ID (incl. follow-ups), normalized subject & recipient, so each inbound message
+is matched to its pending email in O(1) however many emails are outstanding.
+
+Developed and maintained by Aditya Gaur / @xdityagr at Github / adityagaur.home@gmail.com
+© 2025 MatchBox AI. All rights reserved.
+"""
+
+import re
+import threading
+
+REPLY_PREFIX_RE = re.compile(r"^\s*(re|fwd?|aw|follow-up)\s*:\s*", re.IGNORECASE)
+
+# Candidate kinds, in the order they are returned
+BY_MESSAGE_ID, BY_SUBJECT, BY_SENDER = 'message-id', 'subject', 'sender'
+
+
+def normalize_subject(subject):
+    """'RE: Fwd: Follow-up:  Collab  with X' -> 'collab with x'"""
+    subject = subject or ''
+    while True:
+        stripped = REPLY_PREFIX_RE.sub('', subject, count=1)
+        if stripped == subject:
+            break
+        subject = stripped
+    return ' '.join(subject.lower().split())
+
+
+def message_ids(header_value):
+    return re.findall(r"<[^<>\s]+>", header_value or '')
+
+
+class ReplyIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_message_id = {}  # Message-ID -> email_key
+        self._by_subject = {}     # (recipient, normalized subject) -> {email_key}
+        self._by_sender = {}      # recipient -> {email_key}
+        self._entries = {}        # email_key -> (recipient, normalized subject, [Message-IDs])
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, email_key, to_email, subject, message_id=None):
+        sender = to_email.lower()
+        subject_key = (sender, normalize_subject(subject))
+        with self._lock:
+            self._entries[email_key] = (sender, subject_key[1], [])
+            self._by_subject.setdefault(subject_key, set()).add(email_key)
+            self._by_sender.setdefault(sender, set()).add(email_key)
+        if message_id:
+            self.add_message_id(email_key, message_id)
+
+    def add_message_id(self, email_key, message_id):
+        """Also route replies to `message_id` (e.g. a follow-up) to this email, earlier IDs keep matching."""
+        with self._lock:
+            if email_key in self._entries:
+                self._entries[email_key][2].append(message_id)
+                self._by_message_id[message_id] = email_key
+
+    def remove(self, email_key):
+        with self._lock:
+            entry = self._entries.pop(email_key, None)
+            if entry is None:
+                return
+            sender, subject, ids = entry
+            for message_id in ids:
+                self._by_message_id.pop(message_id, None)
+            for index, key in ((self._by_subject, (sender, subject)), (self._by_sender, sender)):
+                keys = index.get(key)
+                if keys is not None:
+                    keys.discard(email_key)
+                    if not keys:
+                        del index[key]
+
+    def candidates(self, sender, subject, in_reply_to='', references=''):
+        """
+        Pending emails an inbound message may answer, as [(email_key, kind)]: threaded on one of our Message-IDs
+        first, then the sender's emails with the same normalized subject, then the sender's other emails (for the
+        looser subject check done by the caller).
+        """
+        sender = (sender or '').lower()
+        found, seen = [], set()
+        with self._lock:
+            for message_id in message_ids(in_reply_to) + message_ids(references):
+                email_key = self._by_message_id.get(message_id)
+                if email_key is not None and email_key not in seen:
+                    seen.add(email_key)
+                    found.append((email_key, BY_MESSAGE_ID))
+            for kind, keys in ((BY_SUBJECT, self._by_subject.get((sender, normalize_subject(subject)), ())),
+                               (BY_SENDER, self._by_sender.get(sender, ()))):
+                for email_key in keys:
+                    if email_key not in seen:
+                        seen.add(email_key)
+                        found.append((email_key, kind))
+        return found
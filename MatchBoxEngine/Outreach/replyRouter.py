@@ -0,0 +1,53 @@
+"""
+MatchBoxAIEngine.Outreach.replyRouter:
+Reply handlers per route (campaign), so replies go to the campaign that sent the original email rather than to
+whichever campaign registered a callback last. A route's handler is dropped once none of its emails are pending.
+
+Developed and maintained by Aditya Gaur / @xdityagr at Github / adityagaur.home@gmail.com
+© 2025 MatchBox AI. All rights reserved.
+"""
+
+import threading
+from collections import Counter
+
+
+class ReplyRouter:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._handlers = {}       # route -> callback
+        self._pending = Counter() # route -> emails awaiting a reply / follow-up
+
+    def __len__(self):
+        return len(self._handlers)
+
+    def register(self, route, callback):
+        with self._lock:
+            self._handlers[route] = callback
+
+    def unregister(self, route):
+        with self._lock:
+            self._handlers.pop(route, None)
+
+    def get(self, route):
+        with self._lock:
+            return self._handlers.get(route)
+
+    def hold(self, route):
+        """An email of `route` is now pending"""
+        if route is not None:
+            with self._lock:
+                self._pending[route] += 1
+
+    def release(self, route):
+        """An email of `route` is no longer pending, the handler goes with the route's last one"""
+        if route is None:
+            return
+        with self._lock:
+            self._pending[route] -= 1
+            if self._pending[route] <= 0:
+                del self._pending[route]
+                self._handlers.pop(route, None)
+
+    def pending(self, route):
+        with self._lock:
+            return self._pending.get(route, 0)
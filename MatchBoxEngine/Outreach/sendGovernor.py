@@ -0,0 +1,188 @@
+"""
+MatchBoxAIEngine.Outreach.sendGovernor:
+Outbound email throughput governor: per-account token bucket rate & daily quota (part of it kept for follow-ups,
+counted atomically in the shared store so several workers can't overspend it), sends granted in priority order, and backpressure status (queue depth, projected drain time).
+
+Developed and maintained by Aditya Gaur / @xdityagr at Github / adityagaur.home@gmail.com
+© 2025 MatchBox AI. All rights reserved.
+"""
+
+import os
+import time
+import heapq
+import datetime
+import itertools
+import threading
+from collections import Counter
+
+# Lower goes first
+PRIORITY_FOLLOWUP, PRIORITY_FIRST_TOUCH = 0, 1
+
+SEND_RATE_PER_MINUTE = float(os.getenv("EMAIL_SEND_RATE_PER_MINUTE", 20))
+DAILY_SEND_QUOTA = int(os.getenv("EMAIL_DAILY_QUOTA", 500))  # Gmail accounts: 500 / day (Workspace: 2000)
+
+
+class QuotaExceeded(Exception):
+    def __init__(self, resets_at):
+        super().__init__(f"Daily sending quota reached, resets at {datetime.datetime.fromtimestamp(resets_at, datetime.timezone.utc):%Y-%m-%d %H:%M} UTC")
+        self.resets_at = resets_at
+
+
+class SendGovernor:
+    def __init__(self, quota_store=None, rate_per_minute=None, daily_quota=None, burst=5, first_touch_reserve=0.2,
+                 max_drain_seconds=900):
+        """
+        Args:
+            quota_store: Optional SendQuota, today's count survives restarts & is shared by every process using it
+            rate_per_minute: Sustained sends per minute (default: EMAIL_SEND_RATE_PER_MINUTE)
+            daily_quota: Sends per UTC day (default: EMAIL_DAILY_QUOTA)
+            burst: Sends allowed back to back after an idle period
+            first_touch_reserve: Share of the daily quota only follow-ups may use
+            max_drain_seconds: Queue drain time above which backpressure is signalled
+        """
+        self.rate = (rate_per_minute or SEND_RATE_PER_MINUTE) / 60  # per second
+        self.daily_quota = daily_quota or DAILY_SEND_QUOTA
+        self.burst = burst
+        self.reserved = int(self.daily_quota * first_touch_reserve)
+        self.max_drain_seconds = max_drain_seconds
+        self.quota_store = quota_store
+        self._cond = threading.Condition()
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self._waiting = []  # heap of (priority, seq), the head is granted the next token
+        self._seq = itertools.count()
+        self._backlog = 0   # Sends handed over (e.g. a batch) that haven't asked for a slot yet
+        self._day = None
+        self._sent_today = 0
+        self._stats = Counter()
+
+    @staticmethod
+    def _today():
+        return datetime.datetime.now(datetime.timezone.utc).strftime('%Y-%m-%d')
+
+    def _roll_day(self):
+        # With a store, other workers' sends count too: re-read it rather than trusting this process's count.
+        day = self._today()
+        if day != self._day or self.quota_store:
+            self._day = day
+            self._sent_today = self.quota_store.used(day) if self.quota_store else 0
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    def _quota_limit(self, priority):
+        return self.daily_quota - self.reserved if priority == PRIORITY_FIRST_TOUCH else self.daily_quota
+
+    def _quota_left(self, priority):
+        return self._quota_limit(priority) - self._sent_today
+
+    def _take_quota(self, priority):
+        """Count one send against today's quota, False if the priority's share is used up (by any process)."""
+        if not self.quota_store:
+            if self._quota_left(priority) <= 0:
+                return False
+            self._sent_today += 1
+            return True
+        sent = self.quota_store.try_add(self._day, self._quota_limit(priority))
+        self._sent_today = sent if sent is not None else self.quota_store.used(self._day)
+        return sent is not None
+
+    @staticmethod
+    def quota_resets_at():
+        """Epoch seconds of the next UTC midnight"""
+        now = datetime.datetime.now(datetime.timezone.utc)
+        return (now.replace(hour=0, minute=0, second=0, microsecond=0) + datetime.timedelta(days=1)).timestamp()
+
+    def quota_exhausted(self, priority=PRIORITY_FIRST_TOUCH):
+        with self._cond:
+            self._roll_day()
+            return self._quota_left(priority) <= 0
+
+    def add_backlog(self, count):
+        """Count `count` upcoming sends in the queue depth until they call acquire(from_backlog=True)"""
+        with self._cond:
+            self._backlog += count
+
+    def acquire(self, priority=PRIORITY_FIRST_TOUCH, from_backlog=False, timeout=None):
+        """
+        Wait for a send slot, granted at the configured rate & in priority order (FIFO within a priority).
+        Raises QuotaExceeded once the priority's share of today's quota is used up, TimeoutError if no slot came
+        within `timeout` seconds.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            if from_backlog:
+                self._backlog = max(0, self._backlog - 1)
+            ticket = (priority, next(self._seq))
+            heapq.heappush(self._waiting, ticket)
+            waited = False
+            try:
+                while True:
+                    self._roll_day()
+                    if self._quota_left(priority) <= 0:
+                        self._stats['quota_rejections'] += 1
+                        raise QuotaExceeded(self.quota_resets_at())
+                    self._refill()
+                    at_head = self._waiting[0] == ticket
+                    if at_head and self._tokens >= 1:
+                        if not self._take_quota(priority):
+                            self._stats['quota_rejections'] += 1
+                            raise QuotaExceeded(self.quota_resets_at())
+                        self._tokens -= 1
+                        self._stats['granted'] += 1
+                        return
+                    wait = (1 - self._tokens) / self.rate if at_head else None
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self._stats['timeouts'] += 1
+                            raise TimeoutError("No send slot free in time")
+                        wait = remaining if wait is None else min(wait, remaining)
+                    if not waited:
+                        waited = True
+                        self._stats['throttled'] += 1
+                    self._cond.wait(wait)
+            finally:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._cond.notify_all()
+
+    def status(self, extra_queued=0):
+        """
+        Backpressure signals for discovery & outreach:
+            queue_depth: Sends waiting (plus `extra_queued`, e.g. an upstream send queue)
+            projected_drain_seconds: Time to send them at the configured rate, None if today's quota can't cover them
+            first_touch_remaining: New outreach emails that can still go out today
+            backpressure: True when the queue won't drain within max_drain_seconds or the quota is nearly used up
+        """
+        with self._cond:
+            self._roll_day()
+            self._refill()
+            depth = self._backlog + len(self._waiting) + extra_queued
+            remaining = max(0, self.daily_quota - self._sent_today)
+            first_touch_remaining = max(0, remaining - self.reserved)
+            tokens = self._tokens
+            stats = dict(self._stats)
+        drain = max(0.0, (depth - tokens) / self.rate) if depth <= remaining else None
+        return {
+            'queue_depth': depth,
+            'projected_drain_seconds': round(drain, 1) if drain is not None else None,
+            'rate_per_minute': round(self.rate * 60, 2),
+            'sent_today': self.daily_quota - remaining,
+            'daily_quota': self.daily_quota,
+            'remaining_today': remaining,
+            'first_touch_remaining': first_touch_remaining,
+            'backpressure': drain is None or drain > self.max_drain_seconds or first_touch_remaining <= depth,
+            'granted': stats.get('granted', 0),
+            'throttled': stats.get('throttled', 0),
+            'quota_rejections': stats.get('quota_rejections', 0),
+        }
+
+    def format_status(self, extra_queued=0):
+        s = self.status(extra_queued)
+        drain = f"{s['projected_drain_seconds']}s" if s['projected_drain_seconds'] is not None else "beyond today's quota"
+        return (f"[send] queued={s['queue_depth']} drain={drain} rate={s['rate_per_minute']}/min "
+                f"today={s['sent_today']}/{s['daily_quota']} first_touch_left={s['first_touch_remaining']} "
+                f"backpressure={s['backpressure']}")
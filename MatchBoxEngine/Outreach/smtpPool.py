@@ -0,0 +1,158 @@
+"""
+MatchBoxAIEngine.Outreach.smtpPool:
+Small pool of authenticated SMTP connections, health-checked with NOOP & reconnected on failure, with send stats.
+
+Developed and maintained by Aditya Gaur / @xdityagr at Github / adityagaur.home@gmail.com
+© 2025 MatchBox AI. All rights reserved.
+"""
+
+import time
+import queue
+import smtplib
+import threading
+import logging
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+def is_connection_error(e):
+    """Errors after which a connection is dropped & the send retried once on a fresh one (not refusals like a bad recipient)."""
+    if isinstance(e, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)):
+        return True
+    if isinstance(e, smtplib.SMTPResponseException):
+        return e.smtp_code == 421  # service closing the channel
+    # SMTPException subclasses OSError, anything else here is a socket-level failure
+    return isinstance(e, OSError) and not isinstance(e, smtplib.SMTPException)
+
+
+class SMTPPool:
+    def __init__(self, connect, size=3, health_check_after=30, acquire_timeout=60):
+        """
+        Args:
+            connect: f() -> authenticated smtplib.SMTP connection
+            size: Max open connections (Gmail allows ~15 per account, keep it small)
+            health_check_after: Idle seconds after which a pooled connection is NOOP-checked before reuse
+            acquire_timeout: Seconds to wait for a free connection
+        """
+        self.connect = connect
+        self.size = size
+        self.health_check_after = health_check_after
+        self.acquire_timeout = acquire_timeout
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._stats_lock = threading.Lock()
+        self._stats = {'sends': 0, 'failures': 0, 'send_seconds': 0.0, 'connects': 0, 'connect_seconds': 0.0,
+                       'reconnects': 0, 'health_checks': 0}
+
+    def _count(self, **deltas):
+        with self._stats_lock:
+            for key, value in deltas.items():
+                self._stats[key] += value
+
+    def _open(self):
+        t0 = time.perf_counter()
+        conn = self.connect()
+        self._count(connects=1, connect_seconds=time.perf_counter() - t0)
+        return conn
+
+    @staticmethod
+    def _discard(conn):
+        try:
+            conn.quit()
+        except Exception:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def _healthy(self, conn):
+        self._count(health_checks=1)
+        try:
+            return conn.noop()[0] == 250
+        except Exception:
+            return False
+
+    @contextmanager
+    def connection(self):
+        """Borrow a live connection, it goes back to the pool unless the block raised a connection error."""
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            raise TimeoutError("No SMTP connection free in the pool")
+        conn = None
+        try:
+            try:
+                conn, last_used = self._idle.get_nowait()
+                if time.monotonic() - last_used > self.health_check_after and not self._healthy(conn):
+                    self._discard(conn)
+                    conn = None  # if reopening fails, the dead connection must not go back to the pool
+                    self._count(reconnects=1)
+                    conn = self._open()
+            except queue.Empty:
+                conn = self._open()
+            yield conn
+        except Exception as e:
+            if conn is not None and is_connection_error(e):
+                self._discard(conn)
+                conn = None
+            raise
+        finally:
+            if conn is not None:
+                self._idle.put((conn, time.monotonic()))
+            self._slots.release()
+
+    def send(self, from_addr, to_addr, text):
+        """Send one message, retried once on a fresh connection if the pooled one turned out to be dead."""
+        for attempt in range(2):
+            t0 = time.perf_counter()
+            try:
+                with self.connection() as conn:
+                    conn.sendmail(from_addr, to_addr, text)
+                self._count(sends=1, send_seconds=time.perf_counter() - t0)
+                return
+            except Exception as e:
+                if attempt or not is_connection_error(e):
+                    self._count(failures=1)
+                    raise
+                logger.warning(f"SMTP connection dropped ({e}), reconnecting")
+                self._count(reconnects=1)
+
+    def send_batch(self, messages, before_send=None):
+        """
+        Send [(from_addr, to_addr, text)] over the pool's connections in parallel.
+        `before_send()` is called before each message (e.g. to wait for a rate limit slot), raising fails that message.
+        Returns one exception or None per message, in order.
+        """
+        def send_one(message):
+            try:
+                if before_send is not None:
+                    before_send()
+                self.send(*message)
+                return None
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            return list(executor.map(send_one, messages))
+
+    def stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        # Per busy connection, batches run `size` connections in parallel
+        stats['sends_per_sec'] = round(stats['sends'] / stats['send_seconds'], 2) if stats['send_seconds'] else None
+        stats['avg_connect_ms'] = round(stats['connect_seconds'] / stats['connects'] * 1000, 1) if stats['connects'] else None
+        return stats
+
+    def format_stats(self):
+        s = self.stats()
+        return (f"[smtp] sends={s['sends']} failures={s['failures']} sends/sec/conn={s['sends_per_sec']} "
+                f"connects={s['connects']} setup={s['connect_seconds']:.2f}s (avg {s['avg_connect_ms']}ms) "
+                f"reconnects={s['reconnects']} health_checks={s['health_checks']}")
+
+    def close(self):
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._discard(conn)
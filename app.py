@@ -20,7 +20,10 @@ from fastapi import FastAPI, Request, Query
 from fastapi.responses import PlainTextResponse
 import uvicorn
 from dotenv import load_dotenv
+from contextlib import asynccontextmanager
+import asyncio
 import os
+from concurrent.futures import ThreadPoolExecutor
 import json
 import requests
 from MatchBoxEngine.Model import ModelHandler
@@ -28,13 +31,28 @@ import time
 
 from MatchBoxEngine.Query.parser import *
 from MatchBoxEngine.Discovery import Engine
-from MatchBoxEngine.Outreach import emailEngine
+from MatchBoxEngine.Discovery.adapters import close_shared_adapters
+from MatchBoxEngine.Outreach import emailEngine, asyncEmailEngine
 from MatchBoxEngine.Outreach.callingEngine import VapiClient
 
 
 load_dotenv(override=True) 
 
-app = FastAPI()
+# Campaign searches block on queued email sends, so they get their own threads, never the email engine's
+search_executor = ThreadPoolExecutor(max_workers=int(os.getenv("SEARCH_WORKERS", 4)), thread_name_prefix="CampaignSearch")
+
+@asynccontextmanager
+async def lifespan(app):
+    # Email sends, reply monitoring & follow-ups run as tasks in the app's event loop. Replies to emails whose
+    # campaign isn't running any more (e.g. sent before a restart) go to a default engine, which acts on the brief &
+    # creator persisted with the email.
+    await asyncEmailEngine.start_email_engine(reply_callback=Engine().mail_callback)
+    yield
+    await asyncEmailEngine.stop_email_engine()
+    search_executor.shutdown(wait=False)
+    close_shared_adapters()
+
+app = FastAPI(lifespan=lifespan)
 
 VERIFY_TOKEN = os.getenv("WEBHOOK_TOKEN")
 ACCESS_TOKEN = os.getenv("GRAPH_ACCESS_TOKEN")
@@ -153,8 +171,6 @@ Once a mode is selected:
 """
 
 
-emailEngine.start_email_engine()
-
     # email_system.send_with_followup(
     #     to_email='adityagaur.home@gmail.com', # Replace with a test email you can reply from
     #     subject='Important Meeting Request - Test',
@@ -397,7 +413,9 @@ async def whatsapp_webhook(request: Request,
 
                         print(f'Campaign Info Extracted : {campaign_info}')
                         send_reply_text(from_number, f"""Thanks for the brief, {reciever_name}! ✨ The campaign has been created.\nI will get started with discovering the creators for you!\nI'll keep you updated on our progress every step of the way! 🚀""")
-                        init_search(campaign_info, (send_reply_text, send_image), from_number)
+                        # Blocking search & outreach, off the event loop (its emails are queued back onto it)
+                        await asyncio.get_running_loop().run_in_executor(search_executor, init_search, campaign_info,
+                                                                         (send_reply_text, send_image), from_number)
                 else:
                     print(response)
                     send_reply_text(from_number, response)
@@ -0,0 +1,158 @@
+"""
+MatchBoxAIEngine benchmarks - Email monitor:
+Seeds the email engine with pending emails and a local IMAP server (benchmarks/mailServers.py) with unrelated mail
+plus synthetic replies (threaded on our Message-ID, or carrying only 'Re: <subject>'), then measures per pending
+volume:
+
+    sync      the first reply check over the whole inbox
+    cycle     a reply check picking up --replies new replies (empty: no new mail)
+    detect    time from a reply landing in the inbox to its reply callback, with the monitor running (IDLE or polling),
+              on --samples extra pending emails kept aside for it
+
+Wall time, CPU time of the checking thread and IMAP commands are reported per cycle. No real mailbox is touched.
+
+Usage:
+    python benchmarks/email_monitor.py [--pending 100,1000,5000] [--noise 2000] [--replies 20] [--samples 20] [--no-idle]
+
+Developed and maintained by Aditya Gaur / @xdityagr at Github / adityagaur.home@gmail.com
+© 2025 MatchBox AI. All rights reserved.
+"""
+
+import os
+import sys
+import time
+import random
+import logging
+import tempfile
+import argparse
+import threading
+from email.utils import make_msgid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark-placeholder")  # ModelHandler refuses to start without one, no LLM call is made
+
+from benchmarks.mailServers import SMTPSink, IMAPServer, make_reply
+
+ACCOUNT = 'outreach@matchbox.local'
+DETECTION_PREFIX = 'detect'
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q / 100 * (len(values) - 1))))]
+
+
+def measure(imap, fn):
+    """Wall ms, CPU ms of this thread & IMAP commands issued while running fn()"""
+    before = sum(imap.commands.values())
+    t0, c0 = time.perf_counter(), time.thread_time()
+    fn()
+    return {'ms': (time.perf_counter() - t0) * 1000, 'cpu_ms': (time.thread_time() - c0) * 1000,
+            'commands': sum(imap.commands.values()) - before}
+
+
+def seed_replies(imap, system, rng, count, detection=False):
+    """
+    Replies from `count` random pending recipients, alternately threaded & subject-only. The emails kept for the
+    detection stage (`detection=True`) are never picked by the measured cycles, so they can't all be answered first.
+    """
+    pending = [info for info in system.pending_emails.values()
+               if info['to_email'].startswith(DETECTION_PREFIX) == detection]
+    for i, info in enumerate(rng.sample(pending, min(count, len(pending)))):
+        imap.mailbox.append(make_reply(info['to_email'], info['subject'], to_email=ACCOUNT,
+                                       in_reply_to=info['original_message_id'] if i % 2 == 0 else None))
+
+
+def run_volume(args, pending_count, workdir):
+    from MatchBoxEngine import Database
+    from MatchBoxEngine.Outreach.emailEngine import EmailFollowUpSystem
+
+    Database.DB_PATH = os.path.join(workdir, f'monitor_{pending_count}.db')
+    rng = random.Random(args.seed)
+    capabilities = 'IMAP4rev1' if args.no_idle else 'IMAP4rev1 IDLE'
+    with SMTPSink() as smtp, IMAPServer(capabilities) as imap:
+        system = EmailFollowUpSystem('127.0.0.1', smtp.port, '127.0.0.1', imap.port, ACCOUNT, 'benchmark',
+                                     check_interval=args.poll_interval, imap_ssl=False, smtp_starttls=False,
+                                     send_rate_per_minute=10 ** 6)
+        t0 = time.perf_counter()
+        for i in range(pending_count):
+            system._track_sent(f'creator{i}@example.com', f'Collab {i} with MatchBox', 'Hi!',
+                               make_msgid(domain='matchbox.local'), timeout_hours=24)
+        seed_seconds = time.perf_counter() - t0
+        for i in range(args.samples):
+            system._track_sent(f'{DETECTION_PREFIX}{i}@example.com', f'Detection {i} with MatchBox', 'Hi!',
+                               make_msgid(domain='matchbox.local'), timeout_hours=24)
+        for i in range(args.noise):
+            imap.mailbox.append(make_reply(f'newsletter{i % 50}@news.example', f'Weekly digest #{i}', to_email=ACCOUNT))
+
+        result = {'pending': pending_count, 'seed_s': seed_seconds}
+        system.register_reply_callback(lambda *reply: None)  # matched replies are only counted here
+        result['sync'] = measure(imap, system._check_replies)
+        result['empty'] = measure(imap, system._check_replies)
+
+        cycles = []
+        for _ in range(args.cycles):
+            before = len(system.pending_emails)
+            seed_replies(imap, system, rng, args.replies)
+            cycle = measure(imap, system._check_replies)
+            cycle['matched'] = before - len(system.pending_emails)
+            cycles.append(cycle)
+        result['cycle'] = {key: sum(c[key] for c in cycles) / len(cycles) for key in cycles[0]}
+
+        # Detection latency with the monitor running
+        detected = threading.Event()
+        system.register_reply_callback(lambda *reply: detected.set())
+        system.start_monitoring()
+        time.sleep(0.5)  # let the watcher settle into IDLE / its first poll
+        latencies = []
+        for _ in range(args.samples):
+            detected.clear()
+            seed_replies(imap, system, rng, 1, detection=True)
+            t0 = time.perf_counter()
+            if detected.wait(timeout=args.poll_interval * 3 + 10):
+                latencies.append((time.perf_counter() - t0) * 1000)
+        result['detect'] = latencies
+        result['mode'] = system.watcher.mode
+        system.stop_monitoring()
+    return result
+
+
+def run(args):
+    from MatchBoxEngine.Outreach import emailEngine  # configures logging on import
+    if args.quiet:
+        logging.getLogger().setLevel(logging.WARNING)
+    workdir = tempfile.mkdtemp(prefix='matchbox_bench_')
+
+    results = [run_volume(args, count, workdir) for count in args.pending]
+
+    print(f"Email monitor: {args.noise} unrelated messages, {args.replies} replies per cycle, "
+          f"{args.cycles} cycles, {args.samples} detection samples\n")
+    print(f"{'pending':>8} {'seed s':>7} | {'sync ms':>8} {'cpu':>7} {'cmds':>5} | {'empty ms':>8} {'cmds':>5} | "
+          f"{'cycle ms':>8} {'cpu':>7} {'cmds':>5} {'matched':>7} | {'detect p50':>10} {'p95':>7} {'max':>7} mode")
+    for r in results:
+        s, e, c, d = r['sync'], r['empty'], r['cycle'], r['detect']
+        print(f"{r['pending']:>8} {r['seed_s']:>7.2f} | {s['ms']:>8.1f} {s['cpu_ms']:>7.1f} {s['commands']:>5} | "
+              f"{e['ms']:>8.1f} {e['commands']:>5} | {c['ms']:>8.1f} {c['cpu_ms']:>7.1f} {c['commands']:>5.1f} "
+              f"{c['matched']:>7.1f} | {percentile(d, 50):>10.1f} {percentile(d, 95):>7.1f} "
+              f"{max(d) if d else float('nan'):>7.1f} {r['mode']} ({len(d)}/{args.samples} detected)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--pending', type=lambda v: [int(x) for x in v.split(',')], default=[100, 1000, 5000],
+                        help='comma separated pending email volumes')
+    parser.add_argument('--noise', type=int, default=2000, help='unrelated messages already in the inbox')
+    parser.add_argument('--replies', type=int, default=20, help='new replies per measured cycle')
+    parser.add_argument('--cycles', type=int, default=5)
+    parser.add_argument('--samples', type=int, default=20, help='replies timed for detection latency')
+    parser.add_argument('--no-idle', action='store_true', help="don't advertise IDLE, the watcher falls back to polling")
+    parser.add_argument('--poll-interval', type=float, default=1.0, help='seconds between polls without IDLE')
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--verbose', dest='quiet', action='store_false', help="show the engine's own logging")
+    run(parser.parse_args())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,387 @@
+"""
+MatchBoxAIEngine benchmarks - Local mail servers:
+In-process stand-ins for the SMTP & IMAP servers the email engine talks to, so sending, reply detection & follow-ups
+can be exercised and profiled without a real mailbox.
+
+    SMTPSink   accepts (and records) everything, optional per-command delay, recipients matching `reject` get a 550
+    IMAPServer one INBOX holding appended messages. Speaks the subset of IMAP4rev1 the engine uses: LOGIN, SELECT /
+               EXAMINE, STATUS, NOOP, IDLE, (UID) SEARCH with ALL / UID / SINCE / FROM / SUBJECT / HEADER / OR / NOT,
+               (UID) FETCH of BODY[HEADER.FIELDS (..)], BODY[] / RFC822 & INTERNALDATE, CLOSE, LOGOUT.
+               Every command is counted in `commands`.
+
+Both run plain TCP on 127.0.0.1 (connect with imap_ssl=False, smtp_starttls=False) & are context managers.
+
+Developed and maintained by Aditya Gaur / @xdityagr at Github / adityagaur.home@gmail.com
+© 2025 MatchBox AI. All rights reserved.
+"""
+
+import re
+import time
+import email
+import socket
+import datetime
+import threading
+import socketserver
+from functools import lru_cache
+from collections import Counter
+from email.utils import format_datetime
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, handler):
+        super().__init__(('127.0.0.1', 0), handler)
+
+    def get_request(self):
+        conn, address = super().get_request()
+        # Responses go out in several writes, don't let Nagle + delayed ACKs add ~40ms per command
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return conn, address
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write((line + '\r\n').encode())
+        self.wfile.flush()
+
+    def handle(self):
+        sink = self.server
+        self.reply('220 matchbox smtp sink')
+        sink.stats['connections'] += 1
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            line = line.decode(errors='replace').strip()
+            cmd = line.split(' ', 1)[0].upper()
+            sink.stats[cmd] += 1
+            if sink.delay:
+                time.sleep(sink.delay)
+            if cmd in ('EHLO', 'HELO'):
+                self.reply('250-matchbox\r\n250 AUTH PLAIN LOGIN')
+            elif cmd == 'AUTH':
+                self.reply('235 authenticated')
+            elif cmd == 'RCPT' and any(pattern in line for pattern in sink.reject):
+                self.reply('550 no such user')
+            elif cmd == 'DATA':
+                self.reply('354 end with .')
+                data = []
+                while True:
+                    chunk = self.rfile.readline()
+                    if chunk in (b'.\r\n', b''):
+                        break
+                    data.append(chunk)
+                with sink.lock:
+                    sink.messages.append(b''.join(data))
+                self.reply('250 queued')
+            elif cmd == 'QUIT':
+                self.reply('221 bye')
+                return
+            else:
+                self.reply('250 ok')
+
+
+class SMTPSink(_Server):
+    def __init__(self, delay=0.0, reject=('bad@',)):
+        """
+        Args:
+            delay: Seconds slept per command, a stand-in for network round trips
+            reject: Substrings of RCPT lines answered with a 550
+        """
+        super().__init__(_SMTPHandler)
+        self.delay = delay
+        self.reject = reject
+        self.lock = threading.Lock()
+        self.messages = []
+        self.stats = Counter()
+
+
+def _tokenize(text):
+    """IMAP search keys: atoms, quoted strings (as ('q', value)) & parentheses."""
+    tokens, i = [], 0
+    while i < len(text):
+        c = text[i]
+        if c.isspace():
+            i += 1
+        elif c in '()':
+            tokens.append(c)
+            i += 1
+        elif c == '"':
+            j, value = i + 1, ''
+            while text[j] != '"':
+                if text[j] == '\\':
+                    j += 1
+                value += text[j]
+                j += 1
+            tokens.append(('q', value))
+            i = j + 1
+        else:
+            j = i
+            while j < len(text) and not text[j].isspace() and text[j] not in '()':
+                if text[j] == '[':
+                    j = text.index(']', j)
+                j += 1
+            tokens.append(text[i:j])
+            i = j
+    return tokens
+
+
+class SequenceSet:
+    """An IMAP sequence set like '1,4:7,9:*', parsed once per command"""
+
+    def __init__(self, spec, largest):
+        self.numbers, self.ranges = set(), []
+        for part in spec.split(','):
+            bounds = [largest if b == '*' else int(b) for b in part.split(':')]
+            low, high = min(bounds), max(bounds)
+            if high - low < 64:
+                self.numbers.update(range(low, high + 1))
+            else:
+                self.ranges.append((low, high))
+
+    def __contains__(self, number):
+        return number in self.numbers or any(low <= number <= high for low, high in self.ranges)
+
+
+@lru_cache(maxsize=64)
+def _search_date(value):
+    return datetime.datetime.strptime(value, '%d-%b-%Y').date()
+
+
+class Message:
+    __slots__ = ('uid', 'raw', 'internal_date', 'parsed')
+
+    def __init__(self, uid, raw, internal_date):
+        self.uid = uid
+        self.raw = raw
+        self.internal_date = internal_date
+        self.parsed = email.message_from_bytes(raw)
+
+
+class Mailbox:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.messages = []
+        self.next_uid = 1
+        self.uidvalidity = int(time.time())
+        self.idlers = set()
+
+    def append(self, raw, internal_date=None):
+        """Deliver a message (bytes or str), IDLE-ing sessions are told right away. Returns its UID."""
+        if isinstance(raw, str):
+            raw = raw.encode()
+        with self.lock:
+            message = Message(self.next_uid, raw, internal_date or datetime.datetime.now(datetime.timezone.utc))
+            self.messages.append(message)
+            self.next_uid += 1
+            exists, idlers = len(self.messages), list(self.idlers)
+        for notify in idlers:
+            try:
+                notify(f'* {exists} EXISTS\r\n'.encode())
+            except OSError:
+                pass
+        return message.uid
+
+    def snapshot(self):
+        with self.lock:
+            return list(self.messages)
+
+
+class _SearchEvaluator:
+    """Evaluates a tokenized SEARCH program against one message."""
+    N_ARGS = {'FROM': 1, 'SUBJECT': 1, 'SINCE': 1, 'UID': 1, 'HEADER': 2}
+
+    def __init__(self, message, seq, largest_uid, count):
+        self.message, self.seq, self.largest_uid, self.count = message, seq, largest_uid, count
+
+    def take(self, it):
+        """Tokens of the next complete search key."""
+        token = next(it)
+        if token == '(':
+            group, depth = [], 1
+            for t in it:
+                depth += (t == '(') - (t == ')')
+                if depth == 0:
+                    break
+                group.append(t)
+            return ['('] + group + [')']
+        name = token.upper() if isinstance(token, str) else token
+        if name == 'OR':
+            return [token] + self.take(it) + self.take(it)
+        if name == 'NOT':
+            return [token] + self.take(it)
+        return [token] + [next(it) for _ in range(self.N_ARGS.get(name, 0))]
+
+    def matches(self, tokens):
+        it = iter(tokens)
+        while True:
+            try:
+                key = self.take(it)
+            except StopIteration:
+                return True
+            if not self.key(key):
+                return False
+
+    def key(self, key):
+        value = lambda i: key[i][1] if isinstance(key[i], tuple) else key[i]
+        head = key[0].upper() if isinstance(key[0], str) else key[0]
+        parsed = self.message.parsed
+        if head == '(':
+            return self.matches(key[1:-1])
+        if head == 'ALL':
+            return True
+        if head == 'OR':
+            rest = iter(key[1:])
+            first, second = self.take(rest), self.take(rest)
+            return self.matches(first) or self.matches(second)
+        if head == 'NOT':
+            return not self.matches(key[1:])
+        if head == 'FROM':
+            return value(1).lower() in (parsed.get('From') or '').lower()
+        if head == 'SUBJECT':
+            return value(1).lower() in (parsed.get('Subject') or '').lower()
+        if head == 'HEADER':
+            header = parsed.get(value(1))
+            return header is not None and value(2).lower() in header.lower()
+        if head == 'SINCE':
+            return self.message.internal_date.date() >= _search_date(value(1))
+        if head == 'UID':
+            return self.message.uid in SequenceSet(value(1), self.largest_uid)
+        if isinstance(head, str) and re.fullmatch(r'[\d:*,]+', head):
+            return self.seq in SequenceSet(head, self.count)
+        raise ValueError(f"unsupported search key {head}")
+
+
+class _IMAPHandler(socketserver.StreamRequestHandler):
+    def send(self, data):
+        with self.write_lock:
+            self.wfile.write(data if isinstance(data, bytes) else data.encode())
+            self.wfile.flush()
+
+    def handle(self):
+        self.write_lock = threading.Lock()
+        self.send('* OK matchbox imap ready\r\n')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            tag, _, rest = line.decode(errors='replace').rstrip('\r\n').partition(' ')
+            cmd, _, args = rest.partition(' ')
+            cmd, use_uid = cmd.upper(), False
+            if cmd == 'UID':
+                use_uid = True
+                cmd, _, args = args.partition(' ')
+                cmd = cmd.upper()
+            self.server.commands[('UID ' if use_uid else '') + cmd] += 1
+            try:
+                if self.dispatch(tag, cmd, args, use_uid) == 'BYE':
+                    return
+            except Exception as e:
+                self.send(f'{tag} BAD {e}\r\n')
+
+    def dispatch(self, tag, cmd, args, use_uid):
+        server, mailbox = self.server, self.server.mailbox
+        if cmd == 'CAPABILITY':
+            self.send(f'* CAPABILITY {server.capabilities}\r\n{tag} OK done\r\n')
+        elif cmd == 'LOGIN':
+            self.send(f'{tag} OK [CAPABILITY {server.capabilities}] logged in\r\n')
+        elif cmd in ('SELECT', 'EXAMINE', 'STATUS'):
+            with mailbox.lock:
+                exists, uidnext = len(mailbox.messages), mailbox.next_uid
+            if cmd == 'STATUS':
+                self.send(f'* STATUS INBOX (MESSAGES {exists} UIDNEXT {uidnext} UIDVALIDITY {mailbox.uidvalidity})\r\n'
+                          f'{tag} OK done\r\n')
+            else:
+                mode = 'READ-ONLY' if cmd == 'EXAMINE' else 'READ-WRITE'
+                self.send(f'* {exists} EXISTS\r\n* 0 RECENT\r\n* OK [UIDVALIDITY {mailbox.uidvalidity}] ok\r\n'
+                          f'* OK [UIDNEXT {uidnext}] ok\r\n* FLAGS (\\Seen)\r\n{tag} OK [{mode}] done\r\n')
+        elif cmd in ('NOOP', 'CLOSE'):
+            self.send(f'{tag} OK done\r\n')
+        elif cmd == 'LOGOUT':
+            self.send(f'* BYE\r\n{tag} OK done\r\n')
+            return 'BYE'
+        elif cmd == 'IDLE':
+            if 'IDLE' not in server.capabilities.split():
+                self.send(f'{tag} BAD IDLE not supported\r\n')
+                return
+            mailbox.idlers.add(self.send)
+            self.send('+ idling\r\n')
+            done = self.rfile.readline()
+            mailbox.idlers.discard(self.send)
+            self.send(f'{tag} OK IDLE terminated\r\n')
+            if not done:
+                return 'BYE'
+        elif cmd == 'SEARCH':
+            tokens = _tokenize(args)
+            if tokens and isinstance(tokens[0], str) and tokens[0].upper() == 'CHARSET':
+                tokens = tokens[2:]
+            messages = mailbox.snapshot()
+            largest = messages[-1].uid if messages else 0
+            found = [message.uid if use_uid else seq for seq, message in enumerate(messages, 1)
+                     if _SearchEvaluator(message, seq, largest, len(messages)).matches(tokens)]
+            self.send(f'* SEARCH {" ".join(map(str, found))}\r\n{tag} OK done\r\n')
+        elif cmd == 'FETCH':
+            spec, items = args.split(' ', 1)
+            items = items.upper()
+            messages = mailbox.snapshot()
+            largest = messages[-1].uid if messages else 0
+            header_fields = re.search(r'BODY(?:\.PEEK)?\[HEADER\.FIELDS \(([^)]*)\)\]', items)
+            wanted_set = SequenceSet(spec, largest if use_uid else len(messages))
+            for seq, message in enumerate(messages, 1):
+                if (message.uid if use_uid else seq) not in wanted_set:
+                    continue
+                parts = [f'UID {message.uid}'.encode()]
+                if header_fields:
+                    wanted = header_fields.group(1).split()
+                    data = (''.join(f'{k}: {v}\r\n' for k, v in message.parsed.items() if k.upper() in wanted)
+                            + '\r\n').encode()
+                    parts.append(f'BODY[HEADER.FIELDS ({header_fields.group(1)})] {{{len(data)}}}\r\n'.encode() + data)
+                elif 'RFC822' in items or 'BODY[]' in items or 'BODY.PEEK[]' in items:
+                    key = 'RFC822' if 'RFC822' in items else 'BODY[]'
+                    parts.append(f'{key} {{{len(message.raw)}}}\r\n'.encode() + message.raw)
+                if 'INTERNALDATE' in items:
+                    parts.append(f'INTERNALDATE "{message.internal_date:%d-%b-%Y %H:%M:%S +0000}"'.encode())
+                self.send(f'* {seq} FETCH ('.encode() + b' '.join(parts) + b')\r\n')
+            self.send(f'{tag} OK done\r\n')
+        else:
+            self.send(f'{tag} BAD unknown command {cmd}\r\n')
+
+
+class IMAPServer(_Server):
+    def __init__(self, capabilities='IMAP4rev1 IDLE'):
+        """
+        Args:
+            capabilities: Advertised capabilities, drop IDLE to exercise the engine's polling fallback
+        """
+        super().__init__(_IMAPHandler)
+        self.capabilities = capabilities
+        self.mailbox = Mailbox()
+        self.commands = Counter()
+
+
+def make_reply(from_email, subject, body='Thanks, sounds good!', in_reply_to=None, to_email='outreach@matchbox.local',
+               date=None):
+    """
+    RFC 822 reply. With `in_reply_to` it is threaded on that Message-ID (In-Reply-To & References), otherwise it only
+    carries 'Re: <subject>' like replies from clients that drop the threading headers.
+    """
+    date = date or datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(seconds=1)
+    headers = [f'From: {from_email}', f'To: {to_email}', f'Subject: Re: {subject}', f'Date: {format_datetime(date)}',
+               f'Message-ID: <reply.{time.time_ns()}@{from_email.split("@")[-1]}>']
+    if in_reply_to:
+        headers += [f'In-Reply-To: {in_reply_to}', f'References: {in_reply_to}']
+    return ('\r\n'.join(headers) + '\r\n\r\n' + body + '\r\n').encode()